@@ -116,10 +116,12 @@ from .extractors import Extractor
 from .features import Feature
 from .scorer_models import ScorerModel
 from .score_processor import ScoreProcessor
+from .async_score_processor import AsyncScoreProcessor
 
 from .about import (__author__, __author_email__, __description__, __name__,
                     __url__, __version__)
 
 __all__ = [Datasource, Dependent, DependentSet, Extractor, Feature,
-           ScorerModel, ScoreProcessor, __name__, __version__, __author__,
-           __author_email__, __description__, __url__]
+           ScorerModel, ScoreProcessor, AsyncScoreProcessor, __name__,
+           __version__, __author__, __author_email__, __description__,
+           __url__]
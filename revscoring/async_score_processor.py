@@ -0,0 +1,219 @@
+"""
+An :mod:`asyncio` front-end for :class:`~revscoring.ScoreProcessor`.
+
+Example:
+    >>> import asyncio
+    >>> from revscoring import AsyncScoreProcessor
+    >>>
+    >>> async def handle_requests(processor):
+    ...     return await asyncio.gather(processor.score(123456),
+    ...                                 processor.score(123457),
+    ...                                 processor.score(123456))
+    ...
+    >>> with AsyncScoreProcessor(model, extractor) as processor:
+    ...     loop = asyncio.get_event_loop()
+    ...     scores = loop.run_until_complete(handle_requests(processor))
+
+.. autoclass:: revscoring.AsyncScoreProcessor
+    :members:
+"""
+import asyncio
+import logging
+import time
+
+from more_itertools import chunked
+
+from .score_processor import ScoreProcessor
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncScoreProcessor(ScoreProcessor):
+    """
+    Scores revisions for many concurrent coroutines.  Requests that arrive
+    within `batch_delay` seconds of each other (up to `batch_size`) are
+    merged into a single extraction batch, so they share API requests.
+    Concurrent requests for the same revision (without a call-specific
+    cache) share a single result.  Each batch is then split into
+    micro-batches for the CPU worker pool.
+
+    Extraction runs in a pool of IO threads and feature solving and
+    prediction run in a :class:`~revscoring.worker_pool.WorkerPool`, so the
+    event loop is never blocked.
+
+    :Parameters:
+        scorer_model : :class:`~revscoring.ScorerModel`
+            The model to score with
+        extractor : :class:`~revscoring.Extractor`
+            An extractor to gather root datasources with
+        cpu_workers : `int`
+            The number of processes to use for solving and scoring
+        io_workers : `int`
+            The number of threads to use for extraction
+        batch_size : `int`
+            The maximum number of revisions to extract at a time
+        batch_delay : `float`
+            The maximum number of seconds to wait for more requests before
+            extracting a partial batch
+        micro_batch_size : `int`
+            The number of revisions to send to a CPU worker at a time.
+            Defaults to spreading each batch evenly across the workers.
+        metrics : :class:`~revscoring.metrics.Registry`
+            A registry to record per-stage latencies, throughput and queue
+            depths in.
+    """
+
+    def __init__(self, scorer_model, extractor, cpu_workers=None,
+                 io_workers=None, batch_size=50, batch_delay=0.01,
+                 micro_batch_size=None, metrics=None):
+        super().__init__(scorer_model, extractor, cpu_workers=cpu_workers,
+                         io_workers=io_workers, batch_size=batch_size,
+                         metrics=metrics)
+        self.batch_delay = float(batch_delay)
+        self.micro_batch_size = \
+            int(micro_batch_size) if micro_batch_size is not None else None
+
+        self._pending = []
+        self._shared = {}
+        self._flush_handle = None
+
+    async def score(self, rev_id, cache=None):
+        """
+        Scores a single revision.
+
+        :Parameters:
+            rev_id : `int`
+                The revision to score
+            cache : `dict`
+                Call-specific pre-computed values to inject
+
+        :Returns:
+            A score `dict` (or an error `dict` if scoring failed)
+        """
+        loop = asyncio.get_event_loop()
+        if cache is None and rev_id in self._shared:
+            return await asyncio.shield(self._shared[rev_id])
+
+        future = loop.create_future()
+        if cache is None:
+            self._shared[rev_id] = future
+            future.add_done_callback(
+                lambda f: self._shared.pop(rev_id) if
+                self._shared.get(rev_id) is f else None)
+
+        self._pending.append((rev_id, cache, future))
+        self.queue_depth.inc(pool="io")
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_delay, self.flush)
+
+        return await asyncio.shield(future)
+
+    def flush(self):
+        """
+        Sends the pending requests off to be extracted without waiting for
+        `batch_delay` to pass.
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        # A batch can only carry one cache per rev_id, so repeated rev_ids
+        # with call-specific caches wait for the next batch.
+        batch, deferred, rev_ids = [], [], set()
+        for rev_id, cache, future in self._pending:
+            if len(batch) < self.batch_size and rev_id not in rev_ids:
+                batch.append((rev_id, cache, future))
+                rev_ids.add(rev_id)
+            else:
+                deferred.append((rev_id, cache, future))
+        self._pending = deferred
+
+        if len(self._pending) > 0:
+            loop = asyncio.get_event_loop()
+            self._flush_handle = loop.call_later(self.batch_delay, self.flush)
+
+        if len(batch) > 0:
+            self.queue_depth.dec(len(batch), pool="io")
+            asyncio.ensure_future(self._score_batch(batch))
+
+    async def _score_batch(self, batch):
+        futures = [future for _, _, future in batch]
+        try:
+            rev_ids = [rev_id for rev_id, _, _ in batch]
+            caches = {rev_id: cache for rev_id, cache, _ in batch
+                      if cache is not None}
+            logger.debug("running _score_batch() on {0} rev_ids"
+                         .format(len(rev_ids)))
+
+            loop = asyncio.get_event_loop()
+            start = time.perf_counter()
+            error_values = await loop.run_in_executor(
+                self.scores_ex, self._extract, rev_ids, caches)
+            self.batch_duration.observe(time.perf_counter() - start,
+                                        stage="extract")
+            self.batches_total.inc()
+
+            e_r_caches = list(self._group_error_root_caches(
+                rev_ids, error_values, caches, None))
+            micro_batch_size = self.micro_batch_size or \
+                -(-len(e_r_caches) // self.cpu_workers)
+            await asyncio.gather(*(
+                self._score_micro_batch(e_r_caches_batch, futures_batch)
+                for e_r_caches_batch, futures_batch in
+                zip(chunked(e_r_caches, micro_batch_size),
+                    chunked(futures, micro_batch_size))))
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+
+    def _extract(self, rev_ids, caches):
+        # The extractor adds what it gathers to the caches it is given.  That
+        # shouldn't be shipped to the CPU workers a second time.
+        caches = {rev_id: dict(cache) for rev_id, cache in caches.items()}
+        return list(self.extractor.extract(rev_ids, self.root_datasources,
+                                           caches=caches))
+
+    async def _score_micro_batch(self, e_r_caches, futures):
+        self.queue_depth.inc(len(e_r_caches), pool="cpu")
+        submitted = time.time()
+        try:
+            results = await asyncio.wrap_future(
+                self.process_ex.submit(self._process_scores, e_r_caches))
+        except Exception as e:
+            # The micro-batch never made it through the worker pool
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self.queue_depth.dec(len(e_r_caches), pool="cpu")
+
+        # The whole micro-batch shares a round trip, so the time that was not
+        # spent solving or scoring is split evenly between its revisions.
+        ipc = time.time() - submitted - \
+            sum(sum(outcome[3].values())
+                for outcome, _ in results if outcome is not None)
+        for future, (outcome, error) in zip(futures, results):
+            self.revision_duration.observe(max(0, ipc / len(results)),
+                                           stage="ipc")
+            if error is not None:
+                self.revisions_total.inc(status="error")
+                if not future.done():
+                    future.set_exception(error)
+                continue
+
+            rev_id, score, errored, timings = outcome
+            for stage, duration in timings.items():
+                self.revision_duration.observe(duration, stage=stage)
+            self.revisions_total.inc(status="error" if errored else "scored")
+            if not future.done():
+                future.set_result(score)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.__exit__(exc_type, exc_value, traceback)
@@ -0,0 +1,206 @@
+"""
+A content-addressed cache for expensive text processing.  Values are keyed
+by a hash of the text they were computed from, so the same text is only
+processed once no matter which revision, model or extraction run it shows
+up in (e.g. when a revert restores an earlier version of a page).
+
+A :class:`~revscoring.content_cache.ContentCache` keeps recently used values
+in memory and, if a `path` is provided, writes a compact serialization of
+every value to disk so that it can be shared between processes and runs.
+Wikitext tokenization, segmentation and diffing check the cache that was
+installed with :func:`~revscoring.content_cache.set_cache`.
+
+Example:
+    >>> from revscoring import content_cache
+    >>> from revscoring.dependencies import solve
+    >>> from revscoring.features import wikitext
+    >>> from revscoring.datasources.revision_oriented import revision
+    >>>
+    >>> content_cache.set_cache(
+    ...     content_cache.ContentCache(path="/tmp/revscoring-cache"))
+    >>> solve(wikitext.revision.diff.words_added,
+    ...       cache={revision.parent.text: "Foo bar.",
+    ...              revision.text: "Foo bar baz."})
+    1
+
+.. autoclass:: revscoring.content_cache.ContentCache
+    :members:
+
+.. autofunction:: revscoring.content_cache.set_cache
+
+.. autofunction:: revscoring.content_cache.get_cache
+
+.. autofunction:: revscoring.content_cache.content_key
+"""
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+
+from .metrics import default_registry
+
+logger = logging.getLogger(__name__)
+
+_cache = None
+
+
+def set_cache(cache):
+    """
+    Installs a :class:`~revscoring.content_cache.ContentCache` for this
+    process.  Pass `None` to stop caching.  To install a cache in the
+    workers of a :class:`~revscoring.worker_pool.WorkerPool`, use this
+    function as the pool's `initializer`.
+    """
+    global _cache
+    _cache = cache
+
+
+def get_cache():
+    """
+    Gets the :class:`~revscoring.content_cache.ContentCache` that was
+    installed with :func:`~revscoring.content_cache.set_cache` (or `None`).
+    """
+    return _cache
+
+
+def content_key(*texts):
+    """
+    Builds a cache key from the content of one or more texts.
+    """
+    if len(texts) == 1:
+        return hashlib.sha1((texts[0] or "").encode('utf-8')).hexdigest()
+    else:
+        sha1 = hashlib.sha1()
+        for text in texts:
+            sha1.update(hashlib.sha1((text or "").encode('utf-8')).digest())
+        return sha1.hexdigest()
+
+
+class ContentCache:
+    """
+    A two-tier (memory and disk) cache of values keyed by content.
+
+    :Parameters:
+        max_size : `int`
+            The maximum number of values to keep in memory.  The least
+            recently used values are dropped first.
+        path : `str`
+            A directory to store serialized values in.  If not set, values
+            are only cached in memory.
+        metrics : :class:`~revscoring.metrics.Registry`
+            A registry to record hits and misses in.
+    """
+
+    def __init__(self, max_size=1024, path=None, metrics=None):
+        self.max_size = int(max_size)
+        self.path = path
+        self.metrics = metrics if metrics is not None else default_registry
+        self.requests = self.metrics.counter(
+            "content_cache_requests_total",
+            "Content cache lookups by namespace and result")
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        if self.path is not None:
+            os.makedirs(self.path, exist_ok=True)
+
+    def memoize(self, namespace, key, compute, dump=None, load=None):
+        """
+        Returns the value cached for `key` in `namespace` or computes and
+        caches it.
+
+        :Parameters:
+            namespace : `str`
+                The kind of value being cached
+            key : `str`
+                A content key.  See
+                :func:`~revscoring.content_cache.content_key`.
+            compute : `func`
+                Computes the value if it is not cached
+            dump : `func`
+                Converts the value into a compact, picklable form for the
+                disk tier.  Defaults to storing the value as-is.
+            load : `func`
+                Converts what `dump` returned back into a value
+        """
+        with self._lock:
+            try:
+                value = self._memory[(namespace, key)]
+                self._memory.move_to_end((namespace, key))
+                self.requests.inc(namespace=namespace, result="memory")
+                return value
+            except KeyError:
+                pass
+
+        stored = self._read(namespace, key)
+        if stored is not None:
+            value = load(stored) if load is not None else stored
+            self.requests.inc(namespace=namespace, result="disk")
+        else:
+            value = compute()
+            self.requests.inc(namespace=namespace, result="miss")
+            self._write(namespace, key,
+                        dump(value) if dump is not None else value)
+
+        self._remember(namespace, key, value)
+        return value
+
+    def __len__(self):
+        return len(self._memory)
+
+    def clear(self):
+        """
+        Drops all values from the memory tier.
+        """
+        with self._lock:
+            self._memory.clear()
+
+    def _remember(self, namespace, key, value):
+        with self._lock:
+            self._memory[(namespace, key)] = value
+            while len(self._memory) > self.max_size:
+                self._memory.popitem(last=False)
+
+    def _file_path(self, namespace, key):
+        return os.path.join(self.path, namespace, key[:2], key + ".pickle")
+
+    def _read(self, namespace, key):
+        if self.path is None:
+            return None
+
+        try:
+            with open(self._file_path(namespace, key), 'rb') as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (EOFError, pickle.UnpicklingError) as e:
+            logger.warning("Could not read cached {0} {1}: {2}"
+                           .format(namespace, key, e))
+            return None
+
+    def _write(self, namespace, key, stored):
+        if self.path is None:
+            return
+
+        file_path = self._file_path(namespace, key)
+        directory = os.path.dirname(file_path)
+        os.makedirs(directory, exist_ok=True)
+        # Write to a temporary file first so that concurrent readers never
+        # see a partial value.
+        f = tempfile.NamedTemporaryFile(dir=directory, delete=False)
+        try:
+            with f:
+                pickle.dump(stored, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(f.name, file_path)
+        except Exception:
+            os.remove(f.name)
+            raise
+
+    def __getstate__(self):
+        return (self.max_size, self.path, self.metrics)
+
+    def __setstate__(self, state):
+        self.__init__(*state)
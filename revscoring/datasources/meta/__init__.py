@@ -37,4 +37,8 @@ mappers
 selectors
 +++++++++
 .. automodule:: revscoring.datasources.meta.selectors
+
+sparse
+++++++
+.. automodule:: revscoring.datasources.meta.sparse
 """
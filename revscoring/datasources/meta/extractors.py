@@ -4,11 +4,36 @@ return `str`'s or `list` ( `str` ) and extract information from them.
 
 .. autoclass:: revscoring.datasources.meta.extractors.regex
 
+.. autoclass:: revscoring.datasources.meta.extractors.multi_regex
+    :members:
+
+.. autofunction:: revscoring.datasources.meta.extractors.required_literals
+
 """
 import re
+import sre_parse
+from sre_constants import (BRANCH, IN, LITERAL, MAX_REPEAT, MIN_REPEAT,
+                           SUBPATTERN)
 
 from ..datasource import Datasource
 
+# Backreferences and global inline flags can't be moved into a combined
+# pattern without changing their meaning.
+UNCOMBINABLE = re.compile(r"\\[1-9]|\(\?P[=<]|\(\?[aiLmsux]+\)")
+
+# Characters that IGNORECASE matching treats as equal but str.lower() does
+# not (see sre_compile._equivalences) and the combining dot that
+# str.lower() adds after "\u0130".
+CASE_EQUIVALENCES = (
+    "i\u0131", "s\u017f", "\u00b5\u03bc", "\u03b9\u0345\u1fbe",
+    "\u0390\u1fd3", "\u03b0\u1fe3", "\u03b2\u03d0", "\u03b5\u03f5",
+    "\u03b8\u03d1", "\u03ba\u03f0", "\u03c0\u03d6", "\u03c1\u03f1",
+    "\u03c3\u03c2", "\u03c6\u03d5", "\u1e61\u1e9b", "\ufb05\ufb06"
+)
+FOLDS = {ord(c): chars[0] for chars in CASE_EQUIVALENCES for c in chars[1:]}
+FOLDS[0x307] = None
+FOLDED = re.compile("[" + "".join(chr(c) for c in FOLDS) + "]")
+
 
 class regex(Datasource):
     """
@@ -26,14 +51,21 @@ class regex(Datasource):
             that *have* word boundaries.
         name : `str`
             A name for the new datasource
+        scanner : :class:`~revscoring.datasources.meta.extractors.multi_regex`
+            A scanner of `text_datasource` to register the regexes with.  If
+            set, matches are found in a single pass over the text along with
+            the other regexes registered with the scanner.
     """
     def __init__(self, regexes, text_datasource, regex_flags=re.I,
-                 wrapping=(r'\b', r'\b'), exclusions=None, name=None):
+                 wrapping=(r'\b', r'\b'), exclusions=None, name=None,
+                 scanner=None):
         wrapping = wrapping or ("", "")
         group_pattern = r"(" + wrapping[0] + r")" + \
-                        r"(" + r"|".join(regexes) + r")" + \
+                        r"(" + group_alternatives(regexes, regex_flags) + \
+                        r")" + \
                         r"(" + wrapping[1] + r")"
         self.group_re = re.compile(group_pattern, flags=regex_flags)
+        self.literals = required_literals(regexes, regex_flags)
         if exclusions is not None:
             exclusion_pattern = r"(" + wrapping[0] + r")" + \
                                 r"(" + r"|".join(exclusions) + r")" + \
@@ -43,10 +75,25 @@ class regex(Datasource):
             self.exclude_re = None
 
         name = self._format_name(name, [regexes, text_datasource])
-        super().__init__(name, self.process, depends_on=[text_datasource])
+        if scanner is not None:
+            if scanner.text_datasource != text_datasource:
+                raise ValueError("{0} does not scan {1}"
+                                 .format(scanner, text_datasource))
+            self.scan_key = scanner.register(regexes, regex_flags, wrapping,
+                                             exclusions)
+            depends_on = [text_datasource, scanner]
+        else:
+            self.scan_key = None
+            depends_on = [text_datasource]
+        super().__init__(name, self.process, depends_on=depends_on)
 
-    def process(self, text_or_texts):
-        if text_or_texts is None:
+    def process(self, text_or_texts, scanned=None):
+        if scanned is not None and self.scan_key in scanned:
+            return scanned[self.scan_key]
+        elif text_or_texts is None:
+            return []
+        elif not _could_match(getattr(self, 'literals', None),
+                              text_or_texts):
             return []
         elif isinstance(text_or_texts, str):
             text = text_or_texts
@@ -63,3 +110,295 @@ class regex(Datasource):
                     if not hasattr(self, 'exclude_re') or
                        self.exclude_re is None or
                        not self.exclude_re.match(match.group(2))]
+
+
+class multi_regex(Datasource):
+    """
+    Scans a text (or list of texts) once for the matches of all of the
+    :class:`~revscoring.datasources.meta.extractors.regex` that were
+    registered with it.  Generates a `dict` that maps each registered set of
+    regexes to the `list` of strings that matched.  The matches are the same
+    as if each set had scanned the text separately.
+
+    :Parameters:
+        text_datasource : :class:`revscoring.Datasource`
+            A datasource that returns a `str` or a `list` of `str`
+        regex_flags : `int`
+            The regex flags that all registered regexes are matched with
+        name : `str`
+            A name for the new datasource
+
+    Example:
+        >>> from revscoring.datasources.meta import extractors
+        >>> scanner = extractors.multi_regex(revision.text)
+        >>> badwords = extractors.regex([r"bad"], revision.text,
+        ...                             scanner=scanner)
+        >>> informals = extractors.regex([r"lol"], revision.text,
+        ...                              scanner=scanner)
+    """
+    def __init__(self, text_datasource, regex_flags=re.I, name=None):
+        self.text_datasource = text_datasource
+        self.regex_flags = regex_flags
+        self.sets = []
+        self._compiled = None
+        name = self._format_name(name, [text_datasource])
+        super().__init__(name, self.process, depends_on=[text_datasource])
+
+    def register(self, regexes, regex_flags=re.I, wrapping=(r'\b', r'\b'),
+                 exclusions=None):
+        """
+        Registers a set of regexes to be scanned for.
+
+        :Returns:
+            A key for the set's matches in the generated `dict`.  Sets that
+            can't be combined with the others (e.g. because they contain
+            backreferences) are not scanned for.
+        """
+        wrapping = tuple(wrapping or ("", ""))
+        key = (tuple(regexes), regex_flags, wrapping,
+               tuple(exclusions) if exclusions is not None else None)
+        if regex_flags != self.regex_flags:
+            raise ValueError("Regex flags {0} do not match {1}'s {2}"
+                             .format(regex_flags, self, self.regex_flags))
+        if key not in self.sets and \
+           not any(UNCOMBINABLE.search(regex)
+                   for regex in list(regexes) + list(wrapping)):
+            self.sets.append(key)
+            self._compiled = None
+
+        return key
+
+    def process(self, text_or_texts):
+        if self._compiled is None:
+            self._compiled = self._compile()
+        scan_re, exclude_res, literals = self._compiled
+
+        matches = {key: [] for key in self.sets}
+        if text_or_texts is None or len(self.sets) == 0 or \
+           not _could_match(literals, text_or_texts):
+            return matches
+        elif isinstance(text_or_texts, str):
+            texts = [text_or_texts]
+        else:
+            texts = text_or_texts
+
+        match_groups = ["_m{0}".format(i) for i in range(len(self.sets))]
+        wrap_groups = ["_w{0}".format(i) for i in range(len(self.sets))]
+        for text in texts:
+            ends = [0] * len(self.sets)
+            for candidate in scan_re.finditer(text):
+                start = candidate.start()
+                found = candidate.group(*wrap_groups)
+                if len(self.sets) == 1:
+                    found = (found,)
+                for i, wrapped in enumerate(found):
+                    if wrapped is None or ends[i] > start:
+                        continue
+                    ends[i] = start + len(wrapped)
+                    match = candidate.group(match_groups[i])
+                    if exclude_res[i] is None or \
+                       not exclude_res[i].match(match):
+                        matches[self.sets[i]].append(match)
+
+        return matches
+
+    def _compile(self):
+        # Any set has to match for a position to be considered, so the
+        # alternatives of all sets can be bucketed together.
+        by_wrapping = {}
+        for regexes, _, wrapping, _ in self.sets:
+            by_wrapping.setdefault(wrapping, []).extend(regexes)
+        gate = "|".join(
+            "(?:" + wrapping[0] + ")" +
+            "(?:" + group_alternatives(regexes, self.regex_flags,
+                                       ordered=False) + ")" +
+            "(?:" + wrapping[1] + ")"
+            for wrapping, regexes in by_wrapping.items())
+
+        captures = []
+        exclude_res = []
+        for i, (regexes, _, wrapping, exclusions) in enumerate(self.sets):
+            captures.append(
+                "(?=(?P<_w{0}>(?:{1})(?P<_m{0}>{2})(?:{3})))?".format(
+                    i, wrapping[0],
+                    group_alternatives(regexes, self.regex_flags),
+                    wrapping[1]))
+            if exclusions is not None:
+                exclude_res.append(re.compile(
+                    r"(" + wrapping[0] + r")" +
+                    r"(" + r"|".join(exclusions) + r")" +
+                    r"(" + wrapping[1] + r")", flags=self.regex_flags))
+            else:
+                exclude_res.append(None)
+
+        scan_re = re.compile("(?=" + gate + ")" + "".join(captures),
+                             flags=self.regex_flags)
+        literals = required_literals(
+            [regex for regexes, _, _, _ in self.sets for regex in regexes],
+            self.regex_flags)
+        return scan_re, exclude_res, literals
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['_compiled'] = None
+        return state
+
+
+def group_alternatives(regexes, regex_flags=re.I, ordered=True):
+    """
+    Joins `regexes` into an alternation that skips the alternatives that
+    can't match at a position by checking their first character.  Python's
+    regex engine otherwise tries every alternative at every position.
+
+    Alternatives that start with the same characters are grouped behind a
+    single lookahead.  If `ordered`, alternatives are only moved past others
+    that can't match at the same position, so the same alternative wins
+    wherever more than one could match.
+    """
+    groups = []
+    for regex in regexes:
+        chars = _first_chars(regex, regex_flags)
+        key = _fold(chars, regex_flags) if chars is not None else None
+        target = None
+        for group in reversed(groups):
+            if key is not None and group[0] == key:
+                target = group
+                break
+            elif ordered and (key is None or group[0] is None or
+                              group[0] & key):
+                break
+
+        if target is None:
+            groups.append((key, set(chars or ()), [regex]))
+        else:
+            target[1].update(chars)
+            target[2].append(regex)
+
+    parts = []
+    for key, chars, alternatives in groups:
+        if key is None:
+            parts.extend(alternatives)
+        else:
+            parts.append("(?=[" +
+                         "".join("\\" + c if c in "\\]^-[" else c
+                                 for c in sorted(chars)) +
+                         "])(?:" + "|".join(alternatives) + ")")
+
+    return "|".join(parts)
+
+
+def required_literals(regexes, regex_flags=re.I):
+    """
+    Finds strings that a text must contain (once lower-cased) to match any of
+    `regexes`.  For each regex, the longest run of literal characters that
+    every match includes is used.  Runs that contain a shorter run are
+    dropped since a text that contains them contains the shorter run too.
+
+    :Returns:
+        A `frozenset` of lower-cased `str` or `None` if any of the regexes
+        can match without a literal (e.g. `\\w+`)
+    """
+    literals = set()
+    for regex in regexes:
+        try:
+            runs = _literal_runs(sre_parse.parse(regex, regex_flags))
+        except (re.error, TypeError, ValueError, IndexError):
+            return None
+        if len(runs) == 0:
+            return None
+        literals.add(_normalize(max(runs, key=len)))
+
+    return frozenset(
+        literal for literal in literals
+        if literal != "" and
+        not any(other != literal and other in literal for other in literals))
+
+
+def _literal_runs(items):
+    runs = []
+    run = ""
+    for op, av in items:
+        if op == LITERAL:
+            run += chr(av)
+        elif op in (MAX_REPEAT, MIN_REPEAT) and av[0] >= 1 and \
+                len(av[2]) == 1 and av[2][0][0] == LITERAL:
+            # A repeated character ends one run and starts the next
+            c = chr(av[2][0][1])
+            runs.append(run + c)
+            run = c
+        else:
+            if run != "":
+                runs.append(run)
+                run = ""
+            if op == SUBPATTERN:
+                runs.extend(_literal_runs(av[-1]))
+            elif op in (MAX_REPEAT, MIN_REPEAT) and av[0] >= 1:
+                runs.extend(_literal_runs(av[2]))
+
+    if run != "":
+        runs.append(run)
+
+    return runs
+
+
+def _normalize(text):
+    text = text.lower()
+    if FOLDED.search(text) is not None:
+        text = text.translate(FOLDS)
+    return text
+
+
+def _could_match(literals, text_or_texts):
+    if literals is None:
+        return True
+    elif isinstance(text_or_texts, str):
+        text = _normalize(text_or_texts)
+    else:
+        text = _normalize("\n".join(text_or_texts))
+
+    return any(literal in text for literal in literals)
+
+
+def _first_chars(regex, regex_flags):
+    try:
+        return _parsed_first_chars(sre_parse.parse(regex, regex_flags))
+    except (re.error, TypeError, ValueError, IndexError):
+        return None
+
+
+def _parsed_first_chars(items):
+    if len(items) == 0:
+        return None
+    op, av = items[0]
+    if op == LITERAL:
+        return {chr(av)}
+    elif op == IN:
+        if not all(in_op == LITERAL for in_op, _ in av):
+            return None
+        return {chr(in_av) for _, in_av in av}
+    elif op == SUBPATTERN:
+        return _parsed_first_chars(av[-1])
+    elif op == BRANCH:
+        chars = set()
+        for alternative in av[1]:
+            alternative_chars = _parsed_first_chars(alternative)
+            if alternative_chars is None:
+                return None
+            chars |= alternative_chars
+        return chars
+    elif op in (MAX_REPEAT, MIN_REPEAT) and av[0] >= 1:
+        return _parsed_first_chars(av[2])
+    else:
+        return None
+
+
+def _fold(chars, regex_flags):
+    # Characters that might match the same text under IGNORECASE share keys
+    # so that their alternatives are never reordered.
+    if regex_flags & re.I:
+        keys = set()
+        for c in chars:
+            keys.update((c, c.lower(), c.upper(), c.casefold()))
+        return frozenset(keys)
+    else:
+        return frozenset(chars)
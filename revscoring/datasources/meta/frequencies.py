@@ -1,6 +1,8 @@
 """
 These meta-datasources operate on :class:`revscoring.Datasource`'s that
-return `list`'s of items and produce frequency tables.
+return `list`'s of items and produce frequency tables.  Tables are
+:class:`~revscoring.datasources.meta.sparse.SparseTable`'s, but plain `dict`'s
+are accepted everywhere a table is expected.
 
 .. autoclass:: revscoring.datasources.meta.frequencies.table
 
@@ -8,11 +10,14 @@ return `list`'s of items and produce frequency tables.
 
 .. autoclass:: revscoring.datasources.meta.frequencies.prop_delta
 
+.. autoclass:: revscoring.datasources.meta.frequencies.delta_and_prop_delta
+
 .. autoclass:: revscoring.datasources.meta.frequencies.positive
 
 .. autoclass:: revscoring.datasources.meta.frequencies.negative
 """
 from ..datasource import Datasource
+from .sparse import SparseTable
 
 
 class table(Datasource):
@@ -32,15 +37,7 @@ class table(Datasource):
                          depends_on=[items_datasource])
 
     def process(self, items):
-
-        freq = {}
-        for item in items:
-            if item in freq:
-                freq[item] += 1
-            else:
-                freq[item] = 1
-
-        return freq
+        return SparseTable.from_items(items)
 
 
 class delta(Datasource):
@@ -61,6 +58,9 @@ class delta(Datasource):
                          depends_on=[old_ft_datasource, new_ft_datasource])
 
     def process(self, old_ft, new_tf):
+        if _is_sparse(old_ft, new_tf):
+            old_ft, new_tf = _sparse(old_ft, new_tf)
+            return old_ft.delta(new_tf)
         old_ft = old_ft or {}
 
         delta_table = {}
@@ -94,6 +94,9 @@ class prop_delta(Datasource):
                          depends_on=[old_ft_datasource, delta_datasource])
 
     def process(self, old_tf, ft_delta):
+        if _is_sparse(old_tf, ft_delta):
+            old_tf, ft_delta = _sparse(old_tf, ft_delta)
+            return old_tf.prop_delta(ft_delta)
         prop_delta = {}
         for item, delta in ft_delta.items():
             if delta > 0:
@@ -104,6 +107,58 @@ class prop_delta(Datasource):
         return prop_delta
 
 
+class delta_and_prop_delta(Datasource):
+    """
+    Generates both a frequency table diff (see
+    :class:`~revscoring.datasources.meta.frequencies.delta`) and a
+    proportional frequency table diff (see
+    :class:`~revscoring.datasources.meta.frequencies.prop_delta`) of two
+    frequency tables in a single pass.  Use
+    :class:`~revscoring.datasources.meta.indexable.index` to select one of
+    them.
+
+    :Parameters:
+        old_ft_datasource : :class:`revscoring.Datasource`
+            A frequency table datasource
+        new_ft_datasource : :class:`revscoring.Datasource`
+            A frequency table datasource
+        name : `str`
+            A name for the datasource.
+
+    :Returns:
+        A `tuple` of (delta, prop_delta) tables
+    """
+    def __init__(self, old_ft_datasource, new_ft_datasource, name=None):
+        name = self._format_name(name, [old_ft_datasource, new_ft_datasource])
+        super().__init__(name, self.process,
+                         depends_on=[old_ft_datasource, new_ft_datasource])
+
+    def process(self, old_ft, new_ft):
+        if _is_sparse(old_ft, new_ft):
+            old_ft, new_ft = _sparse(old_ft, new_ft)
+            return old_ft.delta_and_prop_delta(new_ft)
+        old_ft = old_ft or {}
+
+        delta_table = {}
+        prop_delta_table = {}
+        for item, new_count in new_ft.items():
+            old_count = old_ft.get(item, 0)
+            if new_count != old_count:
+                delta = new_count - old_count
+                delta_table[item] = delta
+                if delta > 0:
+                    prop_delta_table[item] = delta / (old_count + 1)
+                else:
+                    prop_delta_table[item] = delta / old_count
+
+        for item, old_count in old_ft.items():
+            if item not in new_ft:
+                delta_table[item] = old_count * -1
+                prop_delta_table[item] = -1.0
+
+        return delta_table, prop_delta_table
+
+
 class positive(Datasource):
     """
     Filters a table (counts, delta, prop_delta, etc.) for positive values.
@@ -120,6 +175,8 @@ class positive(Datasource):
                          depends_on=[table_datasource])
 
     def process(self, table):
+        if isinstance(table, SparseTable):
+            return table.positive()
         return {k: value for k, value in table.items() if value > 0}
 
 
@@ -142,7 +199,24 @@ class negative(Datasource):
         self.absolute = absolute
 
     def process(self, table):
-        if self.absolute:
+        if isinstance(table, SparseTable):
+            return table.negative(absolute=self.absolute)
+        elif self.absolute:
             return {k: abs(value) for k, value in table.items() if value < 0}
         else:
             return {k: value for k, value in table.items() if value < 0}
+
+
+def _is_sparse(*tables):
+    return any(isinstance(table, SparseTable) for table in tables)
+
+
+def _sparse(*tables):
+    """
+    Converts tables to :class:`~revscoring.datasources.meta.sparse.SparseTable`
+    with a shared vocabulary.
+    """
+    vocabulary = next(table.vocabulary for table in tables
+                      if isinstance(table, SparseTable))
+    return tuple(SparseTable.from_dict(table, vocabulary=vocabulary)
+                 for table in tables)
@@ -3,11 +3,39 @@ These meta-datasources operate on :class:`revscoring.Datasource`'s that returns
 a list of strings (i.e. "tokens") and produces a list of ngram/skipgram
 sequences.
 
+Grams are generated for all of the gram sequences in one pass by zipping
+offset slices of the tokens.
+:func:`~revscoring.datasources.meta.gramming.gram_tokens` streams grams as
+tuples.
+:class:`~revscoring.datasources.meta.gramming.hashed_gram` hashes grams
+directly from the hashes of their tokens (see
+:class:`~revscoring.datasources.meta.hashing.batch_hash`) without building
+any tuples.  :func:`~revscoring.datasources.meta.gramming.count_grams`
+reports how many grams a sequence of tokens produces.
+
 .. autoclass:: revscoring.datasources.meta.gramming.gram
 
+.. autoclass:: revscoring.datasources.meta.gramming.hashed_gram
+
+.. autofunction:: revscoring.datasources.meta.gramming.gram_tokens
+
+.. autofunction:: revscoring.datasources.meta.gramming.hash_grams
+
+.. autofunction:: revscoring.datasources.meta.gramming.count_grams
+
 """
+from functools import partial
+from itertools import chain, zip_longest
+from operator import is_not
+
+import numpy
+
+from . import hashing
 from ..datasource import Datasource
 
+# Pads the shorter gram sequences when they are interleaved
+_MISSING = object()
+
 
 class gram(Datasource):
     """
@@ -31,10 +59,103 @@ class gram(Datasource):
         return list(gram_tokens(tokens, grams=self.grams))
 
 
+class hashed_gram(Datasource):
+    """
+    Converts a sequence of items into the hashes of their ngrams.  The
+    hashes are the same as applying
+    :class:`~revscoring.datasources.meta.hashing.batch_hash` to a
+    :class:`~revscoring.datasources.meta.gramming.gram`, but no gram tuples
+    are built.
+
+    :Parameters:
+        items_datasource : :class:`revscoring.Datasource`
+            A datasource that generates a list of tokens
+        grams : `list` ( `tuple` ( `int` ) )
+            A list of ngram and/or skipgram sequences to produce
+        n : `int`
+            The number of potential hashes that can be produced
+        counted : `bool`
+            Count the hashes into a
+            :class:`~revscoring.datasources.meta.hashing.HashCounts`
+        seed : `int`
+            A seed for the token hash function
+        name : `str`
+            A name for the datasource.
+    """
+    def __init__(self, items_datasource, grams=[(0,)], n=2 ** 20,
+                 counted=False, seed=0, name=None):
+        name = self._format_name(
+            name, [items_datasource, grams, n, counted, seed])
+        super().__init__(name, self.process,
+                         depends_on=[items_datasource])
+        self.grams = grams
+        self.n = int(n)
+        self.counted = bool(counted)
+        self.seed = int(seed)
+
+    def process(self, tokens):
+        hashes = hash_grams(tokens, self.grams, self.n, seed=self.seed)
+        if self.counted:
+            return hashing.HashCounts.from_hashes(hashes, self.n)
+        else:
+            return hashes
+
+
 def gram_tokens(items, grams=[(0,)]):
-    for i in range(len(items)):
-        for gram in grams:
-            if gram == (0,):
-                yield (items[i], )
-            elif len(items) > i + max(gram):
-                yield tuple(items[i + offset] for offset in gram)
+    """
+    Generates the grams of a sequence of items.  Grams are ordered by
+    position and then by their order in `grams`.
+
+    :Returns:
+        An iterator of `tuple`
+    """
+    items = items if isinstance(items, (list, tuple)) else list(items)
+    streams = [zip(*(items[offset:] for offset in gram)) for gram in grams]
+    if len(streams) == 1:
+        return streams[0]
+    else:
+        return filter(partial(is_not, _MISSING), chain.from_iterable(
+            zip_longest(*streams, fillvalue=_MISSING)))
+
+
+def hash_grams(items, grams, n, seed=0):
+    """
+    Hashes the grams of a sequence of tokens in the order that
+    :func:`~revscoring.datasources.meta.gramming.gram_tokens` generates them.
+
+    :Returns:
+        A :class:`numpy.ndarray` of `int64` hashes in the range [0, `n`)
+    """
+    token_hashes = hashing.token_hashes(items, seed=seed)
+    n_items = len(token_hashes)
+
+    if len(grams) == 1:
+        combined = _combine(token_hashes, grams[0])
+    else:
+        # Each gram sequence fills a column.  Reading the valid cells row by
+        # row orders the grams by position.
+        combined = numpy.zeros((n_items, len(grams)), dtype=numpy.uint64)
+        valid = numpy.zeros((n_items, len(grams)), dtype=bool)
+        for i, gram in enumerate(grams):
+            hashes = _combine(token_hashes, gram)
+            combined[:len(hashes), i] = hashes
+            valid[:len(hashes), i] = True
+        combined = combined[valid]
+
+    return hashing.bucket(combined, n)
+
+
+def count_grams(n_items, grams):
+    """
+    Counts the grams that a sequence of `n_items` items produces.
+    """
+    return sum(max(n_items - max(gram), 0) for gram in grams)
+
+
+def _combine(token_hashes, gram):
+    length = max(len(token_hashes) - max(gram), 0)
+    combined = token_hashes[gram[0]:gram[0] + length]
+    for offset in gram[1:]:
+        combined = hashing.fold(combined,
+                                token_hashes[offset:offset + length])
+    return combined
@@ -1,17 +1,43 @@
 """
-These meta-datasources operate on :class:`revscoring.Datasource`'s that returns
-a list of strings (i.e. "tokens") and produces a list of ngram/skipgram
-sequences.
+These meta-datasources operate on :class:`revscoring.Datasource`'s that return
+a list of items (e.g. tokens or ngram/skipgram tuples) and produce a sequence
+of portable hashes.
+
+:class:`~revscoring.datasources.meta.hashing.hash` serializes each item to
+JSON and hashes it individually.
+:class:`~revscoring.datasources.meta.hashing.batch_hash` hashes each token
+once and combines the hashes of the tokens in a gram with array operations,
+so long sequences of tokens or grams can be hashed without serializing them.
+It produces a :class:`numpy.ndarray` or, with `counted=True`, a
+:class:`~revscoring.datasources.meta.hashing.HashCounts` sparse vector.
+Note that the two datasources produce different hashes for the same items.
 
 .. autoclass:: revscoring.datasources.meta.hashing.hash
 
+.. autoclass:: revscoring.datasources.meta.hashing.batch_hash
+
+.. autoclass:: revscoring.datasources.meta.hashing.HashCounts
+    :members:
+
+.. autofunction:: revscoring.datasources.meta.hashing.hash_items
+
 """
 import json
+from collections import namedtuple
+from functools import partial
+from itertools import chain
 
 import mmh3
+import numpy
 
 from ..datasource import Datasource
 
+GRAM_PRIME = numpy.uint64(0x100000001b3)
+MASK_32 = numpy.uint64(0xffffffff)
+FMIX_SHIFT = numpy.uint64(33)
+FMIX_1 = numpy.uint64(0xff51afd7ed558ccd)
+FMIX_2 = numpy.uint64(0xc4ceb9fe1a85ec53)
+
 
 class hash(Datasource):
     """
@@ -38,3 +64,184 @@ class hash(Datasource):
 
 def mmh3_item(item, n):
     return (2**32 + mmh3.hash(json.dumps(item))) % n
+
+
+class batch_hash(Datasource):
+    """
+    Converts a sequence of items (tokens or tuples of tokens) into an array
+    of portable hashes in one batch.  A token and a 1-tuple of that token
+    have the same hash.
+
+    :Parameters:
+        items_datasource : :class:`revscoring.Datasource`
+            A datasource that generates a list of items to be hashed
+        n : `int`
+            The number of potential hashes that can be produced
+        counted : `bool`
+            Count the hashes into a
+            :class:`~revscoring.datasources.meta.hashing.HashCounts` rather
+            than returning one hash per item
+        seed : `int`
+            A seed for the token hash function
+        name : `str`
+            A name for the datasource.
+    """
+    def __init__(self, items_datasource, n=2 ** 20, counted=False, seed=0,
+                 name=None):
+        name = self._format_name(name, [items_datasource, n, counted, seed])
+        super().__init__(name, self.process,
+                         depends_on=[items_datasource])
+        self.n = int(n)
+        self.counted = bool(counted)
+        self.seed = int(seed)
+
+    def process(self, items):
+        hashes = hash_items(items, self.n, seed=self.seed)
+        if self.counted:
+            return HashCounts.from_hashes(hashes, self.n)
+        else:
+            return hashes
+
+
+class HashCounts(namedtuple("HashCounts", ['indices', 'counts', 'n'])):
+    """
+    A sparse vector of hash counts.
+
+    :Parameters:
+        indices : :class:`numpy.ndarray` ( `int64` )
+            The sorted, unique hashes
+        counts : :class:`numpy.ndarray` ( `int64` )
+            The number of times each hash occurred
+        n : `int`
+            The number of potential hashes (the length of the vector)
+    """
+    __slots__ = ()
+
+    @classmethod
+    def from_hashes(cls, hashes, n):
+        """
+        Counts an array of hashes.
+        """
+        indices, counts = numpy.unique(hashes, return_counts=True)
+        return cls(indices, counts.astype(numpy.int64), n)
+
+    def toarray(self):
+        """
+        Expands the counts into a dense array of length `n`.
+        """
+        vector = numpy.zeros(self.n, dtype=numpy.int64)
+        vector[self.indices] = self.counts
+        return vector
+
+    def __eq__(self, other):
+        return isinstance(other, HashCounts) and self.n == other.n and \
+            numpy.array_equal(self.indices, other.indices) and \
+            numpy.array_equal(self.counts, other.counts)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+
+def hash_items(items, n, seed=0):
+    """
+    Hashes a sequence of tokens or tuples of tokens.
+
+    :Parameters:
+        items : `list`
+            Tokens (`str`) or tuples of tokens
+        n : `int`
+            The number of potential hashes that can be produced
+        seed : `int`
+            A seed for the token hash function
+
+    :Returns:
+        A :class:`numpy.ndarray` of `int64` hashes in the range [0, `n`)
+    """
+    items = items if isinstance(items, (list, tuple)) else list(items)
+    try:
+        # Fast path: all of the items are tokens
+        hashes = _mmh3_hashes(map(_mmh3_func(seed), items))
+    except TypeError:
+        hashes = gram_hashes(
+            [item if isinstance(item, tuple) else (item,) for item in items],
+            seed=seed)
+
+    return bucket(hashes, n)
+
+
+def token_hashes(tokens, seed=0):
+    """
+    Hashes each of a sequence of tokens.
+
+    :Returns:
+        A :class:`numpy.ndarray` of unsigned 32-bit hashes (as `uint64`)
+    """
+    tokens = tokens if isinstance(tokens, (list, tuple)) else list(tokens)
+    hash_token = _mmh3_func(seed)
+    try:
+        return _mmh3_hashes(map(hash_token, tokens))
+    except TypeError:
+        return _mmh3_hashes(hash_token(_as_key(token)) for token in tokens)
+
+
+def gram_hashes(grams, seed=0):
+    """
+    Hashes each of a sequence of tuples of tokens.  The token hashes of
+    each tuple are combined with
+    :func:`~revscoring.datasources.meta.hashing.fold`.
+
+    :Returns:
+        A :class:`numpy.ndarray` of unbucketed `uint64` hashes
+    """
+    lengths = numpy.fromiter(map(len, grams), dtype=numpy.int64)
+    hashes = token_hashes(list(chain.from_iterable(grams)), seed=seed)
+    starts = numpy.cumsum(lengths) - lengths
+
+    combined = numpy.zeros(len(grams), dtype=numpy.uint64)
+    for i in range(lengths.max() if len(lengths) > 0 else 0):
+        # Grams are usually short, so this only loops a few times
+        longer = lengths > i
+        combined[longer] = fold(combined[longer], hashes[starts[longer] + i])
+
+    return combined
+
+
+def fold(combined, hashes):
+    """
+    Folds the hashes of the next tokens in a set of grams into their
+    combined hashes.  Starting from zeros, folding the hashes of tokens
+    `a` then `b` gives the hash of the gram `(a, b)`.
+    """
+    combined = numpy.asarray(combined, dtype=numpy.uint64)
+    return combined * GRAM_PRIME + hashes
+
+
+def bucket(hashes, n):
+    """
+    Mixes combined hashes and reduces them to the range [0, `n`).
+
+    :Returns:
+        A :class:`numpy.ndarray` of `int64` hashes
+    """
+    hashes = hashes ^ (hashes >> FMIX_SHIFT)
+    hashes *= FMIX_1
+    hashes ^= hashes >> FMIX_SHIFT
+    hashes *= FMIX_2
+    hashes ^= hashes >> FMIX_SHIFT
+    return (hashes % numpy.uint64(n)).astype(numpy.int64)
+
+
+def _mmh3_func(seed):
+    return partial(mmh3.hash, seed=seed) if seed else mmh3.hash
+
+
+def _mmh3_hashes(hashes):
+    # mmh3 returns signed 32-bit ints.  They are reinterpreted as unsigned.
+    return numpy.fromiter(hashes, dtype=numpy.int64).astype(numpy.uint64) & \
+        MASK_32
+
+
+def _as_key(token):
+    return token if isinstance(token, (str, bytes)) else str(token)
@@ -1,18 +1,33 @@
 """
 These meta-datasources operate on :class:`revscoring.Datasource`'s that return
 a flat `dict` of key-value pairs (aka a "table") and filter ("select") keys
-and/or weight values.
+and/or weight values.  :class:`~revscoring.datasources.meta.sparse.SparseTable`
+inputs are selected and weighted as arrays and produce a
+:class:`~revscoring.datasources.meta.sparse.SparseTable`.
 
 .. autoclass:: revscoring.datasources.meta.selectors.tfidf
+    :members: fit
 
 .. autoclass:: revscoring.datasources.meta.selectors.filter_keys
 
+.. autoclass:: revscoring.datasources.meta.selectors.TermCounts
+    :members:
+
+.. autofunction:: revscoring.datasources.meta.selectors.count_terms
+
 """
 
-from collections import defaultdict
+import heapq
+from collections import Counter, defaultdict
+from functools import partial
+from itertools import chain, islice
 from math import log
 
+import numpy
+
+from ...worker_pool import WorkerPool
 from ..datasource import Datasource
+from .sparse import SparseTable, get_vocabulary
 
 
 class tfidf(Datasource):
@@ -44,50 +59,74 @@ class tfidf(Datasource):
         self.max_terms = int(max_terms) if max_terms is not None else None
         self.weight = weight
         self.boolean = boolean
+        self._sparse_weights = None
 
-    def fit(self, value_labels):
-        # Count up document frequencies and label frequencies
-        self.document_freq = defaultdict(lambda: 0)
-        self.document_n = 0
-        label_freq = defaultdict(lambda: defaultdict(lambda: 0))
-        label_n = defaultdict(lambda: 0)
-        for values, label in value_labels:
-            table = values[0]
-            for term, freq in table.items():
-                if self.boolean:
-                    freq = 1 if freq > 0 else -1
-                self.document_freq[term] += freq
-                self.document_n += 1
-                label_freq[label][term] += freq
-                label_n[label] += 1
+    def fit(self, value_labels, processes=1, chunk_size=10000):
+        """
+        Fits the document frequencies of terms (and selects terms if
+        `max_terms` is set).
+
+        :Parameters:
+            value_labels : `iterable` ( `tuple` )
+                Pairs of dependency values (a `list` containing a table) and
+                labels
+            processes : `int`
+                The number of processes to count terms in.  Chunks of
+                observations are counted in a
+                :class:`~revscoring.worker_pool.WorkerPool` and the counts
+                are merged.  If 1, counting happens in this process.  If
+                `None`, one process per CPU is used.
+            chunk_size : `int`
+                The number of observations to count in each chunk
+        """
+        self._sparse_weights = None
+        count = partial(count_terms, boolean=self.boolean)
+        chunks = _chunks(value_labels, chunk_size)
+
+        counts = TermCounts()
+        if processes == 1:
+            for chunk_counts in map(count, chunks):
+                counts.update(chunk_counts)
+        else:
+            with WorkerPool(processes=processes, preload=[__name__]) as pool:
+                # Ordered so that float sums are deterministic
+                for chunk_counts in pool.imap(count, chunks):
+                    counts.update(chunk_counts)
+
+        self.document_freq = dict(counts.document_freq().items())
+        self.document_n = counts.document_n
 
         # Select terms
         if self.max_terms is not None:
             self.document_freq = \
-                self._select_terms(label_freq, label_n)
+                self._select_terms(counts.label_freq, counts.label_n)
 
     def _select_terms(self, label_freq, label_n):
-        term_utilities = []
+        # A term's best (utility, term, label) across labels determines when
+        # it would be selected, so only the top `max_terms` need to be found.
+        best_utilities = {}
         for label, table in label_freq.items():
-            for term, label_freq in table.items():
+            for term, freq in table.items():
                 utility = term_utility(
-                    label_freq, label_n[label],
+                    freq, label_n[label],
                     self.document_freq[term], self.document_n)
-                term_utilities.append((abs(utility), term, label))
+                term_utility_label = (abs(utility), term, label)
+                if term not in best_utilities or \
+                   term_utility_label > best_utilities[term]:
+                    best_utilities[term] = term_utility_label
 
-        term_utilities.sort(reverse=True)
-        new_document_freq = {}
-        while len(new_document_freq) < self.max_terms and \
-              len(term_utilities) > 0:
-            _, term, _ = term_utilities.pop(0)
-            new_document_freq[term] = self.document_freq[term]
-
-        return new_document_freq
+        top_utilities = heapq.nlargest(
+            self.max_terms, best_utilities.values())
+        return {term: self.document_freq[term]
+                for _, term, _ in top_utilities}
 
     def keys(self):
         return self.document_freq.keys()
 
     def process(self, table):
+        if isinstance(table, SparseTable):
+            return self._process_sparse(table)
+
         new_table = {}
         for term, freq in table.items():
             if self.boolean:
@@ -102,6 +141,145 @@ class tfidf(Datasource):
 
         return new_table
 
+    def _process_sparse(self, table):
+        ids, weights = self._get_sparse_weights(table.vocabulary)
+        if len(ids) == 0 or len(table) == 0:
+            return SparseTable.empty(table.vocabulary)
+
+        positions = numpy.minimum(ids.searchsorted(table.ids), len(ids) - 1)
+        selected = ids[positions] == table.ids
+        freqs = table.data[selected]
+        if self.boolean:
+            freqs = numpy.where(freqs > 0, 1, -1)
+        if self.weight:
+            freqs = freqs * weights[positions[selected]]
+
+        return SparseTable(table.ids[selected], freqs, table.vocabulary)
+
+    def _get_sparse_weights(self, vocabulary):
+        # The ids and iDF weights of the selected terms are cached for the
+        # vocabulary that they were looked up in.
+        cached = getattr(self, '_sparse_weights', None)
+        if cached is None or cached[0] is not vocabulary:
+            terms = list(self.document_freq.keys())
+            ids = vocabulary.ids(terms)
+            weights = numpy.array(
+                [log(self.document_n / max(self.document_freq[term], 1))
+                 for term in terms], dtype=float)
+            order = ids.argsort()
+            cached = (vocabulary, ids[order], weights[order])
+            self._sparse_weights = cached
+
+        return cached[1], cached[2]
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['_sparse_weights'] = None
+        return state
+
+
+class TermCounts:
+    """
+    Label frequencies of terms.  Counts of separate sets of observations can
+    be merged with `update()`.
+
+    :Parameters:
+        document_n : `int`
+            The number of (term, observation) pairs counted
+        label_freq : `dict`
+            A mapping of labels to
+            :class:`~revscoring.datasources.meta.sparse.SparseTable` term
+            frequencies
+        label_n : :class:`collections.Counter`
+            The number of (term, observation) pairs counted for each label
+    """
+    __slots__ = ('document_n', 'label_freq', 'label_n')
+
+    def __init__(self, document_n=0, label_freq=None, label_n=None):
+        self.document_n = document_n
+        self.label_freq = label_freq or {}
+        self.label_n = label_n or Counter()
+
+    def update(self, other):
+        self.document_n += other.document_n
+        for label, table in other.label_freq.items():
+            if label in self.label_freq:
+                self.label_freq[label] = self.label_freq[label].add(table)
+            else:
+                self.label_freq[label] = table
+        self.label_n.update(other.label_n)
+
+    def document_freq(self):
+        """
+        Sums the term frequencies of all labels.
+        """
+        document_freq = SparseTable.empty()
+        for table in self.label_freq.values():
+            document_freq = document_freq.add(table)
+        return document_freq
+
+
+def count_terms(value_labels, boolean=False):
+    """
+    Counts the label frequencies of terms in a set of observations.  The
+    tables of each label are gathered into arrays of term ids (see
+    :class:`~revscoring.datasources.meta.sparse.Vocabulary`) and
+    frequencies and summed with numpy.
+
+    :Returns:
+        A :class:`~revscoring.datasources.meta.selectors.TermCounts`
+    """
+    counts = TermCounts()
+    label_tables = defaultdict(list)
+    for values, label in value_labels:
+        table = values[0]
+        counts.document_n += len(table)
+        counts.label_n[label] += len(table)
+        label_tables[label].append(table)
+
+    vocabulary = get_vocabulary()
+    for label, tables in label_tables.items():
+        ids, freqs = _gather(tables, vocabulary)
+        if len(ids) == 0:
+            continue
+        if boolean:
+            freqs = numpy.where(freqs > 0, 1, -1)
+        unique_ids, inverse = numpy.unique(ids, return_inverse=True)
+        sums = numpy.zeros(len(unique_ids), dtype=freqs.dtype)
+        numpy.add.at(sums, inverse, freqs)
+        counts.label_freq[label] = SparseTable(unique_ids, sums, vocabulary)
+
+    return counts
+
+
+def _gather(tables, vocabulary):
+    # SparseTables that share `vocabulary` are used as is.  The terms of
+    # other tables are looked up in one batch.
+    ids, freqs = [], []
+    other_tables = []
+    for table in tables:
+        if isinstance(table, SparseTable) and table.vocabulary is vocabulary:
+            ids.append(table.ids)
+            freqs.append(table.data)
+        else:
+            other_tables.append(table)
+
+    if len(other_tables) > 0:
+        ids.append(vocabulary.ids(
+            list(chain.from_iterable(map(list, other_tables)))))
+        freqs.append(numpy.array(list(chain.from_iterable(
+            table.values() for table in other_tables))))
+
+    return numpy.concatenate(ids), numpy.concatenate(freqs)
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    chunk = list(islice(iterator, size))
+    while len(chunk) > 0:
+        yield chunk
+        chunk = list(islice(iterator, size))
+
 
 def term_utility(label_freq, label_n, document_freq, document_n):
     within_label_prop = label_freq / label_n
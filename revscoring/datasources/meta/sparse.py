@@ -0,0 +1,330 @@
+"""
+Frequency tables of large texts (and the tables of their parent revisions)
+repeat the same terms over and over.  A
+:class:`~revscoring.datasources.meta.sparse.SparseTable` stores a table as a
+sorted array of integer term ids and an array of values.  Term ids come from
+a per-process :class:`~revscoring.datasources.meta.sparse.Vocabulary`, so
+each distinct term is stored (and hashed) once, and diffs between tables
+are computed on the arrays.
+
+A SparseTable implements the read-only `dict` interface (`[]`, `in`,
+`get()`, `keys()`, `values()`, `items()`, `len()`), so code that expects a
+`dict` can use it as one.  It pickles as its terms and values, so tables
+can be moved between processes.
+
+.. autoclass:: revscoring.datasources.meta.sparse.SparseTable
+    :members:
+
+.. autoclass:: revscoring.datasources.meta.sparse.Vocabulary
+    :members:
+
+.. autofunction:: revscoring.datasources.meta.sparse.get_vocabulary
+"""
+import threading
+from collections import Counter
+from collections.abc import Mapping
+
+import numpy
+
+MAX_VOCABULARY_SIZE = 2 ** 22
+"""
+The number of terms that the shared vocabulary holds before it is replaced
+with a new one.  Tables keep a reference to the vocabulary that they were
+built with, so old tables remain valid.
+"""
+
+
+class Vocabulary:
+    """
+    Assigns integer ids to terms in the order they are first seen.
+    """
+
+    def __init__(self):
+        self.term_ids = {}
+        self.terms = []
+        self._lock = threading.Lock()
+
+    def ids(self, terms):
+        """
+        Gets the ids of a `list` of terms, adding new terms to the
+        vocabulary.
+
+        :Returns:
+            A :class:`numpy.ndarray` of `int64` ids
+        """
+        term_ids = self.term_ids
+        try:
+            return numpy.fromiter(map(term_ids.__getitem__, terms),
+                                  dtype=numpy.int64)
+        except KeyError:
+            with self._lock:
+                # Only the distinct, missing terms are added (in the order
+                # that they are first seen).
+                for term in dict.fromkeys(terms):
+                    if term not in term_ids:
+                        term_ids[term] = len(self.terms)
+                        self.terms.append(term)
+
+            return numpy.fromiter(map(term_ids.__getitem__, terms),
+                                  dtype=numpy.int64)
+
+    def get(self, term, default=None):
+        """
+        Gets the id of a term without adding it to the vocabulary.
+        """
+        return self.term_ids.get(term, default)
+
+    def lookup(self, ids):
+        """
+        Gets the terms that a sequence of ids represent.
+        """
+        terms = self.terms
+        return [terms[i] for i in ids]
+
+    def __len__(self):
+        return len(self.terms)
+
+    def __getstate__(self):
+        raise TypeError("Vocabularies are specific to a process and " +
+                        "can't be pickled")
+
+
+_vocabulary = Vocabulary()
+
+
+def get_vocabulary():
+    """
+    Gets the vocabulary that new tables are built with.  The vocabulary is
+    replaced once it holds
+    :data:`~revscoring.datasources.meta.sparse.MAX_VOCABULARY_SIZE` terms so
+    that a long-running process doesn't hold every term it has ever seen.
+    """
+    global _vocabulary
+    if len(_vocabulary) >= MAX_VOCABULARY_SIZE:
+        _vocabulary = Vocabulary()
+    return _vocabulary
+
+
+class SparseTable(Mapping):
+    """
+    A table of terms and values stored as arrays.
+
+    :Parameters:
+        ids : :class:`numpy.ndarray` ( `int64` )
+            Sorted, unique term ids
+        data : :class:`numpy.ndarray`
+            The value for each term id
+        vocabulary : :class:`~revscoring.datasources.meta.sparse.Vocabulary`
+            The vocabulary that `ids` refer to
+    """
+    __slots__ = ('ids', 'data', 'vocabulary')
+
+    def __init__(self, ids, data, vocabulary):
+        self.ids = ids
+        self.data = data
+        self.vocabulary = vocabulary
+
+    @classmethod
+    def from_items(cls, items, vocabulary=None):
+        """
+        Builds a frequency table by counting a sequence of terms.
+        """
+        counts = Counter(items)
+        return cls.from_counts(list(counts.keys()), list(counts.values()),
+                               vocabulary=vocabulary)
+
+    @classmethod
+    def from_counts(cls, terms, counts, vocabulary=None):
+        """
+        Builds a table from a sequence of terms and a count (or other value)
+        for each term.  The counts of repeated terms are summed.
+        """
+        if vocabulary is None:
+            vocabulary = get_vocabulary()
+        if len(terms) == 0:
+            return cls.empty(vocabulary)
+        ids = vocabulary.ids(terms)
+        counts = numpy.asarray(counts)
+        unique_ids, inverse = numpy.unique(ids, return_inverse=True)
+        if len(unique_ids) == len(ids):
+            values = numpy.empty(len(ids), dtype=counts.dtype)
+            values[inverse] = counts
+        else:
+            values = numpy.zeros(len(unique_ids), dtype=counts.dtype)
+            numpy.add.at(values, inverse, counts)
+        return cls(unique_ids, values, vocabulary)
+
+    @classmethod
+    def from_dict(cls, d, vocabulary=None):
+        """
+        Converts a `dict` (or another
+        :class:`~revscoring.datasources.meta.sparse.SparseTable`) into a
+        table.
+        """
+        if isinstance(d, SparseTable) and \
+                (vocabulary is None or d.vocabulary is vocabulary):
+            return d
+        d = d or {}
+        return cls.from_counts(list(d.keys()), list(d.values()),
+                               vocabulary=vocabulary)
+
+    @classmethod
+    def empty(cls, vocabulary=None):
+        """
+        Builds an empty table.
+        """
+        if vocabulary is None:
+            vocabulary = get_vocabulary()
+        return cls(numpy.empty(0, dtype=numpy.int64),
+                   numpy.empty(0, dtype=numpy.int64), vocabulary)
+
+    def _find(self, term):
+        term_id = self.vocabulary.get(term)
+        if term_id is not None:
+            i = self.ids.searchsorted(term_id)
+            if i < len(self.ids) and self.ids[i] == term_id:
+                return i
+        return None
+
+    def __getitem__(self, term):
+        i = self._find(term)
+        if i is None:
+            raise KeyError(term)
+        return self.data[i].item()
+
+    def __contains__(self, term):
+        return self._find(term) is not None
+
+    def __iter__(self):
+        return iter(self.vocabulary.lookup(self.ids.tolist()))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def values(self):
+        """
+        Returns a `list` of the values in the table.
+        """
+        return self.data.tolist()
+
+    def items(self):
+        """
+        Returns a `list` of (term, value) pairs.
+        """
+        return list(zip(self.vocabulary.lookup(self.ids.tolist()),
+                        self.data.tolist()))
+
+    def aligned(self, other):
+        """
+        Aligns the values of two tables over the union of their terms.
+
+        :Returns:
+            A tuple of ids, the values of `self` and the values of `other`
+        """
+        other = SparseTable.from_dict(other, vocabulary=self.vocabulary)
+        ids = numpy.union1d(self.ids, other.ids)
+        values = numpy.zeros(len(ids), dtype=self.data.dtype)
+        values[ids.searchsorted(self.ids)] = self.data
+        other_values = numpy.zeros(len(ids), dtype=other.data.dtype)
+        other_values[ids.searchsorted(other.ids)] = other.data
+        return ids, values, other_values
+
+    def add(self, other):
+        """
+        Sums the values of two tables.
+        """
+        ids, values, other_values = self.aligned(other)
+        return SparseTable(ids, values + other_values, self.vocabulary)
+
+    def delta(self, new_table):
+        """
+        Computes the frequency delta from this (old) table to a new table.
+        See :class:`~revscoring.datasources.meta.frequencies.delta`.
+        """
+        ids, old_counts, new_counts = self.aligned(new_table)
+        deltas = new_counts - old_counts
+        changed = deltas != 0
+        return SparseTable(ids[changed], deltas[changed], self.vocabulary)
+
+    def delta_and_prop_delta(self, new_table):
+        """
+        Computes the frequency delta and proportional frequency delta from
+        this (old) table to a new table.  See
+        :class:`~revscoring.datasources.meta.frequencies.delta_and_prop_delta`.
+        """
+        ids, old_counts, new_counts = self.aligned(new_table)
+        deltas = new_counts - old_counts
+        changed = deltas != 0
+        ids, old_counts, deltas = \
+            ids[changed], old_counts[changed], deltas[changed]
+
+        prop_deltas = deltas / numpy.where(deltas > 0, old_counts + 1,
+                                           old_counts)
+        return (SparseTable(ids, deltas, self.vocabulary),
+                SparseTable(ids, prop_deltas, self.vocabulary))
+
+    def prop_delta(self, delta_table):
+        """
+        Computes the proportional frequency delta of a delta table relative
+        to this (old) table.  See
+        :class:`~revscoring.datasources.meta.frequencies.prop_delta`.
+        """
+        delta_table = SparseTable.from_dict(delta_table,
+                                            vocabulary=self.vocabulary)
+        old_counts = numpy.zeros(len(delta_table), dtype=self.data.dtype)
+        if len(self.ids) > 0:
+            positions = numpy.minimum(self.ids.searchsorted(delta_table.ids),
+                                      len(self.ids) - 1)
+            found = self.ids[positions] == delta_table.ids
+            old_counts[found] = self.data[positions[found]]
+
+        deltas = delta_table.data
+        prop_deltas = deltas / numpy.where(deltas > 0, old_counts + 1,
+                                           old_counts)
+        return SparseTable(delta_table.ids, prop_deltas, self.vocabulary)
+
+    def select(self, mask):
+        """
+        Returns a table of the terms where `mask` is `True`.
+        """
+        return SparseTable(self.ids[mask], self.data[mask],
+                           self.vocabulary)
+
+    def positive(self):
+        """
+        Returns a table of the terms with positive values.
+        """
+        return self.select(self.data > 0)
+
+    def negative(self, absolute=False):
+        """
+        Returns a table of the terms with negative values.
+        """
+        table = self.select(self.data < 0)
+        if absolute:
+            table.data = numpy.abs(table.data)
+        return table
+
+    def __eq__(self, other):
+        if isinstance(other, SparseTable) and \
+                other.vocabulary is self.vocabulary:
+            return numpy.array_equal(self.ids, other.ids) and \
+                numpy.array_equal(self.data, other.data)
+        else:
+            return super().__eq__(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __reduce__(self):
+        return (_from_pickle, (list(self), self.data))
+
+    def __repr__(self):
+        return "{0}({1!r})".format(self.__class__.__name__, dict(self.items()))
+
+
+def _from_pickle(terms, values):
+    return SparseTable.from_counts(terms, values)
+
@@ -1,4 +1,5 @@
 import pickle
+import re
 
 from nose.tools import eq_
 
@@ -50,3 +51,58 @@ def test_segment_extractor():
         ["foo bar", "bar foo", "foo bar"])
 
     eq_(pickle.loads(pickle.dumps(segment_extractor)), segment_extractor)
+
+
+def test_multi_regex():
+    scanner = extractors.multi_regex(text)
+    foo_bar = extractors.regex(["foo bar", "bar foo"], text, scanner=scanner)
+    foos = extractors.regex(["fo+", "bar"], text, exclusions=['foooo'],
+                            scanner=scanner)
+    bars = extractors.regex(["bar"], text, wrapping=None, scanner=scanner)
+
+    cache = {text: "This is some text foo bar nope bar foo foooo fooo barbar"}
+    eq_(list(solve([foo_bar, foos, bars], cache=cache)),
+        [["foo bar", "bar foo"], ["foo", "bar", "bar", "foo", "fooo"],
+         ["bar", "bar", "bar", "bar"]])
+    eq_(list(solve([foo_bar, foos], cache={text: None})), [[], []])
+
+    cache = {segments: ["foo bar", "bar foo"]}
+    segment_scanner = extractors.multi_regex(segments)
+    segment_foos = extractors.regex(["fo+", "bar"], segments,
+                                    scanner=segment_scanner)
+    eq_(solve(segment_foos, cache=cache), ["foo", "bar", "bar", "foo"])
+
+    # Sets that another scanner with the same name doesn't know about are
+    # scanned for separately
+    other = extractors.regex(["nope"], text,
+                             scanner=extractors.multi_regex(text))
+    eq_(list(solve([foo_bar, other], cache={text: "foo bar nope"})),
+        [["foo bar"], ["nope"]])
+
+    eq_(pickle.loads(pickle.dumps(foos)), foos)
+    eq_(solve(pickle.loads(pickle.dumps(foos)), cache={text: "foo fooooo"}),
+        ["foo", "fooooo"])
+
+
+def test_group_alternatives():
+    # The first alternative that matches still wins
+    regexes = ["bad", "b[ae]d", r"\w+", "badass", "lol", "Bad"]
+    for text in ["bad", "badass", "bed", "lolbad", "Badass lol"]:
+        eq_(re.findall(extractors.group_alternatives(regexes), text, re.I),
+            re.findall("|".join(regexes), text, re.I))
+
+
+def test_required_literals():
+    eq_(extractors.required_literals(["foo\\w+", "b+u+t+t+", "boo+ger"]),
+        {"foo", "bu", "oger"})
+    # "bad" is in every text that contains "badass"
+    eq_(extractors.required_literals(["bad", "badass", "ΣΑΣ"]),
+        {"bad", "σασ"})
+    eq_(extractors.required_literals(["foo", "a|b"]), None)
+    eq_(extractors.required_literals(["foo", "\\w+"]), None)
+
+    # Texts without any of the literals are skipped, but case-insensitive
+    # matches are still found.
+    extractor = extractors.regex(["σας", "ix", "st"], text)
+    eq_(solve(extractor, cache={text: "ΣΑΣ İx ſt"}), ["ΣΑΣ", "İx", "ſt"])
+    eq_(solve(extractor, cache={text: "Nothing to see here"}), [])
@@ -2,7 +2,7 @@ import pickle
 
 from nose.tools import eq_
 
-from .. import frequencies
+from .. import frequencies, indexable
 from ....dependencies import solve
 from ...datasource import Datasource
 
@@ -20,6 +20,8 @@ neg_abs_delta = frequencies.negative(
 
 prop_delta = frequencies.prop_delta(old_ft, delta, name="prop_delta")
 
+deltas = frequencies.delta_and_prop_delta(old_ft, new_ft, name="deltas")
+
 
 def test_table():
     cache = {new_tokens: ["a"] * 3 + ["b"] * 2 + ["c"] * 45}
@@ -56,6 +58,22 @@ def test_prop_delta():
         prop_delta)
 
 
+def test_delta_and_prop_delta():
+    cache = {old_tokens: ["a"] * 3 + ["b"] * 2 + ["c"] * 45 + ["e"] * 2,
+             new_tokens: ["a"] * 1 + ["b"] * 5 + ["d"] * 3 + ["e"] * 3}
+
+    fused_delta, fused_prop_delta = solve(deltas, cache=cache)
+    eq_(fused_delta, solve(delta, cache=cache))
+    eq_(fused_prop_delta, solve(prop_delta, cache=cache))
+    eq_(solve(indexable.index(1, deltas), cache=cache), fused_prop_delta)
+
+    eq_(solve(deltas, cache={old_ft: None, new_ft: {'a': 1}}),
+        ({'a': 1}, {'a': 1.0}))
+
+    eq_(pickle.loads(pickle.dumps(deltas)),
+        deltas)
+
+
 def test_positive():
     cache = {old_tokens: ["a"] * 3 + ["b"] * 2 + ["c"] * 45 + ["e"] * 2,
              new_tokens: ["a"] * 1 + ["b"] * 5 + ["d"] * 3 + ["e"] * 3}
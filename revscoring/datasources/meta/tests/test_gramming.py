@@ -2,7 +2,7 @@ import pickle
 
 from nose.tools import eq_
 
-from .. import gramming
+from .. import gramming, hashing
 from ....dependencies import solve
 from ...datasource import Datasource
 
@@ -17,3 +17,35 @@ def test_gramming():
 
     eq_(pickle.loads(pickle.dumps(my_grams)),
         my_grams)
+
+
+my_bigrams = gramming.gram(my_tokens, grams=[(0, 1)])
+my_hashed_grams = gramming.hashed_gram(my_tokens, grams=[(0,), (0, 2)], n=10)
+my_gram_counts = gramming.hashed_gram(
+    my_tokens, grams=[(0,), (0, 2)], n=10, counted=True)
+
+
+def test_gram_tokens():
+    eq_(solve(my_bigrams, cache={my_tokens: ["one", "two", "three"]}),
+        [("one", "two"), ("two", "three")])
+    eq_(solve(my_grams, cache={my_tokens: []}), [])
+    eq_(list(gramming.gram_tokens(iter(["one", "two"]), grams=[(0, 1)])),
+        [("one", "two")])
+
+    eq_(gramming.count_grams(4, [(0,), (0, 2)]), 6)
+    eq_(gramming.count_grams(1, [(0,), (0, 2)]), 1)
+
+
+def test_hashed_gram():
+    tokens = ["one", "two", "three", "four"]
+    hashes = solve(my_hashed_grams, cache={my_tokens: tokens})
+    eq_(list(hashes), list(hashing.hash_items(
+        solve(my_grams, cache={my_tokens: tokens}), 10)))
+    eq_(list(solve(my_hashed_grams, cache={my_tokens: tokens[:1]})),
+        list(hashing.hash_items(["one"], 10)))
+    eq_(len(solve(my_hashed_grams, cache={my_tokens: []})), 0)
+
+    eq_(solve(my_gram_counts, cache={my_tokens: tokens}),
+        hashing.HashCounts.from_hashes(hashes, 10))
+
+    eq_(pickle.loads(pickle.dumps(my_hashed_grams)), my_hashed_grams)
@@ -1,5 +1,7 @@
 import pickle
 
+import numpy
+
 from nose.tools import eq_
 
 from .. import hashing
@@ -24,3 +26,40 @@ def test_hashing():
 
     eq_(pickle.loads(pickle.dumps(my_hashes)),
         my_hashes)
+
+
+my_batch_hashes = hashing.batch_hash(my_tokens, n=10)
+my_hash_counts = hashing.batch_hash(my_tokens, n=10, counted=True)
+
+
+def test_batch_hash():
+    items = [("one", "two"), "two", "three", "four", ("two",), ("one", 2)]
+    hashes = solve(my_batch_hashes, cache={my_tokens: items})
+
+    eq_(len(hashes), 6)
+    assert hashes.min() >= 0 and hashes.max() < 10, str(hashes)
+    eq_(hashes[1], hashes[4])
+    eq_(list(hashes[:4]),
+        list(hashing.hash_items([("one", "two"), "two", "three", "four"], 10)))
+    eq_(list(hashing.hash_items(["two", "three"], 10)),
+        [hashes[1], hashes[2]])
+    eq_(len(hashing.hash_items([], 10)), 0)
+
+    counts = solve(my_hash_counts, cache={my_tokens: items})
+    eq_(counts.toarray().sum(), 6)
+    eq_(list(counts.toarray()),
+        list(numpy.bincount(hashes, minlength=10)))
+
+    eq_(pickle.loads(pickle.dumps(my_batch_hashes)), my_batch_hashes)
+    eq_(pickle.loads(pickle.dumps(counts)), counts)
+
+
+def test_gram_hashes():
+    tokens = ["one", "two", "three"]
+    token_hashes = hashing.token_hashes(tokens)
+    bigrams = hashing.fold(hashing.fold(0, token_hashes[:-1]),
+                           token_hashes[1:])
+    eq_(list(bigrams),
+        list(hashing.gram_hashes([("one", "two"), ("two", "three")])))
+    assert len(set(hashing.gram_hashes([("one", "two"), ("two", "one")]))) \
+        == 2
@@ -3,6 +3,7 @@ import io
 from nose.tools import eq_
 
 from .. import frequencies, selectors
+from ..sparse import SparseTable
 from ....dependencies import solve
 from ...datasource import Datasource
 
@@ -67,8 +68,38 @@ def test_boolean_tfidf():
     eq_(set(tfidf_table.keys()), {'true', 'false', 'maybe'})
 
 
+def test_parallel_tfidf():
+    value_labels = [
+        ([{"one": 1, "maybe": 1, "true": 1, "four": 1}], True),
+        ([{"one": 1, "true": 1}], True),
+        ([SparseTable.from_dict({"one": 1, "true": 1, "four": 1})], True),
+        ([{"maybe": 1, "true": 2}], True),
+        ([{"one": 1, "maybe": -1, "four": 1, "false": 1}], False),
+        ([SparseTable.from_dict({"false": 3})], False)
+    ]
+    serial_tfidf_table = selectors.tfidf(my_table, max_terms=3)
+    serial_tfidf_table.fit(value_labels, chunk_size=2)
+    parallel_tfidf_table = selectors.tfidf(my_table, max_terms=3)
+    parallel_tfidf_table.fit(value_labels, processes=2, chunk_size=2)
+
+    eq_(parallel_tfidf_table.document_freq,
+        serial_tfidf_table.document_freq)
+    eq_(parallel_tfidf_table.document_n, serial_tfidf_table.document_n)
+    eq_(set(serial_tfidf_table.keys()), {'true', 'false', 'maybe'})
+
+
 def test_filter_keys():
     cache = {my_tokens: ["one", "maybe", "true", "four", "false"]}
     filtered_keys = solve(my_filtered_keys, cache=cache)
 
     eq_(set(filtered_keys.keys()), {'true', 'false'})
+
+
+def test_sparse_tfidf():
+    table = {"one": 2, "maybe": -1, "true": 1, "four": 1}
+    sparse_table = solve(my_tfidf_table, cache={my_table: table})
+    eq_(solve(my_tfidf_table, cache={my_table: SparseTable.from_dict(table)}),
+        sparse_table)
+    eq_(solve(my_boolean_tfidf_table,
+              cache={my_table: SparseTable.from_dict(table)}),
+        solve(my_boolean_tfidf_table, cache={my_table: table}))
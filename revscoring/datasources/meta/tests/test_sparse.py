@@ -0,0 +1,57 @@
+import pickle
+
+from nose.tools import eq_
+
+from .. import frequencies, sparse
+from ..sparse import SparseTable, Vocabulary
+
+OLD = {"foo": 3, "bar": 2, "baz": 1}
+NEW = {"foo": 1, "bar": 2, "herp": 4}
+
+
+def test_table():
+    table = SparseTable.from_items(["foo", "bar", "foo", "foo"])
+    eq_(table, {"foo": 3, "bar": 1})
+    eq_(table["foo"], 3)
+    assert "bar" in table
+    assert "baz" not in table
+    eq_(table.get("baz", 0), 0)
+    eq_(len(table), 2)
+    eq_(dict(table), {"foo": 3, "bar": 1})
+    eq_(SparseTable.from_counts(["foo", "bar", "foo"], [1, 2, 3]),
+        {"foo": 4, "bar": 2})
+    eq_(SparseTable.from_counts([], []), {})
+
+    eq_(pickle.loads(pickle.dumps(table)), table)
+
+
+def test_delta():
+    old, new = SparseTable.from_dict(OLD), SparseTable.from_dict(NEW)
+
+    eq_(old.delta(new), frequencies.delta.process(None, OLD, NEW))
+    eq_(old.delta(NEW), {"foo": -2, "baz": -1, "herp": 4})
+
+    delta, prop_delta = old.delta_and_prop_delta(new)
+    eq_(delta, {"foo": -2, "baz": -1, "herp": 4})
+    eq_(prop_delta, {"foo": -2 / 3, "baz": -1.0, "herp": 4.0})
+    eq_(old.prop_delta(delta), prop_delta)
+
+    eq_(delta.positive(), {"herp": 4})
+    eq_(delta.negative(), {"foo": -2, "baz": -1})
+    eq_(delta.negative(absolute=True), {"foo": 2, "baz": 1})
+
+
+def test_vocabularies():
+    vocabulary = Vocabulary()
+    table = SparseTable.from_dict(OLD, vocabulary=vocabulary)
+    other = SparseTable.from_dict(NEW)
+    assert table.vocabulary is not other.vocabulary
+    eq_(table.delta(other), {"foo": -2, "baz": -1, "herp": 4})
+
+    old_max_size = sparse.MAX_VOCABULARY_SIZE
+    try:
+        sparse.MAX_VOCABULARY_SIZE = 0
+        assert sparse.get_vocabulary() is not other.vocabulary
+    finally:
+        sparse.MAX_VOCABULARY_SIZE = old_max_size
+    eq_(other, NEW)
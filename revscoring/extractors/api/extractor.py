@@ -1,4 +1,5 @@
 import logging
+import time
 from itertools import islice
 
 import mwapi
@@ -8,6 +9,7 @@ from .. import Extractor as BaseExtractor
 from ...datasources import Datasource, revision_oriented
 from ...dependencies import expand
 from ...errors import RevisionNotFound, UserNotFound
+from ...metrics import default_registry
 from .revision_oriented import Revision
 from .util import REV_PROPS, USER_PROPS
 
@@ -15,9 +17,18 @@ logger = logging.getLogger(__name__)
 
 
 class Extractor(BaseExtractor):
-    def __init__(self, session, context=None, cache=None):
+    def __init__(self, session, context=None, cache=None, metrics=None):
         super().__init__(context=context, cache=cache)
         self.session = session
+        self.metrics = metrics if metrics is not None else default_registry
+        self.api_requests = self.metrics.counter(
+            "api_requests_total", "Requests made to the MediaWiki API by kind")
+        self.api_errors = self.metrics.counter(
+            "api_errors_total",
+            "Requests to the MediaWiki API that failed by kind and error")
+        self.api_duration = self.metrics.histogram(
+            "api_request_seconds",
+            "Time spent waiting on the MediaWiki API by kind")
         self.dependents = Datasource("extractor.dependents")
 
         rev_doc = self.get_rev_doc_by_id(revision_oriented.revision)
@@ -236,8 +247,9 @@ class Extractor(BaseExtractor):
             if len(batch_ids) == 0:
                 break
             else:
-                doc = self.session.get(action='query', prop='revisions',
-                                       revids=batch_ids, **params)
+                doc = self._api_get("revisions", action='query',
+                                    prop='revisions', revids=batch_ids,
+                                    **params)
 
                 for page_doc in doc['query'].get('pages', {}).values():
                     yield from _normalize_revisions(page_doc)
@@ -259,8 +271,8 @@ class Extractor(BaseExtractor):
             if len(batch_texts) == 0:
                 break
             else:
-                doc = self.session.get(action='query', list='users',
-                                       ususers=batch_texts, **params)
+                doc = self._api_get("users", action='query', list='users',
+                                    ususers=batch_texts, **params)
 
                 for user_doc in doc['query'].get('users', []):
                     yield user_doc
@@ -272,10 +284,11 @@ class Extractor(BaseExtractor):
 
         logger.debug("Requesting the last revision by {0} from the API"
                      .format(user_text))
-        doc = self.session.get(action="query", list="usercontribs",
-                               ucuser=user_text, ucprop=ucprop,
-                               uclimit=1, ucdir="older",
-                               ucstart=(rev_timestamp - 1))
+        doc = self._api_get("usercontribs",
+                            action="query", list="usercontribs",
+                            ucuser=user_text, ucprop=ucprop,
+                            uclimit=1, ucdir="older",
+                            ucstart=(rev_timestamp - 1))
 
         rev_docs = doc['query']['usercontribs']
 
@@ -293,9 +306,10 @@ class Extractor(BaseExtractor):
 
         logger.debug("Requesting creation revision for ({0}) from the API"
                      .format(page_id))
-        doc = self.session.get(action="query", prop="revisions",
-                               pageids=page_id, rvdir="newer", rvlimit=1,
-                               rvprop=rvprop)
+        doc = self._api_get("page_creation",
+                            action="query", prop="revisions",
+                            pageids=page_id, rvdir="newer", rvlimit=1,
+                            rvprop=rvprop)
 
         page_doc = doc['query'].get('pages', {'revisions': []}).values()
         rev_docs = page_doc['revisions']
@@ -306,6 +320,17 @@ class Extractor(BaseExtractor):
             # This is bad, but it should be handled by the calling funcion
             return None
 
+    def _api_get(self, kind, **params):
+        self.api_requests.inc(kind=kind)
+        start = time.perf_counter()
+        try:
+            return self.session.get(**params)
+        except Exception as e:
+            self.api_errors.inc(kind=kind, error=e.__class__.__name__)
+            raise
+        finally:
+            self.api_duration.observe(time.perf_counter() - start, kind=kind)
+
     @classmethod
     def from_config(cls, config, name, section_key="extractors"):
         logger.info("Loading api.Extractor '{0}' from config.".format(name))
@@ -53,6 +53,7 @@ Base classes
 
 from .feature import Feature, Modifier, Constant
 from .feature_vector import FeatureVector
-from .functions import trim, vectorize_values
+from .functions import trim, vectorize_values, vectorize_matrix
 
-__all__ = [Feature, Modifier, Constant, FeatureVector, trim, vectorize_values]
+__all__ = [Feature, Modifier, Constant, FeatureVector, trim, vectorize_values,
+           vectorize_matrix]
@@ -1,9 +1,25 @@
+import numpy
+from scipy import sparse
+
 from . import Feature
 
 
 class FeatureVector(Feature):
+    """
+    A feature that generates a vector of values.  Values can be returned as
+    a `list`, a :class:`numpy.ndarray` or a single-row :mod:`scipy.sparse`
+    matrix.  See :func:`~revscoring.features.vectorize_matrix`.
+    """
 
     def validate(self, vector):
+        if isinstance(vector, numpy.ndarray) or sparse.issparse(vector):
+            if not numpy.can_cast(vector.dtype, self.returns,
+                                  casting='same_kind'):
+                raise ValueError(
+                    "Expected {0}, but got an array of {1} instead."
+                    .format(self.returns, vector.dtype))
+            return vector
+
         for i, value in enumerate(vector):
             if not isinstance(value, self.returns):
                 raise ValueError(
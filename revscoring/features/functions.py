@@ -1,8 +1,15 @@
 """
 .. autofunction:: revscoring.features.trim
+
+.. autofunction:: revscoring.features.vectorize_values
+
+.. autofunction:: revscoring.features.vectorize_matrix
 """
 from itertools import chain
 
+import numpy
+from scipy import sparse
+
 from .feature import Constant, Feature, Modifier
 
 
@@ -46,5 +53,93 @@ def vectorize_values(feature_values):
     Converts a list of feature_values that contains sub-FeatureVector
     into a flat list of values.
     """
-    return list(chain(*(val if hasattr(val, "__iter__") else [val]
-                        for val in feature_values)))
+    return list(chain(*(_flat_values(val) for val in feature_values)))
+
+
+def _flat_values(value):
+    if sparse.issparse(value):
+        return value.toarray().ravel().tolist()
+    elif isinstance(value, numpy.ndarray):
+        return value.ravel().tolist()
+    elif hasattr(value, "__iter__"):
+        return value
+    else:
+        return [value]
+
+
+def vectorize_matrix(observations_values, sparse_output=None):
+    """
+    Converts the feature_values of a set of observations into a matrix with
+    a row per observation.  Sub-FeatureVector values are flattened into
+    columns.
+
+    :Parameters:
+        observations_values : `iterable` ( `list` )
+            The feature_values of each observation
+        sparse_output : `bool`
+            Return a :class:`scipy.sparse.csr_matrix`.  If `None`, a sparse
+            matrix is returned when any of the first observation's values is
+            a :mod:`scipy.sparse` matrix.  Otherwise, a 2D
+            :class:`numpy.ndarray` is returned.
+    """
+    observations_values = list(observations_values)
+    if sparse_output is None:
+        sparse_output = len(observations_values) > 0 and \
+            any(sparse.issparse(value) for value in observations_values[0])
+
+    if not sparse_output:
+        return numpy.array([vectorize_values(feature_values)
+                            for feature_values in observations_values])
+
+    indices, data, indptr = [], [], [0]
+    n_columns = None
+    for feature_values in observations_values:
+        row_indices, row_data, row_columns = _sparse_row(feature_values)
+        if n_columns is None:
+            n_columns = row_columns
+        elif n_columns != row_columns:
+            raise ValueError(
+                "Expected {0} values, but got {1} instead."
+                .format(n_columns, row_columns))
+        indices.append(row_indices)
+        data.append(row_data)
+        indptr.append(indptr[-1] + len(row_indices))
+
+    if len(indices) == 0:
+        return sparse.csr_matrix((0, 0))
+    matrix = sparse.csr_matrix(
+        (numpy.concatenate(data), numpy.concatenate(indices), indptr),
+        shape=(len(observations_values), n_columns))
+    matrix.sort_indices()
+    return matrix
+
+
+def _sparse_row(feature_values):
+    # Scalar values are gathered into one block so that the arrays are only
+    # built once per row.
+    scalar_indices, scalar_data = [], []
+    indices, data = [], []
+    offset = 0
+    for value in feature_values:
+        if sparse.issparse(value):
+            value = value.tocsr()
+            indices.append(value.indices + offset)
+            data.append(value.data)
+            offset += value.shape[1]
+        elif isinstance(value, numpy.ndarray) or hasattr(value, "__iter__"):
+            value = numpy.ravel(value if isinstance(value, numpy.ndarray)
+                                else list(value))
+            nonzero = numpy.flatnonzero(value)
+            indices.append(nonzero + offset)
+            data.append(value[nonzero])
+            offset += len(value)
+        else:
+            if value != 0:
+                scalar_indices.append(offset)
+                scalar_data.append(value)
+            offset += 1
+
+    indices.append(numpy.array(scalar_indices, dtype=numpy.int32))
+    data.append(numpy.array(scalar_data, dtype=float))
+    return (numpy.concatenate(indices),
+            numpy.concatenate(data).astype(float), offset)
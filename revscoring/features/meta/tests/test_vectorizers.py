@@ -4,6 +4,7 @@ from nose.tools import eq_
 
 from .. import vectorizers
 from ....datasources import Datasource
+from ....datasources.meta.sparse import SparseTable
 from ....dependencies import solve
 
 my_dict = Datasource("my_dict")
@@ -38,3 +39,34 @@ def test_vectorize():
 
     eq_(solve(my_keys_vector, cache={my_keys_dict: {"a": 1, "b": 2, "c": 3}}),
         [1, 2, 3])
+
+
+def test_sparse_vectorize():
+    my_vector = vectorizers.vectorize(
+        my_dict, ["a", "b", "c"], returns=int)
+
+    eq_(solve(my_vector, cache={my_dict: SparseTable.from_dict({"a": 5})}),
+        [5, 0, 0])
+    eq_(solve(my_vector, cache={my_dict: SparseTable.from_dict({"d": 5})}),
+        [0, 0, 0])
+    eq_(solve(my_vector, cache={my_dict: SparseTable.from_dict({})}),
+        [0, 0, 0])
+    eq_(solve(my_vector,
+              cache={my_dict: SparseTable.from_dict({"c": 3, "a": 1})}),
+        [1, 0, 3])
+    eq_(pickle.loads(pickle.dumps(my_vector))._key_ids, None)
+
+
+def test_csr_vectorize():
+    my_vector = vectorizers.vectorize(
+        my_dict, ["a", "b", "c"], returns=int, sparse=True)
+    assert my_vector != vectorizers.vectorize(
+        my_dict, ["a", "b", "c"], returns=int)
+
+    eq_(solve(my_vector, cache={my_dict: {"a": 5, "c": 0}}).toarray().tolist(),
+        [[5, 0, 0]])
+    vector = solve(
+        my_vector, cache={my_dict: SparseTable.from_dict({"c": 3, "a": 1})})
+    eq_(vector.toarray().tolist(), [[1, 0, 3]])
+    eq_(vector.nnz, 2)
+    eq_(solve(my_vector, cache={my_dict: {}}).shape, (1, 3))
@@ -4,6 +4,10 @@ These Meta-Features genetate a :class:`revscoring.FeatureVector` based on some
 
 .. autoclass revscoring.features.meta.vectorizers.vectorize
 """
+import numpy
+from scipy import sparse as scipy_sparse
+
+from ...datasources.meta.sparse import SparseTable
 from ..feature_vector import FeatureVector
 
 
@@ -29,9 +33,13 @@ class vectorize(FeatureVector):
             in the dict.
         name : `str`
             A name for the `revscoring.FeatureVector`
+        sparse : `bool`
+            Return a 1 x len(`keys`) :class:`scipy.sparse.csr_matrix` of the
+            non-zero values rather than a `list`
     """
 
-    def __init__(self, dict_datasource, keys=None, returns=None, name=None):
+    def __init__(self, dict_datasource, keys=None, returns=None, name=None,
+                 sparse=False):
         if keys is None:
             if hasattr(dict_datasource, "keys"):
                 keys = dict_datasource.keys()
@@ -41,11 +49,71 @@ class vectorize(FeatureVector):
                     "method and `keys` argument was not specified")
 
         self.keys = sorted(keys) if keys is not None else None
-        name = self._format_name(name, [dict_datasource, self.keys[:10]])
+        self.sparse = bool(sparse)
+        args = [dict_datasource, self.keys[:10]]
+        if self.sparse:
+            args.append("sparse")
+        name = self._format_name(name, args)
         super().__init__(name, self.process, depends_on=[dict_datasource],
                          returns=returns)
         # Sorting keys so that output is deterministic
+        self._key_ids = None
 
     def process(self, d):
+        if self.sparse:
+            return self._process_csr(d)
+        elif isinstance(d, SparseTable):
+            return self._process_sparse(d)
 
         return [(d[key] if key in d else self.returns()) for key in self.keys]
+
+    def _process_csr(self, d):
+        if isinstance(d, SparseTable):
+            indices, values = self._find_sparse(d)
+            values = numpy.asarray(values)
+        else:
+            indices, values = [], []
+            for i, key in enumerate(self.keys):
+                if key in d:
+                    indices.append(i)
+                    values.append(d[key])
+            values = numpy.array(values, dtype=numpy.dtype(self.returns))
+
+        nonzero = values != 0
+        return scipy_sparse.csr_matrix(
+            (values[nonzero], numpy.asarray(indices)[nonzero],
+             [0, nonzero.sum()]),
+            shape=(1, len(self.keys)))
+
+    def _process_sparse(self, table):
+        vector = [self.returns()] * len(self.keys)
+        indices, values = self._find_sparse(table)
+        for i, value in zip(indices.tolist(), values.tolist()):
+            vector[i] = value
+
+        return vector
+
+    def _find_sparse(self, table):
+        # Finds the positions (in `keys`) and values of the keys in `table`
+        if len(table) == 0:
+            return (numpy.empty(0, dtype=numpy.int64),
+                    numpy.empty(0, dtype=table.data.dtype))
+        key_ids = self._get_key_ids(table.vocabulary)
+        positions = numpy.minimum(table.ids.searchsorted(key_ids),
+                                  len(table) - 1)
+        found = table.ids[positions] == key_ids
+        return numpy.flatnonzero(found), table.data[positions[found]]
+
+    def _get_key_ids(self, vocabulary):
+        # Key ids are cached for the vocabulary that they were looked up in
+        cached = getattr(self, '_key_ids', None)
+        if cached is None or cached[0] is not vocabulary:
+            cached = (vocabulary, vocabulary.ids(self.keys))
+            self._key_ids = cached
+
+        return cached[1]
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['_key_ids'] = None
+        return state
@@ -1,9 +1,11 @@
-from nose.tools import eq_
+import numpy
+from nose.tools import eq_, raises
+from scipy import sparse
 
 from ...datasources import Datasource
 from ..feature import Constant, Feature
 from ..feature_vector import FeatureVector
-from ..functions import trim, vectorize_values
+from ..functions import trim, vectorize_matrix, vectorize_values
 from ..modifiers import log, max
 
 
@@ -26,3 +28,27 @@ def test_vectorize_features():
     feature_values = [1, 2.0, [1.0, 2.0, 3.0], False]
     eq_(vectorize_values(feature_values),
         [1, 2.0, 1.0, 2.0, 3.0, False])
+
+    feature_values = [1, numpy.array([1.0, 2.0]),
+                      sparse.csr_matrix([[0, 3.0]]), True]
+    eq_(vectorize_values(feature_values), [1, 1.0, 2.0, 0.0, 3.0, True])
+
+
+def test_vectorize_matrix():
+    matrix = vectorize_matrix([[1, [1.0, 0.0], False],
+                               [0, [3.0, 4.0], True]])
+    eq_(matrix.tolist(), [[1, 1.0, 0.0, 0], [0, 3.0, 4.0, 1]])
+
+    observations_values = [[1, sparse.csr_matrix([[0, 2.0, 0]]), [0.0, 5.0]],
+                           [0, sparse.csr_matrix([[3.0, 0, 0]]), [1.0, 0.0]]]
+    matrix = vectorize_matrix(observations_values)
+    assert sparse.isspmatrix_csr(matrix)
+    eq_(matrix.shape, (2, 6))
+    eq_(matrix.nnz, 5)
+    eq_(matrix.toarray().tolist(),
+        vectorize_matrix(observations_values, sparse_output=False).tolist())
+
+
+@raises(ValueError)
+def test_vectorize_matrix_error():
+    vectorize_matrix([[1, [1.0, 0.0]], [1, [1.0]]], sparse_output=True)
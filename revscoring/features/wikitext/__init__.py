@@ -364,8 +364,41 @@ Supporting classes
         **longest_uppercase_word_added** : `int`
             The length of the longest sequence of UPPPERCASE characters
             added
+        **approximate_diff** : `bool`
+            True if the edit was too large to diff and the token edit
+            features were computed from a bag-of-tokens delta
+
+Diff limits
++++++++++++
+
+.. autofunction:: revscoring.features.wikitext.set_diff_limits
+
+.. autofunction:: revscoring.features.wikitext.get_diff_limits
+
+Scanning instead of parsing
++++++++++++++++++++++++++++
+The parsed features (e.g. `wikilinks`, `templates`, `ref_tags` and
+`content_chars`) are gathered from a :mod:`mwparserfromhell` parse tree.  A
+feature set can gather them with
+:func:`~revscoring.features.wikitext.datasources.scanner.scan` instead, which
+is several times faster on long articles.  The scanner follows the parser's
+rules for common markup, but it only approximates them for unusual markup, so
+give the feature set a name of its own (and train models on it)::
+
+    >>> from revscoring.datasources import revision_oriented
+    >>> from revscoring.features.wikitext import Revision, datasources
+    >>>
+    >>> name = "wikitext.scanned_revision"
+    >>> scanned_revision = Revision(
+    ...     name, datasources.Revision(name, revision_oriented.revision,
+    ...                                parser="scanner"))
+    >>> scanned_revision.wikilinks
+    <feature.wikitext.scanned_revision.wikilinks>
+
+.. autofunction:: revscoring.features.wikitext.datasources.scanner.scan
 """  # noqa
 from .revision_oriented import revision
 from .features import Revision, Diff
+from .datasources.edit import get_diff_limits, set_diff_limits
 
-__all__ = [revision, Revision, Diff]
+__all__ = [revision, Revision, Diff, set_diff_limits, get_diff_limits]
@@ -1,12 +1,22 @@
 import logging
 import re
 import time
+from collections import Counter
+from functools import partial
 
-from deltas import segment_matcher
+import numpy
+from deltas import Delete, Equal, Insert, segment_matcher
+from deltas.segmenters.paragraphs_sentences_and_whitespace import \
+    PARAGRAPH_END
 
+from ....content_cache import content_key, get_cache
 from ....datasources import Datasource
 from ....datasources.meta import filters
-from .tokenized import TokenIsInTypes, is_uppercase_word
+from ....metrics import default_registry
+from ....worker_pool import get_state
+from .tokenized import (in_types, is_uppercase_word, partitioned,
+                        paragraphs_sentences_and_whitespace, token_char_stats)
+from .word_index import indexed
 
 logger = logging.getLogger(__name__)
 
@@ -18,15 +28,14 @@ class Diff:
 
         self.operations = Datasource(
             self._name + ".operations", _process_operations,
-            depends_on=[
-                self.revision.parent.paragraphs_sentences_and_whitespace,
-                self.revision.paragraphs_sentences_and_whitespace,
-                self.revision.parent.tokens,
-                self.revision.tokens]
+            depends_on=[self.revision.parent.tokens, self.revision.tokens]
         )
         """
         Returns a tuple that describes the difference between the parent
-        revision text and the current revision's text.
+        revision text and the current revision's text.  The common prefix and
+        suffix of the two token lists (trimmed back to paragraph breaks) are
+        treated as unchanged, so only the window in between is segmented and
+        diffed.
 
         The tuple contains three fields:
 
@@ -35,6 +44,16 @@ class Diff:
         * B tokens: `list` of `str`
         """
 
+        self.approximate_diff = Datasource(
+            self._name + ".approximate_diff", _process_approximate_diff,
+            depends_on=[self.operations]
+        )
+        """
+        Returns True if the changed window was too large to diff and
+        `operations` were built from a bag-of-tokens delta.  See
+        :func:`~revscoring.features.wikitext.datasources.edit.set_diff_limits`.
+        """
+
         self.segments_added = Datasource(
             self._name + ".segments_added", _process_segments_added,
             depends_on=[self.operations]
@@ -71,6 +90,44 @@ class Diff:
         tokens removed in this revision.
         """
 
+        self.tokens_added_by_type = partitioned(
+            self.tokens_added, name=self._name + ".tokens_added_by_type"
+        )
+        """
+        A `dict` of lists of tokens added in this revision keyed by the groups
+        in
+        :data:`~revscoring.features.wikitext.datasources.tokenized.TOKEN_TYPES`
+        """
+
+        self.tokens_removed_by_type = partitioned(
+            self.tokens_removed, name=self._name + ".tokens_removed_by_type"
+        )
+        """
+        A `dict` of lists of tokens removed in this revision keyed by the
+        groups in
+        :data:`~revscoring.features.wikitext.datasources.tokenized.TOKEN_TYPES`
+        """
+
+        self.char_stats_added = token_char_stats(
+            self.tokens_added, name=self._name + ".char_stats_added"
+        )
+        """
+        A `dict` of the number of characters added in this revision in total
+        ("chars"), in each group in
+        :data:`~revscoring.features.wikitext.datasources.tokenized.TOKEN_TYPES`
+        and in "uppercase_words"
+        """
+
+        self.char_stats_removed = token_char_stats(
+            self.tokens_removed, name=self._name + ".char_stats_removed"
+        )
+        """
+        A `dict` of the number of characters removed in this revision in total
+        ("chars"), in each group in
+        :data:`~revscoring.features.wikitext.datasources.tokenized.TOKEN_TYPES`
+        and in "uppercase_words"
+        """
+
         self.numbers_added = self.tokens_added_in_types(
             {'number'}, name=self._name + ".numbers_added"
         )
@@ -175,6 +232,22 @@ class Diff:
         A list of word tokens removed in the edit
         """
 
+        self.words_added_index = indexed(
+            self.words_added, name=self._name + ".words_added_index"
+        )
+        """
+        A :class:`~revscoring.features.wikitext.datasources.word_index.WordIndex`
+        of the word tokens added in the edit
+        """
+
+        self.words_removed_index = indexed(
+            self.words_removed, name=self._name + ".words_removed_index"
+        )
+        """
+        A :class:`~revscoring.features.wikitext.datasources.word_index.WordIndex`
+        of the word tokens removed in the edit
+        """
+
         self.uppercase_words_added = filters.filter(
             is_uppercase_word, self.words_added,
             name=self._name + ".uppercase_words_added"
@@ -260,8 +333,8 @@ class Diff:
         if name is None:
             name = "{0}({1})".format(self._name + ".tokens_added_in_types",
                                      types)
-        return filters.filter(TokenIsInTypes(types).filter, self.tokens_added,
-                              name=name)
+        return in_types(types, self.tokens_added, self.tokens_added_by_type,
+                        name)
 
     def tokens_removed_in_types(self, types, name=None):
         """
@@ -272,19 +345,220 @@ class Diff:
         if name is None:
             name = "{0}({1})".format(self._name + ".tokens_removed_in_types",
                                      types)
-        return filters.filter(TokenIsInTypes(types).filter,
-                              self.tokens_removed, name=name)
-
-
-def _process_operations(a_segments, b_segments, a, b):
+        return in_types(types, self.tokens_removed,
+                        self.tokens_removed_by_type, name)
+
+
+DEFAULT_MAX_DIFF_TOKENS = 100000
+"""
+The default maximum number of tokens (parent and current combined) in the
+changed window of a diff.  See
+:func:`~revscoring.features.wikitext.datasources.edit.set_diff_limits`.
+"""
+
+_diff_limits = {'max_tokens': DEFAULT_MAX_DIFF_TOKENS}
+
+approximations = default_registry.counter(
+    "diff_approximations_total",
+    "Diffs that were replaced by a bag-of-tokens delta, by reason")
+
+
+def set_diff_limits(max_tokens=DEFAULT_MAX_DIFF_TOKENS):
+    """
+    Configures when diffs fall back to a cheap bag-of-tokens delta.  Past the
+    limit, the tokens added and removed are found by comparing token counts,
+    the order of the tokens is ignored and the result is flagged as
+    approximate (see `approximate_diff`).  Approximate operations are never
+    stored in the content cache.
+
+    The limits only apply to this process.  To apply them in the workers of
+    a :class:`~revscoring.worker_pool.WorkerPool`, install
+    :func:`~revscoring.features.wikitext.get_diff_limits`
+    as the pool's "diff_limits" `state`.
+
+    :Parameters:
+        max_tokens : `int`
+            The maximum number of tokens (parent and current combined) in
+            the changed window to diff.  `None` means no limit.
+    """
+    _diff_limits['max_tokens'] = max_tokens
+
+
+def get_diff_limits():
+    """
+    Gets the limits that diffs are approximated past.  In the workers of a
+    :class:`~revscoring.worker_pool.WorkerPool`, these are the limits that
+    were installed as the pool's "diff_limits" `state`.
+
+    :Returns:
+        A `dict` of the parameters of
+        :func:`~revscoring.features.wikitext.datasources.edit.set_diff_limits`
+    """
+    return dict(get_state('diff_limits', _diff_limits))
+
+
+class ApproximateOperations(list):
+    """
+    A `list` of :class:`deltas.Operation` that was built from a
+    bag-of-tokens delta rather than a diff.  The :class:`deltas.Delete` and
+    :class:`deltas.Insert` operations cover exactly the tokens that were
+    removed and added, but no :class:`deltas.Equal` operations are included
+    for the changed window, so they can't be applied.
+    """
+    pass
+
+
+def _process_operations(a, b):
     start = time.time()
-    operations = list(segment_matcher.diff_segments(a_segments, b_segments))
-    logger.debug("diff() of {0} and {1} tokens took {2} seconds."
-                 .format(len(a), len(b), time.time() - start))
+    prefix, suffix = _unchanged_affixes(a, b)
+    a_end, b_end = len(a) - suffix, len(b) - suffix
+
+    max_tokens = get_diff_limits()['max_tokens']
+    window_tokens = (a_end - prefix) + (b_end - prefix)
+    if max_tokens is not None and window_tokens > max_tokens:
+        # Approximations are cheap and depend on the limit, so they are
+        # never cached.
+        logger.warning("Approximating a diff of {0} tokens (max_tokens={1})"
+                       .format(window_tokens, max_tokens))
+        approximations.inc(reason="tokens")
+        operations = ApproximateOperations(_affix_operations(
+            a, b, prefix, a_end, b_end,
+            _bag_of_tokens_operations(a, b, prefix, a_end, b_end)))
+    else:
+        diff = partial(_diff, a, b, prefix, a_end, b_end)
+        cache = get_cache()
+        if cache is None:
+            operations = diff()
+        else:
+            operations = cache.memoize(
+                "operations", content_key("".join(a), "".join(b)), diff,
+                dump=_dump_operations, load=_load_operations)
+
+    logger.debug("diff() of {0} and {1} tokens ({2} and {3} after trimming) "
+                 .format(len(a), len(b), a_end - prefix, b_end - prefix) +
+                 "took {0} seconds.".format(time.time() - start))
 
     return operations, a, b
 
 
+def _process_approximate_diff(diff_operations):
+    operations, a, b = diff_operations
+    return isinstance(operations, ApproximateOperations)
+
+
+_OPERATIONS = (Equal, Insert, Delete)
+_OPERATION_CODES = {operation.OPNAME: code
+                    for code, operation in enumerate(_OPERATIONS)}
+
+
+def _dump_operations(operations):
+    return numpy.array([(_OPERATION_CODES[op.name],
+                         op.a1, op.a2, op.b1, op.b2)
+                        for op in operations], dtype=numpy.int64)
+
+
+def _load_operations(rows):
+    return [_OPERATIONS[code](a1, a2, b1, b2)
+            for code, a1, a2, b1, b2 in rows.tolist()]
+
+
+def _diff(a, b, prefix, a_end, b_end):
+    """
+    Diffs a[prefix:a_end] and b[prefix:b_end] and adds Equal operations for
+    the unchanged affixes.
+    """
+    window_operations = []
+    if prefix < a_end or prefix < b_end:
+        segments = [paragraphs_sentences_and_whitespace.segment(tokens)
+                    for tokens in (a[prefix:a_end], b[prefix:b_end])]
+        window_operations = [
+            op._replace(a1=op.a1 + prefix, a2=op.a2 + prefix,
+                        b1=op.b1 + prefix, b2=op.b2 + prefix)
+            for op in segment_matcher.diff_segments(*segments)]
+
+    return _affix_operations(a, b, prefix, a_end, b_end, window_operations)
+
+
+def _affix_operations(a, b, prefix, a_end, b_end, window_operations):
+    operations = []
+    if prefix > 0:
+        operations.append(Equal(0, prefix, 0, prefix))
+    operations.extend(window_operations)
+    if a_end < len(a):
+        operations.append(Equal(a_end, len(a), b_end, len(b)))
+
+    return operations
+
+
+def _bag_of_tokens_operations(a, b, prefix, a_end, b_end):
+    """
+    Builds Delete and Insert operations for the tokens whose counts went down
+    or up between a[prefix:a_end] and b[prefix:b_end].
+    """
+    a_counts = Counter(a[prefix:a_end])
+    b_counts = Counter(b[prefix:b_end])
+    removed = a_counts - b_counts
+    added = b_counts - a_counts
+
+    operations = []
+    for i1, i2 in _surplus_runs(a, prefix, a_end, removed):
+        operations.append(Delete(i1, i2, prefix, prefix))
+    for i1, i2 in _surplus_runs(b, prefix, b_end, added):
+        operations.append(Insert(a_end, a_end, i1, i2))
+
+    return operations
+
+
+def _surplus_runs(tokens, start, end, surplus):
+    # Marks the first occurrences of each surplus token and yields the
+    # (start, end) of each run of marked tokens.
+    run_start = None
+    for i in range(start, end):
+        if surplus[tokens[i]] > 0:
+            surplus[tokens[i]] -= 1
+            if run_start is None:
+                run_start = i
+        elif run_start is not None:
+            yield run_start, i
+            run_start = None
+
+    if run_start is not None:
+        yield run_start, end
+
+
+def _unchanged_affixes(a, b):
+    """
+    Finds the number of tokens at the start and end of `a` and `b` that can
+    be left out of the diff.  Unless `a` and `b` are identical, the cuts are
+    moved back to just after (or onto) a paragraph break so that the
+    segmenter sees whole paragraphs.
+    """
+    prefix = _common_prefix_length(a, b)
+    if prefix == len(a) == len(b):
+        return prefix, 0
+    while prefix > 0 and a[prefix - 1].type not in PARAGRAPH_END:
+        prefix -= 1
+
+    suffix = _common_prefix_length(a[prefix:][::-1], b[prefix:][::-1])
+    while suffix > 0 and a[len(a) - suffix].type not in PARAGRAPH_END:
+        suffix -= 1
+
+    return prefix, suffix
+
+
+def _common_prefix_length(a, b, chunk=256):
+    # Comparing slices is done in C, so most of the prefix is skipped a
+    # chunk at a time.
+    limit = min(len(a), len(b))
+    i = 0
+    while i + chunk <= limit and a[i:i + chunk] == b[i:i + chunk]:
+        i += chunk
+    while i < limit and a[i] == b[i]:
+        i += 1
+
+    return i
+
+
 def _process_segments_added(diff_operations):
     operations, a, b = diff_operations
 
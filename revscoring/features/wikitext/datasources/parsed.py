@@ -1,16 +1,41 @@
 import re
+from operator import itemgetter
 
 import mwparserfromhell
+from mwparserfromhell.definitions import is_visible
+from mwparserfromhell.nodes import (Argument, Comment, ExternalLink, Heading,
+                                    HTMLEntity, Tag, Template, Text, Wikilink)
 
+from ....content_cache import content_key, get_cache
 from ....datasources import Datasource
-from ....datasources.meta import filters, mappers
+from ....datasources.meta import filters
+from .scanner import scan
 
 
 class Revision:
+    """
+    The parsed datasources.  `parser` decides how the plain values (content,
+    heading titles, link URLs, etc.) are gathered:
+
+    * "ast" parses the text into a
+      :class:`mwparserfromhell.wikicode.Wikicode` and walks it.
+    * "scanner" uses
+      :func:`~revscoring.features.wikitext.datasources.scanner.scan`, which
+      is much faster on long texts, but only approximates the parser for
+      unusual markup.
+
+    The node-valued datasources (`wikicode`, `headings`, `templates`, etc.)
+    are always parsed.
+    """
 
     def __init__(self, name, revision_datasources):
         super().__init__(name, revision_datasources)
 
+        parser = getattr(self, "parser", "ast")
+        if parser not in _SUMMARIZERS:
+            raise ValueError("parser must be one of {0}, not {1!r}"
+                             .format(sorted(_SUMMARIZERS), parser))
+
         self.wikicode = Datasource(
             self._name + ".wikicode",
             _process_wikicode, depends_on=[revision_datasources.text]
@@ -20,6 +45,20 @@ class Revision:
         tree representing the structure of the page.
         """
 
+        self.parse_summary = Datasource(
+            self._name + ".parse_summary",
+            _SUMMARIZERS[parser], depends_on=[revision_datasources.text]
+        )
+        """
+        A `dict` of everything the parsed features need from the
+        :class:`mwparserfromhell.wikicode.Wikicode` (heading titles and
+        levels, external link URLs, wikilink titles, tag names, template
+        names and the stripped "content") gathered in a single walk of the
+        tree (or a single scan of the text).  The summary only contains plain
+        values, so it can be kept in a
+        :class:`~revscoring.content_cache.ContentCache`.
+        """
+
         self.node_class_map = Datasource(
             self._name + ".node_class_map",
             _process_node_class_map, depends_on=[self.wikicode]
@@ -29,9 +68,9 @@ class Revision:
         that type.
         """
 
-        self.content = execute_method(
-            "strip_code", self.wikicode,
-            name=self._name + ".content"
+        self.content = Datasource(
+            self._name + ".content", itemgetter('content'),
+            depends_on=[self.parse_summary]
         )
         """
         The viewable content (no markup or templates) of the revision.
@@ -46,14 +85,22 @@ class Revision:
         A list of :class:`mwparserfromhell.nodes.heading.Heading`'s
         """
 
-        self.heading_titles = mappers.map(
-            _extract_heading_title, self.headings,
-            name=self._name + ".heading_titles"
+        self.heading_titles = Datasource(
+            self._name + ".heading_titles", itemgetter('heading_titles'),
+            depends_on=[self.parse_summary]
         )
         """
         A list of heading titles
         """
 
+        self.heading_levels = Datasource(
+            self._name + ".heading_levels", itemgetter('heading_levels'),
+            depends_on=[self.parse_summary]
+        )
+        """
+        A list of heading levels (in the same order as `heading_titles`)
+        """
+
         self.external_links = get_key(
             mwparserfromhell.nodes.ExternalLink, self.node_class_map,
             default=[],
@@ -63,9 +110,9 @@ class Revision:
         A list of :class:`mwparserfromhell.nodes.heading.ExternalLink`'s
         """
 
-        self.external_link_urls = mappers.map(
-            _extract_external_link_url, self.external_links,
-            name=self._name + ".external_link_url"
+        self.external_link_urls = Datasource(
+            self._name + ".external_link_url",
+            itemgetter('external_link_urls'), depends_on=[self.parse_summary]
         )
         """
         A list of external link urls
@@ -80,9 +127,9 @@ class Revision:
         A list of :class:`mwparserfromhell.nodes.heading.Wikilink`'s
         """
 
-        self.wikilink_titles = mappers.map(
-            _extract_wikilink_title, self.wikilinks,
-            name=self._name + ".wikilink_titles"
+        self.wikilink_titles = Datasource(
+            self._name + ".wikilink_titles", itemgetter('wikilink_titles'),
+            depends_on=[self.parse_summary]
         )
         """
         Returns a list of string titles of internal links (aka "targets")
@@ -97,9 +144,9 @@ class Revision:
         A list of :class:`mwparserfromhell.nodes.heading.Tag`'s
         """
 
-        self.tag_names = mappers.map(
-            _extract_tag_name, self.tags,
-            name=self._name + ".tag_names"
+        self.tag_names = Datasource(
+            self._name + ".tag_names", itemgetter('tag_names'),
+            depends_on=[self.parse_summary]
         )
         """
         Returns a list of html tag names present in the content of the revision
@@ -114,9 +161,9 @@ class Revision:
         A list of :class:`mwparserfromhell.nodes.heading.Templates`'s
         """
 
-        self.template_names = mappers.map(
-            _extract_template_name, self.templates,
-            name=self._name + ".template_names"
+        self.template_names = Datasource(
+            self._name + ".template_names", itemgetter('template_names'),
+            depends_on=[self.parse_summary]
         )
         """
         Returns a list of template names present in the content of the revision
@@ -145,6 +192,18 @@ class Revision:
         return filters.filter(HeadingOfLevel(level).filter, self.headings,
                               name=name)
 
+    def heading_titles_by_level(self, level, name=None):
+        """
+        Constructs a :class:`revscoring.Datasource` that generates a `list` of
+        the titles of all headers of a level.
+        """
+        if name is None:
+            name = "{0}({1})".format(self._name + ".heading_titles_by_level",
+                                     level)
+        return Datasource(name, TitlesOfLevel(level).process,
+                          depends_on=[self.heading_titles,
+                                      self.heading_levels])
+
     def external_link_urls_matching(self, regex, name=None):
         """
         Constructs a :class:`revscoring.Datasource` that generates a `list` of
@@ -222,24 +281,130 @@ def _process_node_class_map(wikicode):
     return node_class_map
 
 
-def _extract_heading_title(heading):
-    return str(heading.title).strip()
+def _process_parse_summary(text):
+    cache = get_cache()
+    if cache is None:
+        return _summarize(_process_wikicode(text))
+    else:
+        return cache.memoize(
+            "parse_summary", content_key(text),
+            lambda: _summarize(_process_wikicode(text)))
+
+
+def _process_scan_summary(text):
+    cache = get_cache()
+    if cache is None:
+        return scan(text)
+    else:
+        return cache.memoize("scan_summary", content_key(text),
+                             lambda: scan(text))
+
+
+def _summarize(wikicode):
+    """
+    Walks a :class:`mwparserfromhell.wikicode.Wikicode` tree once.  Nodes are
+    summarized in the order that `Wikicode.filter()` would return them and
+    the content is stripped like `Wikicode.strip_code()` would strip it.
+    """
+    summary = {'heading_titles': [], 'heading_levels': [],
+               'external_link_urls': [], 'wikilink_titles': [],
+               'tag_names': [], 'template_names': []}
+    summary['content'] = _visit(wikicode, summary)
+    return summary
+
+
+def _visit(wikicode, summary):
+    pieces = []
+    for node in wikicode.nodes:
+        cls = node.__class__
+        if cls is Heading:
+            summary['heading_titles'].append(str(node.title).strip())
+            summary['heading_levels'].append(node.level)
+        elif cls is ExternalLink:
+            summary['external_link_urls'].append(str(node.url))
+        elif cls is Wikilink:
+            summary['wikilink_titles'].append(str(node.title))
+        elif cls is Tag:
+            summary['tag_names'].append(str(node.tag))
+        elif cls is Template:
+            summary['template_names'].append(str(node.name))
+
+        stripped_children = {id(code): _visit(code, summary)
+                             for code in node.__children__()}
+        if cls in _STRIPPERS:
+            stripped = _STRIPPERS[cls](node, stripped_children)
+        else:
+            stripped = node.__strip__(True, True)
+        if stripped:
+            pieces.append(str(stripped))
+
+    stripped = "".join(pieces).strip("\n")
+    while "\n\n\n" in stripped:
+        stripped = stripped.replace("\n\n\n", "\n\n")
+    return stripped
+
+
+# These mirror each node's __strip__(normalize=True, collapse=True), but use
+# the stripped children that _visit() already computed rather than walking
+# the children again.
+def _strip_text(node, children):
+    return node.value
+
+
+def _strip_html_entity(node, children):
+    return node.normalize()
+
+
+def _strip_nothing(node, children):
+    return None
+
 
+def _strip_heading(node, children):
+    return children[id(node.title)]
 
-def _extract_external_link_url(elink):
-    return str(elink.url)
 
+def _strip_wikilink(node, children):
+    if node.text is not None:
+        return children[id(node.text)]
+    return children[id(node.title)]
 
-def _extract_wikilink_title(wikilinks):
-    return str(wikilinks.title)
 
+def _strip_external_link(node, children):
+    if node.brackets:
+        if node.title:
+            return children[id(node.title)]
+        return None
+    return children[id(node.url)]
 
-def _extract_tag_name(tag):
-    return str(tag.tag)
 
+def _strip_tag(node, children):
+    if is_visible(node.tag):
+        return children.get(id(node.contents))
+    return None
 
-def _extract_template_name(template):
-    return str(template.name)
+
+def _strip_argument(node, children):
+    if node.default is not None:
+        return children[id(node.default)]
+    return None
+
+
+_SUMMARIZERS = {
+    "ast": _process_parse_summary,
+    "scanner": _process_scan_summary
+}
+
+_STRIPPERS = {
+    Text: _strip_text,
+    HTMLEntity: _strip_html_entity,
+    Comment: _strip_nothing,
+    Template: _strip_nothing,
+    Heading: _strip_heading,
+    Wikilink: _strip_wikilink,
+    ExternalLink: _strip_external_link,
+    Tag: _strip_tag,
+    Argument: _strip_argument
+}
 
 
 class HeadingOfLevel:
@@ -250,6 +415,15 @@ class HeadingOfLevel:
         return heading.level == self.level
 
 
+class TitlesOfLevel:
+    def __init__(self, level):
+        self.level = int(level)
+
+    def process(self, titles, levels):
+        return [title for title, level in zip(titles, levels)
+                if level == self.level]
+
+
 class get_key(Datasource):
     def __init__(self, key, dict_datasource, default=None, name=None):
         self.key = key
@@ -11,14 +11,18 @@ class BaseRevision(DependentSet):
         if hasattr(revision_datasources, "parent"):
             self.parent = Revision(
                 name + ".parent",
-                revision_datasources.parent
+                revision_datasources.parent,
+                parser=self.parser
             )
 
 
 class Revision(parsed.Revision, sentences.Revision, tokenized.Revision,
                BaseRevision):
 
-    def __init__(self, name, revision_datasources):
+    def __init__(self, name, revision_datasources, parser="ast"):
+        # How the parsed datasources are computed.  See parsed.Revision.
+        self.parser = parser
+
         # Initializes all of the Revision datasources
         super().__init__(name, revision_datasources)
 
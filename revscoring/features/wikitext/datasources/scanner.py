@@ -0,0 +1,730 @@
+"""
+A streaming alternative to parsing wikitext with :mod:`mwparserfromhell`.
+
+:func:`~revscoring.features.wikitext.datasources.scanner.scan` walks the text
+once with a compiled regular expression that finds the next piece of markup
+and a recursive scanner that tracks brackets, braces, tags and quotes.  It
+produces the same summary (heading titles and levels, external link URLs,
+wikilink titles, tag names, template names and stripped content) that
+:mod:`~revscoring.features.wikitext.datasources.parsed` builds from a full
+:class:`mwparserfromhell.wikicode.Wikicode` tree, but it never builds any
+nodes.
+
+The scanner follows the parser's rules for the markup that matters to those
+summaries (including how it falls back to plain text when a construct isn't
+closed), but it does not reproduce every quirk.  Unusual markup (e.g.
+templates inside tag attributes or external link URLs) can lead to small
+differences.
+"""
+import re
+from html.entities import name2codepoint
+
+from mwparserfromhell.definitions import (URI_SCHEMES, is_parsable, is_single,
+                                          is_single_only, is_visible)
+
+MAX_DEPTH = 40
+"""
+Constructs that are nested deeper than this are treated as text (like
+:mod:`mwparserfromhell` does)
+"""
+
+_SCHEME = r"(?:(?:{0})://|(?:{1}):)".format(
+    "|".join(sorted(URI_SCHEMES, key=len, reverse=True)),
+    "|".join(sorted((scheme for scheme, slashes in URI_SCHEMES.items()
+                     if not slashes), key=len, reverse=True)))
+
+_TOKEN = re.compile(r"""
+    (?P<comment><!--) |
+    (?P<close_tag></(?=[\s\S])) |
+    (?P<open_tag><(?=[A-Za-z])) |
+    (?P<lbrace>\{\{+) |
+    (?P<rbrace>\}\}\}?) |
+    (?P<llink>\[\[) |
+    (?P<rlink>\]\]) |
+    (?P<lbracket>\[) |
+    (?P<rbracket>\]) |
+    (?P<pipe>\|\|?) |
+    (?P<bangs>!!) |
+    (?P<newline>\n) |
+    (?P<equals>=+) |
+    (?P<quotes>''+) |
+    (?P<entity>&(?:[A-Za-z0-9]+|\#[0-9]+|\#[xX][0-9A-Fa-f]+);) |
+    (?P<url>(?<![^\s{}\[\]<>|=&'\#*;:/\-!])SCHEME)
+""".replace("SCHEME", _SCHEME), re.VERBOSE)
+
+_TAG_OPEN = re.compile(r"<([A-Za-z][A-Za-z0-9]*)(?:[^\S\n][^<>]*?)?(/)?>")
+_TAG_CLOSE = re.compile(r"</([A-Za-z][A-Za-z0-9]*)\s*>")
+_BRACKET_URL = re.compile(r"(?:" + _SCHEME + r"|//)(?:[^ \n\]{]|\{(?!\{))+")
+_URL_TAIL = ",;.:!?"
+_COMMENT = re.compile(r"<!--.*?-->", re.DOTALL)
+_ENTITY = re.compile(r"&(?:[A-Za-z0-9]+|#[0-9]+|#[xX][0-9A-Fa-f]+);")
+_LAST_ENTITY = re.compile(_ENTITY.pattern + r"\Z")
+_WIKILINK_TITLE_INVALID = re.compile(r"[\n\[\]{}<>]")
+_TEMPLATE_NAME_INVALID = re.compile(r"[\[\]{}<>]")
+_TABLE_OPEN = re.compile(r"[^\S\n]?\{\|")
+_TABLE_LINE = re.compile(r"[^\S\n]?(\|\}|\|-|\||!)")
+_LIST = re.compile(r"[*#:;]+")
+_HR = re.compile(r"-{4,}")
+_HEADING = re.compile(r"=+")
+_LIST_TAGS = {"*": "li", "#": "li", ";": "dt", ":": "dd"}
+
+
+def _bare_url_regex(pipes, equals):
+    # A free link ends at a space, a line break, brackets, "''" and (in a
+    # template) at "|" or "}}" or (in a heading) at "=".
+    excluded = r" \n\[\]<>'{" + ("|}" if pipes else "") + ("=" if equals else "")
+    return re.compile(_SCHEME +
+                      r"(?:[^{0}]|'(?!')|\{{(?!\{{)|<!--(?:[\s\S]*?-->)?"
+                      .format(excluded) +
+                      (r"|\}(?!\})" if pipes else "") + r")*")
+
+
+_BARE_URLS = {(pipes, equals): _bare_url_regex(pipes, equals)
+              for pipes in (False, True) for equals in (False, True)}
+
+_close_tag_regexes = {}
+
+
+class _BadRoute(Exception):
+
+    def __init__(self, pass_again=False):
+        super().__init__()
+        self.pass_again = pass_again
+
+
+class _Mark:
+    __slots__ = ('start', 'end', 'events')
+
+    def __init__(self, start, end, events):
+        self.start = start
+        self.end = end
+        self.events = events
+
+    def __str__(self):
+        return "=" * (self.end - self.start)
+
+
+def scan(text):
+    """
+    Scans wikitext and summarizes the markup in it.
+
+    :Parameters:
+        text : `str`
+            Wikitext to scan
+
+    :Returns:
+        A `dict` with the same keys and values as the summary that
+        :mod:`~revscoring.features.wikitext.datasources.parsed` builds from
+        a parse tree
+    """
+    return _Scanner(text or "").scan()
+
+
+class _Scanner:
+
+    def __init__(self, text):
+        self.text = text
+        self.events = []
+        self.bad_routes = {}
+        self.last_route = None
+        self.depth = 0
+        self.heading = False
+
+    def scan(self):
+        _, _, _, pieces = self._parse(0, {'eof'})
+        summary = {'heading_titles': [], 'heading_levels': [],
+                   'external_link_urls': [], 'wikilink_titles': [],
+                   'tag_names': [], 'template_names': [],
+                   'content': _strip(pieces)}
+        for kind, value in self.events:
+            if kind == 'heading':
+                title, level = value
+                summary['heading_titles'].append(title.strip())
+                summary['heading_levels'].append(level)
+            else:
+                summary[kind].append(value)
+
+        return summary
+
+    def _try(self, kind, start, method, *args):
+        """
+        Tries to scan a construct.  If it turns out not to be one, any
+        events it recorded are discarded and `None` is returned.
+        """
+        key = (kind, start)
+        if key in self.bad_routes:
+            self.last_route = self.bad_routes[key]
+            return None
+        snapshot = len(self.events)
+        try:
+            return method(start, *args)
+        except _BadRoute as route:
+            del self.events[snapshot:]
+            self.bad_routes[key] = self.last_route = route
+            return None
+
+    def _event(self):
+        # Reserves a slot so that events end up in the order in which their
+        # constructs start (like the nodes of `Wikicode.filter()`).
+        self.events.append(None)
+        return len(self.events) - 1
+
+    def _parse(self, pos, stops, mode=None, links=True,
+               urls=True, style=None, second_pass=False, marks=False):
+        """
+        Scans text until one of `stops` is found.  `'eof'` in `stops` allows
+        the text to end.  Otherwise, reaching the end raises a `_BadRoute`.
+
+        :Returns:
+            The start of the stop, the stop, the end of the stop and the
+            pieces of stripped content that were scanned
+        """
+        if self.depth >= MAX_DEPTH:
+            raise _BadRoute()
+        self.depth += 1
+        try:
+            return self._parse_until(pos, stops, mode, links, urls,
+                                     style, second_pass, marks)
+        finally:
+            self.depth -= 1
+
+    def _parse_until(self, pos, stops, mode, links, urls, style,
+                     second_pass, marks):
+        text = self.text
+        pieces = []
+        line_start = pos == 0 or text[pos - 1] == "\n"
+        dl_term = False
+        pass_again = False
+        name = _TemplateName() if mode == 'template_name' else None
+        tag = next((stop[1] for stop in stops if isinstance(stop, tuple)),
+                   None)
+        bare_url = _BARE_URLS[("}}" in stops or "}}}" in stops, marks)]
+        while True:
+            if line_start:
+                line_start = False
+                end = self._line_start(pos, pieces)
+                if end is not None:
+                    if name is not None:
+                        name.check(text[pos])
+                    # "; term : definition"
+                    dl_term = dl_term or (text[pos] in _LIST_TAGS and
+                                          ";" in text[pos:end])
+                    pos = end
+                    continue
+
+            match = _TOKEN.search(text, pos)
+            start = match.start() if match is not None else len(text)
+            if start > pos:
+                chunk = text[pos:start]
+                if mode == 'wikilink_title' and \
+                   _WIKILINK_TITLE_INVALID.search(chunk):
+                    raise _BadRoute()
+                elif name is not None:
+                    name.check(chunk)
+                if dl_term and ":" in chunk:
+                    # The definition in "; term : definition"
+                    term, definition = chunk.split(":", 1)
+                    pieces.append(term)
+                    self.events.append(('tag_names', "dd"))
+                    chunk, dl_term = definition, False
+                pieces.append(chunk)
+            if match is None:
+                if 'eof' in stops:
+                    return len(text), 'eof', len(text), pieces
+                raise _BadRoute(pass_again)
+
+            kind, token, end = match.lastgroup, match.group(), match.end()
+
+            # Stops
+            if kind == 'rbrace':
+                if token == "}}}" and "}}}" in stops:
+                    return start, "}}}", end, pieces
+                elif "}}" in stops:
+                    return start, "}}", start + 2, pieces
+            elif kind == 'rlink':
+                if "]]" in stops:
+                    return start, "]]", end, pieces
+                elif "]" in stops:
+                    return start, "]", start + 1, pieces
+            elif kind == 'rbracket' and "]" in stops:
+                return start, "]", end, pieces
+            elif kind == 'pipe':
+                if token == "||" and "||" in stops:
+                    return start, "||", end, pieces
+                elif "|" in stops:
+                    return start, "|", start + 1, pieces
+            elif kind == 'bangs' and "!!" in stops:
+                return start, "!!", end, pieces
+            elif kind == 'newline' and "\n" in stops:
+                return start, "\n", end, pieces
+            elif kind == 'close_tag' and tag is not None:
+                # Any closing tag in a tag's body has to close it
+                close = _TAG_CLOSE.match(text, start)
+                if close is None or close.group(1).lower() != tag:
+                    raise _BadRoute()
+                return start, 'tag', close.end(), pieces
+
+            if mode is not None and kind in ('lbracket', 'rbracket', 'llink',
+                                             'rlink', 'open_tag', 'close_tag'):
+                raise _BadRoute()
+            elif mode == 'wikilink_title' and kind in ('rbrace', 'newline'):
+                raise _BadRoute()
+            elif name is not None and kind not in ('lbrace', 'comment'):
+                name.check(token)
+
+            if kind == 'quotes':
+                ticks = len(token)
+                if ticks > 5:
+                    pieces.append("'" * (ticks - 5))
+                    start, ticks = end - 5, 5
+                elif ticks == 4:
+                    pieces.append("'")
+                    start, ticks = start + 1, 3
+
+                if style is not None and (ticks == style or ticks == 5):
+                    # Closes this style
+                    return start, 'quotes', start + style, pieces
+                elif ticks == 3:
+                    result = self._styled(end, "b", 3)
+                    if result is None:
+                        if second_pass:
+                            pieces.append("'")
+                            return start, 'quotes', end, pieces
+                        elif style == 2:
+                            pass_again = True
+                            pieces.append("'''")
+                            pos = end
+                            continue
+                        pieces.append("'")
+                        ticks = 2
+                if ticks == 2:
+                    result = self._italics(end)
+                    if result is None:
+                        result = end, "''"
+                elif ticks == 5:
+                    result = self._italics_and_bold(end)
+                pos, content = result
+                pieces.append(content)
+                continue
+
+            result = None
+            if kind == 'comment':
+                close = text.find("-->", end)
+                if close != -1:
+                    result = close + 3, None
+                elif mode is not None:
+                    raise _BadRoute()
+            elif kind == 'open_tag':
+                result = self._try('tag', start, self._tag)
+            elif kind == 'close_tag':
+                result = self._single_close_tag(start)
+            elif kind == 'lbrace':
+                pos, content, complete = self._braces(start, end)
+                if not complete and mode is not None:
+                    raise _BadRoute()
+                pieces.append(content)
+                continue
+            elif kind == 'llink' and links:
+                if urls and _BRACKET_URL.match(text, end):
+                    # An external link in extra brackets
+                    result = self._try('external_link', start + 1,
+                                       self._external_link)
+                    if result is not None:
+                        pieces.append("[")
+                if result is None:
+                    result = self._try('wikilink', start, self._wikilink)
+            elif kind == 'lbracket' and urls:
+                result = self._try('external_link', start,
+                                   self._external_link)
+            elif kind == 'entity':
+                result = end, _normalize_entity(token)
+            elif kind == 'url' and urls:
+                result = self._try('bare_url', start, self._bare_url,
+                                   end, bare_url)
+                if result is None and dl_term:
+                    # The ":" of a scheme that isn't a link is a definition
+                    colon = text.index(":", start)
+                    pieces.append(text[start:colon])
+                    self.events.append(('tag_names', "dd"))
+                    pos, dl_term = colon + 1, False
+                    continue
+            elif kind == 'equals' and marks:
+                result = end, _Mark(start, end, len(self.events))
+            elif kind == 'newline':
+                line_start, dl_term = True, False
+
+            if result is None:
+                pieces.append(text[start:end])
+                pos = end
+            else:
+                pos, content = result
+                if content is not None:
+                    pieces.append(content)
+
+    def _line_start(self, pos, pieces):
+        text = self.text
+        char = text[pos:pos + 1]
+        if char == "=" and not self.heading:
+            # Headings can't be nested
+            result = self._try('heading', pos, self._heading)
+            if result is not None:
+                end, content = result
+                pieces.append(content)
+                return end
+        elif char in _LIST_TAGS:
+            match = _LIST.match(text, pos)
+            for marker in match.group():
+                self.events.append(('tag_names', _LIST_TAGS[marker]))
+            return match.end()
+        elif char == "-":
+            match = _HR.match(text, pos)
+            if match is not None:
+                self.events.append(('tag_names', "hr"))
+                return match.end()
+        elif _TABLE_OPEN.match(text, pos):
+            result = self._try('table', pos, self._table)
+            if result is not None:
+                end, content = result
+                pieces.append(content)
+                return end
+
+        return None
+
+    def _heading(self, start):
+        text = self.text
+        opening = _HEADING.match(text, start).end() - start
+        index = self._event()
+        self.heading = True
+        try:
+            _, _, _, pieces = self._parse(start + opening, {"\n", 'eof'},
+                                          marks=True)
+        finally:
+            self.heading = False
+        # The heading ends at the last run of "=" on the line.  What follows
+        # it is scanned again outside of the heading.
+        marks = [i for i, piece in enumerate(pieces)
+                 if isinstance(piece, _Mark)]
+        if len(marks) == 0:
+            raise _BadRoute()
+        last = marks[-1]
+        mark = pieces[last]
+        del self.events[mark.events:]
+        closing = mark.end - mark.start
+        level = min(opening, closing, 6)
+
+        self.events[index] = \
+            ('heading', (text[start + level:mark.end - level], level))
+        title = ["=" * (opening - level)] + \
+            [str(piece) for piece in pieces[:last]] + \
+            ["=" * (closing - level)]
+        return mark.end, _strip(title)
+
+    def _table(self, start):
+        text = self.text
+        index = self._event()
+        newline = text.find("\n", _TABLE_OPEN.match(text, start).end())
+        if newline == -1:
+            raise _BadRoute()
+
+        pos = newline + 1
+        pieces = []
+        row = None
+        while True:
+            match = _TABLE_LINE.match(text, pos)
+            if match is None:
+                if pos >= len(text):
+                    raise _BadRoute()
+                # A line that doesn't start a cell or a row
+                _, _, pos, line = self._parse(pos, {"\n", 'eof'})
+                (pieces if row is None else row[1]).extend(line)
+                continue
+
+            marker = match.group(1)
+            if marker in ("|}", "|-"):
+                if row is not None:
+                    self.events[row[0]] = ('tag_names', "tr")
+                    pieces.append(_strip(row[1]))
+                    row = None
+                if marker == "|}":
+                    self.events[index] = ('tag_names', "table")
+                    return match.end(), _strip(pieces)
+                newline = text.find("\n", match.end())
+                if newline == -1:
+                    raise _BadRoute()
+                row = (self._event(), [])
+                pos = newline + 1
+            else:
+                pos, cells = self._cells(match.end(),
+                                         "td" if marker == "|" else "th")
+                (pieces if row is None else row[1]).extend(cells)
+
+    def _cells(self, pos, tag):
+        text = self.text
+        stops = {"||", "\n", 'eof'}
+        if tag == "th":
+            stops.add("!!")
+        cells = []
+        while True:
+            index = self._event()
+            _, stop, pos, pieces = self._parse(pos, stops | {"|"})
+            if stop == "|":
+                # What came before was the cell's attributes
+                _, stop, pos, pieces = self._parse(pos, stops)
+            while stop == "\n" and pos < len(text) and \
+                    _TABLE_LINE.match(text, pos) is None:
+                # The cell continues on the next line
+                pieces.append("\n")
+                _, stop, pos, more = self._parse(pos, {"\n", 'eof'})
+                pieces.extend(more)
+            self.events[index] = ('tag_names', tag)
+            cells.append(_strip(pieces))
+            if stop == 'eof':
+                raise _BadRoute()
+            elif stop == "\n":
+                return pos, cells
+
+    def _style(self, start, ticks, second_pass=False):
+        _, _, end, pieces = self._parse(start, set(), style=ticks,
+                                        second_pass=second_pass)
+        return end, pieces
+
+    def _styled(self, start, tag, ticks, second_pass=False):
+        index = self._event()
+        result = self._try((tag, second_pass), start, self._style, ticks,
+                           second_pass)
+        if result is None:
+            del self.events[index:]
+            return None
+        self.events[index] = ('tag_names', tag)
+        end, pieces = result
+        return end, _strip(pieces)
+
+    def _italics(self, start):
+        result = self._styled(start, "i", 2)
+        if result is None and self.last_route.pass_again:
+            # A bold inside couldn't be closed.  Try again treating "'''"
+            # as an apostrophe that closes the italics.
+            result = self._styled(start, "i", 2, second_pass=True)
+        return result
+
+    def _italics_and_bold(self, start):
+        outer, inner = self._event(), self._event()
+        for first, second in (("b", "i"), ("i", "b")):
+            ticks = 3 if first == "b" else 2
+            result = self._try((first, False), start, self._style, ticks)
+            if result is not None:
+                self.events[inner] = ('tag_names', first)
+                end, pieces = result
+                content = _strip(pieces)
+                result = self._try((second, False), end, self._style,
+                                   5 - ticks)
+                if result is None:
+                    del self.events[outer]
+                    return end, "'" * (5 - ticks) + content
+                self.events[outer] = ('tag_names', second)
+                end, pieces = result
+                return end, _strip([content] + pieces)
+
+        del self.events[outer:]
+        return start, "'''''"
+
+    def _braces(self, start, end):
+        """
+        Scans a run of "{".  Like the parser, the innermost template or
+        argument is formed by the last braces and the rest wrap around it.
+
+        :Returns:
+            The end of what was scanned, its content and whether all of the
+            braces were used
+        """
+        braces = end - start
+        first = len(self.events)
+        pos, content = end, ""
+        while braces > 1:
+            name_start = start + braces
+            result = None
+            if braces > 2:
+                result = self._try('argument', pos, self._argument)
+                if result is not None:
+                    braces -= 3
+                    pos, content = result
+            if result is None:
+                result = self._try(('template', pos == end), pos,
+                                   self._template, name_start, pos == end)
+                if result is None:
+                    return pos, "{" * braces + content, False
+                braces -= 2
+                pos, name = result
+                self.events.insert(first, ('template_names', name))
+                content = ""
+
+        if braces == 1:
+            return pos, "{" + content, False
+        return pos, content, True
+
+    def _template(self, start, name_start, empty):
+        pos, stop, end, _ = self._parse(start, {"|", "}}"},
+                                        mode='template_name', links=False, urls=False)
+        name = self.text[name_start:pos]
+        if empty and _COMMENT.sub("", name).strip() == "":
+            raise _BadRoute()
+        while stop == "|":
+            _, stop, end, _ = self._parse(end, {"|", "}}"})
+        return end, name
+
+    def _argument(self, start):
+        _, stop, end, _ = self._parse(start, {"|", "}}}"}, links=False, urls=False)
+        if stop == "|":
+            _, _, end, pieces = self._parse(end, {"}}}"})
+            return end, _strip(pieces)
+        return end, ""
+
+    def _wikilink(self, start):
+        index = self._event()
+        pos, stop, end, pieces = self._parse(start + 2, {"|", "]]"},
+                                             mode='wikilink_title',
+                                             links=False,
+                                             urls=False)
+        title = self.text[start + 2:pos]
+        if stop == "|":
+            _, _, end, pieces = self._parse(end, {"]]"})
+        self.events[index] = ('wikilink_titles', title)
+        return end, _strip(pieces)
+
+    def _external_link(self, start):
+        text = self.text
+        url = _BRACKET_URL.match(text, start + 1)
+        if url is None:
+            raise _BadRoute()
+        index = self._event()
+        pos = url.end()
+        if text[pos:pos + 1] == "]":
+            end, content = pos + 1, None
+        elif text[pos:pos + 1] == " ":
+            _, stop, end, pieces = self._parse(pos + 1, {"]", "\n"},
+                                               urls=False)
+            if stop == "\n":
+                raise _BadRoute()
+            content = _strip(pieces)
+        else:
+            raise _BadRoute()
+        self.events[index] = ('external_link_urls', url.group())
+        return end, content
+
+    def _bare_url(self, start, scheme_end, regex):
+        text = self.text
+        if text[scheme_end:scheme_end + 1] in ("", " ", "\n", "[", "]"):
+            raise _BadRoute()
+        url = regex.match(text, start).group()
+        # Trailing punctuation is not part of the link
+        while len(url) > scheme_end - start and \
+                (url[-1] in _URL_TAIL or (url[-1] == ")" and "(" not in url)):
+            if url[-1] == ";":
+                entity = _LAST_ENTITY.search(url)
+                if entity is not None and \
+                   _normalize_entity(entity.group()) != entity.group():
+                    break
+            url = url[:-1]
+        self.events.append(('external_link_urls', url))
+        return start + len(url), \
+            _ENTITY.sub(_entity_match, _COMMENT.sub("", url))
+
+    def _tag(self, start):
+        text = self.text
+        match = _TAG_OPEN.match(text, start)
+        if match is None:
+            raise _BadRoute()
+        name = match.group(1)
+        lname = name.lower()
+        self.events.append(('tag_names', name))
+        if match.group(2) or is_single_only(lname):
+            return match.end(), None
+
+        if not is_parsable(lname):
+            close = _close_tag_regex(lname).search(text, match.end())
+            if close is None:
+                raise _BadRoute()
+            end = close.end()
+            content = _strip([_ENTITY.sub(_entity_match,
+                                          text[match.end():close.start()])])
+        else:
+            # Some tags (e.g. <li>) don't need to be closed.  If one isn't,
+            # what follows it is not part of it.
+            stops = {('tag', lname), 'eof'} if is_single(lname) else \
+                {('tag', lname)}
+            snapshot = len(self.events)
+            _, stop, end, pieces = self._parse(match.end(), stops)
+            if stop == 'eof':
+                del self.events[snapshot:]
+                return match.end(), None
+            content = _strip(pieces)
+
+        return end, content if is_visible(lname) else None
+
+    def _single_close_tag(self, start):
+        # A closing tag of a tag that can't be closed (e.g. </br>) is still a
+        # tag.
+        match = _TAG_CLOSE.match(self.text, start)
+        if match is not None and is_single_only(match.group(1).lower()):
+            self.events.append(('tag_names', match.group(1)))
+            return match.end(), None
+        return None
+
+
+class _TemplateName:
+    """
+    Checks the text of a template's name.  Once the name has started, it can
+    only be followed by whitespace after a line break.
+    """
+    __slots__ = ('has_text', 'fail_on_text')
+
+    def __init__(self):
+        self.has_text = False
+        self.fail_on_text = False
+
+    def check(self, chunk):
+        if _TEMPLATE_NAME_INVALID.search(chunk):
+            raise _BadRoute()
+        for char in chunk:
+            if self.fail_on_text:
+                if not char.isspace():
+                    raise _BadRoute()
+            elif self.has_text:
+                if char == "\n":
+                    self.fail_on_text = True
+            elif not char.isspace():
+                self.has_text = True
+
+
+def _close_tag_regex(name):
+    try:
+        return _close_tag_regexes[name]
+    except KeyError:
+        regex = re.compile(r"</" + re.escape(name) + r"\s*>", re.IGNORECASE)
+        _close_tag_regexes[name] = regex
+        return regex
+
+
+def _strip(pieces):
+    # Like Wikicode.strip_code(normalize=True, collapse=True)
+    stripped = "".join(pieces).strip("\n")
+    while "\n\n\n" in stripped:
+        stripped = stripped.replace("\n\n\n", "\n\n")
+    return stripped
+
+
+def _normalize_entity(entity):
+    name = entity[1:-1]
+    if name[0] != "#":
+        if name not in name2codepoint:
+            return entity
+        return chr(name2codepoint[name])
+    elif name[1] in "xX":
+        codepoint = int(name[2:], 16)
+    else:
+        codepoint = int(name[1:])
+    return chr(codepoint) if 1 <= codepoint <= 0x10FFFF else entity
+
+
+def _entity_match(match):
+    return _normalize_entity(match.group())
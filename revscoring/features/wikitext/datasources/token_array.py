@@ -0,0 +1,211 @@
+"""
+A compact, array-backed alternative to a `list` of :class:`deltas.Token`.
+
+A :class:`~revscoring.features.wikitext.datasources.token_array.TokenArray`
+keeps the original text plus a NumPy array of token type codes and an array
+of start offsets (:data:`deltas.wikitext_split` tokens are contiguous, so
+each token ends where the next one starts).  Counting, length and frequency
+operations run on the arrays directly.  :class:`deltas.Token` objects are
+only built for consumers that ask for them.
+"""
+from collections import Counter
+
+import numpy
+from deltas import Token, wikitext_split
+
+TYPES = tuple(name for name, pattern in wikitext_split.lexicon)
+"""
+The token types that :data:`deltas.wikitext_split` can produce in the order
+of their codes
+"""
+
+TYPE_CODES = {type: code for code, type in enumerate(TYPES)}
+
+# Maps the index of each named group in the tokenizer's regex to a type code
+GROUP_CODES = numpy.zeros(wikitext_split.regex.groups + 1, dtype=numpy.uint8)
+for type, group in wikitext_split.regex.groupindex.items():
+    GROUP_CODES[group] = TYPE_CODES[type]
+
+
+class TokenArray:
+    """
+    Represents a tokenized text as arrays.
+
+    :Parameters:
+        text : `str`
+            The tokenized text
+        codes : :class:`numpy.ndarray` ( `uint8` )
+            The type code of each token.  See
+            :data:`~revscoring.features.wikitext.datasources.token_array.TYPES`
+        starts : :class:`numpy.ndarray` ( `int32` )
+            The offset in `text` where each token starts
+    """
+    __slots__ = ('text', 'codes', 'starts')
+
+    def __init__(self, text, codes, starts):
+        self.text = text
+        self.codes = codes
+        self.starts = starts
+
+    @classmethod
+    def tokenize(cls, text):
+        """
+        Tokenizes `text` like :data:`deltas.wikitext_split` without building
+        any :class:`deltas.Token`.
+        """
+        text = text or ""
+        starts, groups = [], []
+        for match in wikitext_split.regex.finditer(text):
+            starts.append(match.start())
+            groups.append(match.lastindex)
+
+        return cls(text, GROUP_CODES[numpy.array(groups, dtype=numpy.int32)],
+                   numpy.array(starts, dtype=numpy.int32))
+
+    @classmethod
+    def from_tokens(cls, tokens):
+        """
+        Builds a TokenArray from a `list` of :class:`deltas.Token`.
+        """
+        lengths = numpy.fromiter((len(t) for t in tokens), dtype=numpy.int32,
+                                 count=len(tokens))
+        return cls("".join(tokens),
+                   numpy.fromiter((TYPE_CODES[t.type] for t in tokens),
+                                  dtype=numpy.uint8, count=len(tokens)),
+                   (numpy.cumsum(lengths) - lengths).astype(numpy.int32))
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __iter__(self):
+        return iter(self.tokens())
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self.tokens()[i]
+        else:
+            i = range(len(self))[i]
+            end = self.starts[i + 1] if i + 1 < len(self) else len(self.text)
+            return Token(self.text[self.starts[i]:end],
+                         type=TYPES[self.codes[i]])
+
+    def __eq__(self, other):
+        return isinstance(other, TokenArray) and \
+            self.text == other.text and \
+            numpy.array_equal(self.codes, other.codes) and \
+            numpy.array_equal(self.starts, other.starts)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __getstate__(self):
+        return (self.text, self.codes, self.starts)
+
+    def __setstate__(self, state):
+        self.text, self.codes, self.starts = state
+
+    def __repr__(self):
+        return "{0}({1} tokens)".format(self.__class__.__name__, len(self))
+
+    @property
+    def ends(self):
+        """
+        The offset in `text` where each token ends
+        """
+        ends = numpy.empty_like(self.starts)
+        ends[:-1] = self.starts[1:]
+        ends[-1:] = len(self.text)
+        return ends
+
+    @property
+    def lengths(self):
+        """
+        The length of each token
+        """
+        return self.ends - self.starts
+
+    def mask(self, types):
+        """
+        Returns a boolean array that is True for tokens in `types`.
+        """
+        codes = [TYPE_CODES[type] for type in types if type in TYPE_CODES]
+        return numpy.in1d(self.codes, numpy.array(codes, dtype=numpy.uint8))
+
+    def count(self, types=None):
+        """
+        Counts the tokens in `types` (or all tokens).
+        """
+        if types is None:
+            return len(self)
+        else:
+            return int(self.mask(types).sum())
+
+    def char_count(self, types=None):
+        """
+        Counts the characters in tokens of `types` (or all tokens).
+        """
+        if types is None:
+            return int(self.lengths.sum())
+        else:
+            return int(self.lengths[self.mask(types)].sum())
+
+    def char_counts(self):
+        """
+        Counts the characters in tokens of each type in one pass.
+
+        :Returns:
+            An array of character counts indexed by type code
+        """
+        return numpy.bincount(self.codes, weights=self.lengths,
+                              minlength=len(TYPES)).astype(numpy.int64)
+
+    def longest(self, types=None):
+        """
+        Returns the length of the longest token in `types` (or all tokens).
+        """
+        lengths = self.lengths if types is None else \
+            self.lengths[self.mask(types)]
+        return int(lengths.max()) if len(lengths) > 0 else 0
+
+    def strings(self, types=None):
+        """
+        Returns the tokens in `types` (or all tokens) as plain `str`.
+        """
+        text = self.text
+        if types is None:
+            starts, ends = self.starts, self.ends
+        else:
+            mask = self.mask(types)
+            starts, ends = self.starts[mask], self.ends[mask]
+
+        return [text[start:end]
+                for start, end in zip(starts.tolist(), ends.tolist())]
+
+    def frequency(self, types=None):
+        """
+        Builds a frequency table of the tokens in `types` (or all tokens).
+        """
+        return dict(Counter(self.strings(types)))
+
+    def tokens(self, types=None):
+        """
+        Builds a `list` of :class:`deltas.Token` for the tokens in `types` (or
+        all tokens).  Like :data:`deltas.wikitext_split`, tokens with the same
+        value are the same object.
+        """
+        if types is None:
+            codes = self.codes
+        else:
+            codes = self.codes[self.mask(types)]
+
+        cache = {}
+        tokens = []
+        for value, code in zip(self.strings(types), codes.tolist()):
+            try:
+                token = cache[value]
+            except KeyError:
+                token = Token(value, type=TYPES[code])
+                cache[value] = token
+            tokens.append(token)
+
+        return tokens
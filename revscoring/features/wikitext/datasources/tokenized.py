@@ -1,10 +1,18 @@
 import re
+from collections import OrderedDict
+from functools import partial
+from operator import itemgetter
 
+import numpy
 from deltas import wikitext_split
-from deltas.segmenters import ParagraphsSentencesAndWhitespace
+from deltas.segmenters import (MatchableSegment,
+                               ParagraphsSentencesAndWhitespace, Segment)
 
+from ....content_cache import content_key, get_cache
 from ....datasources import Datasource
-from ....datasources.meta import filters, frequencies, mappers
+from ....datasources.meta import filters, frequencies, indexable
+from .token_array import TYPE_CODES, TokenArray
+from .word_index import frequency, indexed
 
 
 class Revision:
@@ -12,15 +20,38 @@ class Revision:
     def __init__(self, name, revision_datasources):
         super().__init__(name, revision_datasources)
 
-        self.tokens = tokenized(revision_datasources.text)
+        self.token_array = array_tokenized(
+            revision_datasources.text, name=self._name + ".token_array"
+        )
+        """
+        A compact
+        :class:`~revscoring.features.wikitext.datasources.token_array.TokenArray`
+        of all tokens
+        """
+
+        self.tokens = Datasource(
+            tokenized(revision_datasources.text).name, _process_array_tokens,
+            depends_on=[self.token_array]
+        )
         """
         A list of all tokens
         """
 
+        self.char_stats = Datasource(
+            self._name + ".char_stats", _process_char_stats,
+            depends_on=[self.token_array]
+        )
+        """
+        A `dict` of character counts computed in one pass over
+        :attr:`token_array`.  Contains the number of characters in tokens of
+        each group in
+        :data:`~revscoring.features.wikitext.datasources.tokenized.TOKEN_TYPES`
+        and in "uppercase_words" as well as the "longest_repeated_char".
+        """
+
         self.paragraphs_sentences_and_whitespace = Datasource(
             self._name + ".paragraphs_sentences_and_whitespace",
-            paragraphs_sentences_and_whitespace.segment,
-            depends_on=[self.tokens]
+            _process_segments, depends_on=[self.tokens]
         )
         """
         A list of paragraphs, sentences, and whitespaces as segments.  See
@@ -28,14 +59,23 @@ class Revision:
         :class:`deltas.segmenters.MatchableSegment`.
         """
 
-        self.token_frequency = frequencies.table(
-            self.tokens,
-            name=self._name + ".token_frequency"
+        self.token_frequency = Datasource(
+            self._name + ".token_frequency", _process_array_frequency,
+            depends_on=[self.token_array]
         )
         """
         A frequency table of all tokens.
         """
 
+        self.tokens_by_type = partitioned(
+            self.tokens, name=self._name + ".tokens_by_type"
+        )
+        """
+        A `dict` of token lists keyed by the groups in
+        :data:`~revscoring.features.wikitext.datasources.tokenized.TOKEN_TYPES`
+        built in a single pass over the tokens.
+        """
+
         self.numbers = self.tokens_in_types(
             {'number'}, name=self._name + ".numbers"
         )
@@ -130,9 +170,16 @@ class Revision:
         A list of word tokens
         """
 
-        self.word_frequency = frequencies.table(
-            mappers.lower_case(self.words),
-            name=self._name + ".word_frequency"
+        self.word_index = indexed(
+            self.words, name=self._name + ".word_index"
+        )
+        """
+        A :class:`~revscoring.features.wikitext.datasources.word_index.WordIndex`
+        of the word tokens.  Language feature sets look words up through it.
+        """
+
+        self.word_frequency = frequency(
+            self.word_index, name=self._name + ".word_frequency"
         )
         """
         A frequency table of lower-cased word tokens.
@@ -191,14 +238,11 @@ class Revision:
         Constructs a :class:`revscoring.Datasource` that returns all content
         tokens that are within a set of types.
         """
-        token_is_in_types = TokenIsInTypes(types)
-
         if name is None:
             name = "{0}({1})" \
                    .format(self._name + ".tokens_in_types", types)
 
-        return filters.filter(token_is_in_types.filter,
-                              self.tokens, name=name)
+        return in_types(types, self.tokens, self.tokens_by_type, name)
 
     def tokens_matching(self, regex, name=None, regex_flags=re.I):
         """
@@ -221,198 +265,231 @@ class Diff():
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
-        self.token_delta = frequencies.delta(
+        self.token_deltas = frequencies.delta_and_prop_delta(
             self.revision.parent.token_frequency,
             self.revision.token_frequency,
+            name=self._name + ".token_deltas"
+        )
+        self.token_delta = indexable.index(
+            0, self.token_deltas,
             name=self._name + ".token_delta"
         )
         """
         A token frequency delta table
         """
 
-        self.token_prop_delta = frequencies.prop_delta(
-            self.revision.parent.token_frequency,
-            self.token_delta,
+        self.token_prop_delta = indexable.index(
+            1, self.token_deltas,
             name=self._name + ".token_prop_delta"
         )
         """
         A token proportional frequency delta table
         """
 
-        self.number_delta = frequencies.delta(
+        self.number_deltas = frequencies.delta_and_prop_delta(
             self.revision.parent.number_frequency,
             self.revision.number_frequency,
+            name=self._name + ".number_deltas"
+        )
+        self.number_delta = indexable.index(
+            0, self.number_deltas,
             name=self._name + ".number_delta"
         )
         """
         A number frequency delta table
         """
 
-        self.number_prop_delta = frequencies.prop_delta(
-            self.revision.parent.number_frequency,
-            self.number_delta,
+        self.number_prop_delta = indexable.index(
+            1, self.number_deltas,
             name=self._name + ".number_prop_delta"
         )
         """
         A number proportional frequency delta table
         """
 
-        self.whitespace_delta = frequencies.delta(
+        self.whitespace_deltas = frequencies.delta_and_prop_delta(
             self.revision.parent.whitespace_frequency,
             self.revision.whitespace_frequency,
+            name=self._name + ".whitespace_deltas"
+        )
+        self.whitespace_delta = indexable.index(
+            0, self.whitespace_deltas,
             name=self._name + ".whitespace_delta"
         )
         """
         A whitespace frequency delta table
         """
 
-        self.whitespace_prop_delta = frequencies.prop_delta(
-            self.revision.parent.whitespace_frequency,
-            self.whitespace_delta,
+        self.whitespace_prop_delta = indexable.index(
+            1, self.whitespace_deltas,
             name=self._name + ".whitespace_prop_delta"
         )
         """
         A whitespace proportional frequency delta table
         """
 
-        self.markup_delta = frequencies.delta(
+        self.markup_deltas = frequencies.delta_and_prop_delta(
             self.revision.parent.markup_frequency,
             self.revision.markup_frequency,
+            name=self._name + ".markup_deltas"
+        )
+        self.markup_delta = indexable.index(
+            0, self.markup_deltas,
             name=self._name + ".markup_delta"
         )
         """
         A markup frequency delta table
         """
 
-        self.markup_prop_delta = frequencies.prop_delta(
-            self.revision.parent.markup_frequency,
-            self.markup_delta,
+        self.markup_prop_delta = indexable.index(
+            1, self.markup_deltas,
             name=self._name + ".markup_prop_delta"
         )
         """
         A markup proportional frequency delta table
         """
 
-        self.cjk_delta = frequencies.delta(
+        self.cjk_deltas = frequencies.delta_and_prop_delta(
             self.revision.parent.cjk_frequency,
             self.revision.cjk_frequency,
+            name=self._name + ".cjk_deltas"
+        )
+        self.cjk_delta = indexable.index(
+            0, self.cjk_deltas,
             name=self._name + ".cjk_delta"
         )
         """
         A cjk frequency delta table
         """
 
-        self.cjk_prop_delta = frequencies.prop_delta(
-            self.revision.parent.cjk_frequency,
-            self.cjk_delta,
+        self.cjk_prop_delta = indexable.index(
+            1, self.cjk_deltas,
             name=self._name + ".cjk_prop_delta"
         )
         """
         A cjk proportional frequency delta table
         """
 
-        self.entity_delta = frequencies.delta(
+        self.entity_deltas = frequencies.delta_and_prop_delta(
             self.revision.parent.entity_frequency,
             self.revision.entity_frequency,
+            name=self._name + ".entity_deltas"
+        )
+        self.entity_delta = indexable.index(
+            0, self.entity_deltas,
             name=self._name + ".entity_delta"
         )
         """
         A entity frequency delta table
         """
 
-        self.entity_prop_delta = frequencies.prop_delta(
-            self.revision.parent.entity_frequency,
-            self.entity_delta,
+        self.entity_prop_delta = indexable.index(
+            1, self.entity_deltas,
             name=self._name + ".entity_prop_delta"
         )
         """
         A entity proportional frequency delta table
         """
 
-        self.url_delta = frequencies.delta(
+        self.url_deltas = frequencies.delta_and_prop_delta(
             self.revision.parent.url_frequency,
             self.revision.url_frequency,
+            name=self._name + ".url_deltas"
+        )
+        self.url_delta = indexable.index(
+            0, self.url_deltas,
             name=self._name + ".url_delta"
         )
         """
         A url frequency delta table
         """
 
-        self.url_prop_delta = frequencies.prop_delta(
-            self.revision.parent.url_frequency,
-            self.url_delta,
+        self.url_prop_delta = indexable.index(
+            1, self.url_deltas,
             name=self._name + ".url_prop_delta"
         )
         """
         A url proportional frequency delta table
         """
 
-        self.word_delta = frequencies.delta(
+        self.word_deltas = frequencies.delta_and_prop_delta(
             self.revision.parent.word_frequency,
             self.revision.word_frequency,
+            name=self._name + ".word_deltas"
+        )
+        self.word_delta = indexable.index(
+            0, self.word_deltas,
             name=self._name + ".word_delta"
         )
         """
         A lower-cased word frequency delta table
         """
 
-        self.word_prop_delta = frequencies.prop_delta(
-            self.revision.parent.word_frequency,
-            self.word_delta,
+        self.word_prop_delta = indexable.index(
+            1, self.word_deltas,
             name=self._name + ".word_prop_delta"
         )
         """
         A lower-cased word proportional frequency delta table
         """
 
-        self.uppercase_word_delta = frequencies.delta(
+        self.uppercase_word_deltas = frequencies.delta_and_prop_delta(
             self.revision.parent.uppercase_word_frequency,
             self.revision.uppercase_word_frequency,
+            name=self._name + ".uppercase_word_deltas"
+        )
+        self.uppercase_word_delta = indexable.index(
+            0, self.uppercase_word_deltas,
             name=self._name + ".uppercase_word_delta"
         )
         """
         A uppercase word frequency delta table
         """
 
-        self.uppercase_word_prop_delta = frequencies.prop_delta(
-            self.revision.parent.uppercase_word_frequency,
-            self.uppercase_word_delta,
+        self.uppercase_word_prop_delta = indexable.index(
+            1, self.uppercase_word_deltas,
             name=self._name + ".uppercase_word_prop_delta"
         )
         """
         A uppercase word proportional frequency delta table
         """
 
-        self.punctuation_delta = frequencies.delta(
+        self.punctuation_deltas = frequencies.delta_and_prop_delta(
             self.revision.parent.punctuation_frequency,
             self.revision.punctuation_frequency,
+            name=self._name + ".punctuation_deltas"
+        )
+        self.punctuation_delta = indexable.index(
+            0, self.punctuation_deltas,
             name=self._name + ".punctuation_delta"
         )
         """
         A punctuation frequency delta table
         """
 
-        self.punctuation_prop_delta = frequencies.prop_delta(
-            self.revision.parent.punctuation_frequency,
-            self.punctuation_delta,
+        self.punctuation_prop_delta = indexable.index(
+            1, self.punctuation_deltas,
             name=self._name + ".punctuation_prop_delta"
         )
         """
         A punctuation proportional frequency delta table
         """
 
-        self.break_delta = frequencies.delta(
+        self.break_deltas = frequencies.delta_and_prop_delta(
             self.revision.parent.break_frequency,
             self.revision.break_frequency,
+            name=self._name + ".break_deltas"
+        )
+        self.break_delta = indexable.index(
+            0, self.break_deltas,
             name=self._name + ".break_delta"
         )
         """
         A break frequency delta table
         """
 
-        self.break_prop_delta = frequencies.prop_delta(
-            self.revision.parent.break_frequency,
-            self.break_delta,
+        self.break_prop_delta = indexable.index(
+            1, self.break_deltas,
             name=self._name + ".break_prop_delta"
         )
         """
@@ -434,8 +511,254 @@ class TokenIsInTypes:
         return token.type in self.types
 
 
+TOKEN_TYPES = OrderedDict([
+    ('numbers', frozenset({'number'})),
+    ('whitespaces', frozenset({'whitespace'})),
+    ('markups', frozenset({'dbrack_open', 'dbrack_close', 'brack_open',
+                           'brack_close', 'tab_open', 'tab_close',
+                           'dcurly_open', 'dcurly_close', 'curly_open',
+                           'curly_close', 'bold', 'italics', 'equals'})),
+    ('cjks', frozenset({'cjk'})),
+    ('entities', frozenset({'entity'})),
+    ('urls', frozenset({'url'})),
+    ('words', frozenset({'word'})),
+    ('punctuations', frozenset({'period', 'qmark', 'epoint', 'comma',
+                                'colon', 'scolon', 'japan_punct'})),
+    ('breaks', frozenset({'break'}))
+])
+"""
+Groups of token types that are partitioned by
+:func:`~revscoring.features.wikitext.datasources.tokenized.partitioned`.
+"""
+
+TYPE_GROUPS = {type: group
+               for group, types in TOKEN_TYPES.items()
+               for type in types}
+GROUPS_BY_TYPES = {types: group for group, types in TOKEN_TYPES.items()}
+
+
+def _partition_tokens(tokens):
+    partitions = {group: [] for group in TOKEN_TYPES}
+    get_group = TYPE_GROUPS.get
+    for token in tokens:
+        group = get_group(token.type)
+        if group is not None:
+            partitions[group].append(token)
+
+    return partitions
+
+
+def partitioned(tokens_datasource, name=None):
+    """
+    Constructs a :class:`revscoring.Datasource` that splits a list of tokens
+    into the groups of
+    :data:`~revscoring.features.wikitext.datasources.tokenized.TOKEN_TYPES`
+    in a single pass.
+    """
+    if name is None:
+        name = "{0}({1})".format("partitioned", tokens_datasource)
+
+    return Datasource(
+        name, _partition_tokens, depends_on=[tokens_datasource]
+    )
+
+
+def in_types(types, tokens_datasource, partitioned_datasource, name):
+    """
+    Constructs a :class:`revscoring.Datasource` that returns the tokens that
+    are within a set of types.  If the types match one of the groups in
+    :data:`~revscoring.features.wikitext.datasources.tokenized.TOKEN_TYPES`,
+    the datasource is a view of `partitioned_datasource` rather than another
+    pass over `tokens_datasource`.
+    """
+    group = GROUPS_BY_TYPES.get(frozenset(types))
+    if group is not None:
+        return Datasource(name, itemgetter(group),
+                          depends_on=[partitioned_datasource])
+    else:
+        return filters.filter(TokenIsInTypes(types).filter,
+                              tokens_datasource, name=name)
+
+
+_GROUP_TYPE_CODES = OrderedDict(
+    (group, numpy.array([TYPE_CODES[type] for type in types
+                         if type in TYPE_CODES], dtype=numpy.intp))
+    for group, types in TOKEN_TYPES.items())
+
+
+def _process_char_stats(token_array):
+    type_chars = token_array.char_counts()
+    stats = {group: int(type_chars[codes].sum())
+             for group, codes in _GROUP_TYPE_CODES.items()}
+    stats['uppercase_words'] = \
+        sum(len(word) for word in token_array.strings(TOKEN_TYPES['words'])
+            if is_uppercase_word(word))
+    stats['longest_repeated_char'] = longest_repeated_char(token_array.text)
+    return stats
+
+
+def _process_token_char_stats(tokens):
+    stats = {group: 0 for group in TOKEN_TYPES}
+    stats['uppercase_words'] = 0
+    stats['chars'] = 0
+    get_group = TYPE_GROUPS.get
+    for token in tokens:
+        stats['chars'] += len(token)
+        group = get_group(token.type)
+        if group is not None:
+            stats[group] += len(token)
+            if group == 'words' and is_uppercase_word(token):
+                stats['uppercase_words'] += len(token)
+
+    return stats
+
+
+def token_char_stats(tokens_datasource, name=None):
+    """
+    Constructs a :class:`revscoring.Datasource` that counts the characters in
+    each group of
+    :data:`~revscoring.features.wikitext.datasources.tokenized.TOKEN_TYPES`
+    (and in "uppercase_words") of a list of tokens in a single pass.  The
+    total number of characters is included as "chars".
+    """
+    if name is None:
+        name = "{0}({1})".format("token_char_stats", tokens_datasource)
+
+    return Datasource(
+        name, _process_token_char_stats, depends_on=[tokens_datasource]
+    )
+
+
+def longest_repeated_char(text):
+    """
+    Returns the length of the longest run of a single (case-insensitive)
+    character in `text`.  Returns 1 for an empty text.
+    """
+    if len(text or "") == 0:
+        return 1
+
+    chars = numpy.frombuffer(text.lower().encode('utf-32-le'),
+                             dtype=numpy.uint32)
+    changes = numpy.flatnonzero(chars[1:] != chars[:-1])
+    runs = numpy.diff(numpy.concatenate(([-1], changes, [len(chars) - 1])))
+    return int(runs.max())
+
+
 def _process_tokens(text):
-    return [t for t in wikitext_split.tokenize(text or "")]
+    if get_cache() is not None:
+        return _process_token_array(text).tokens()
+    else:
+        return [t for t in wikitext_split.tokenize(text or "")]
+
+
+def _process_token_array(text):
+    cache = get_cache()
+    if cache is None:
+        return TokenArray.tokenize(text)
+    else:
+        text = text or ""
+        return cache.memoize(
+            "token_array", content_key(text),
+            partial(TokenArray.tokenize, text),
+            dump=_dump_token_array, load=partial(_load_token_array, text))
+
+
+def _dump_token_array(token_array):
+    return token_array.codes, token_array.starts
+
+
+def _load_token_array(text, codes_starts):
+    return TokenArray(text, *codes_starts)
+
+
+def _process_segments(tokens):
+    cache = get_cache()
+    if cache is None:
+        return paragraphs_sentences_and_whitespace.segment(tokens)
+    else:
+        return cache.memoize(
+            "segments", content_key("".join(tokens)),
+            partial(paragraphs_sentences_and_whitespace.segment, tokens),
+            dump=_dump_segments, load=partial(_load_segments, tokens))
+
+
+_SEGMENT, _MATCHABLE_SEGMENT, _TOKEN_RUN = 0, 1, 2
+
+
+def _dump_segments(segments):
+    """
+    Flattens a segment tree into an array of (kind, start, size) rows in
+    pre-order.  Consecutive tokens are stored as a single run.
+    """
+    rows = []
+
+    def dump(segment, position):
+        row = [_MATCHABLE_SEGMENT if isinstance(segment, MatchableSegment)
+               else _SEGMENT, segment.start, 0]
+        rows.append(row)
+        run = None
+        for subsegment in segment:
+            if isinstance(subsegment, Segment):
+                position = dump(subsegment, position)
+                run = None
+                row[2] += 1
+            else:
+                if run is None:
+                    run = [_TOKEN_RUN, position, 0]
+                    rows.append(run)
+                    row[2] += 1
+                run[2] += 1
+                position += 1
+
+        return position
+
+    dump(segments, segments.start)
+    return numpy.array(rows, dtype=numpy.int32)
+
+
+def _load_segments(tokens, rows):
+    rows = iter(rows.tolist())
+
+    def load():
+        kind, start, size = next(rows)
+        if kind == _TOKEN_RUN:
+            return tokens[start:start + size]
+
+        subsegments = []
+        for _ in range(size):
+            subsegment = load()
+            if isinstance(subsegment, Segment):
+                subsegments.append(subsegment)
+            else:
+                subsegments.extend(subsegment)
+
+        if kind == _MATCHABLE_SEGMENT:
+            return MatchableSegment(start, subsegments)
+        else:
+            return Segment(start, subsegments)
+
+    return load()
+
+
+def _process_array_tokens(token_array):
+    return token_array.tokens()
+
+
+def _process_array_frequency(token_array):
+    return token_array.frequency()
+
+
+def array_tokenized(text_datasource, name=None):
+    """
+    Constructs a :class:`revision.Datasource` that generates a
+    :class:`~revscoring.features.wikitext.datasources.token_array.TokenArray`
+    """
+    if name is None:
+        name = "{0}({1})".format("array_tokenized", text_datasource)
+
+    return Datasource(
+        name, _process_token_array, depends_on=[text_datasource]
+    )
 
 
 def tokenized(text_datasource, name=None):
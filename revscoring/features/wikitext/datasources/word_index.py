@@ -0,0 +1,272 @@
+"""
+A shared index of the words in a text (or in the words added or removed by
+an edit).
+
+A :class:`~revscoring.features.wikitext.datasources.word_index.WordIndex`
+keeps each distinct word form once (interned, along with its lower-cased
+form), an array of how many times each form occurs and the form of each
+occurrence.  Language feature sets (dictionary, stopwords, stems) build on
+the index, so a lookup function is called once per distinct form rather
+than once per occurrence, and frequency tables are built from the counts.
+
+.. autoclass:: revscoring.features.wikitext.datasources.word_index.WordIndex
+    :members:
+
+.. autoclass:: revscoring.features.wikitext.datasources.word_index.lookup
+
+.. autoclass:: revscoring.features.wikitext.datasources.word_index.selected
+
+.. autoclass:: revscoring.features.wikitext.datasources.word_index.mapped
+
+.. autoclass:: revscoring.features.wikitext.datasources.word_index.frequency
+"""
+import sys
+from itertools import compress
+
+import numpy
+
+from ....datasources import Datasource
+from ....datasources.meta.sparse import SparseTable
+
+
+class WordIndex:
+    """
+    Represents a sequence of words grouped by form.
+
+    :Parameters:
+        forms : `list` ( `str` )
+            The distinct word forms in order of their first occurrence
+        normalized : `list` ( `str` )
+            The lower-cased version of each form
+        counts : :class:`numpy.ndarray` ( `int` )
+            The number of occurrences of each form
+        positions : :class:`numpy.ndarray` ( `int32` )
+            The index of the form of each occurrence
+    """
+    __slots__ = ('forms', 'normalized', 'counts', 'positions')
+
+    def __init__(self, forms, normalized, counts, positions):
+        self.forms = forms
+        self.normalized = normalized
+        self.counts = counts
+        self.positions = positions
+
+    @classmethod
+    def from_words(cls, words):
+        """
+        Builds a WordIndex from a sequence of words (e.g. word tokens).
+        """
+        ids = {}
+        positions = []
+        for word in words:
+            try:
+                positions.append(ids[word])
+            except KeyError:
+                ids[word] = len(ids)
+                positions.append(len(ids) - 1)
+
+        forms = [sys.intern(str(word)) for word in ids]
+        normalized = [sys.intern(form.lower()) for form in forms]
+        positions = numpy.array(positions, dtype=numpy.int32)
+        return cls(forms, normalized, numpy.bincount(positions,
+                                                     minlength=len(forms)),
+                   positions)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __eq__(self, other):
+        return isinstance(other, WordIndex) and \
+            self.forms == other.forms and \
+            numpy.array_equal(self.positions, other.positions)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return "{0}({1} words, {2} forms)".format(
+            self.__class__.__name__, len(self), len(self.forms))
+
+    def words(self):
+        """
+        Returns the words in their original order.
+        """
+        return self.map(self.forms)
+
+    def lookup(self, func):
+        """
+        Applies `func` to each distinct form.
+
+        :Returns:
+            A `list` of results in the order of `forms`
+        """
+        return [func(form) for form in self.forms]
+
+    def map(self, values):
+        """
+        Expands a `list` of values (one per form) to a value per occurrence.
+        """
+        return [values[i] for i in self.positions.tolist()]
+
+    def select(self, flags, inverse=False):
+        """
+        Returns the words whose forms are flagged (or not flagged) in
+        `flags` in their original order.
+        """
+        keep = numpy.array(flags, dtype=bool) != inverse
+        forms = self.forms
+        return [forms[i] for i in
+                self.positions[keep[self.positions]].tolist()]
+
+    def frequency(self, flags=None, inverse=False, values=None):
+        """
+        Builds a frequency table of lower-cased words.
+
+        :Parameters:
+            flags : `list` ( `bool` )
+                Only counts forms that are flagged (or not flagged, if
+                `inverse`)
+            values : `list`
+                Counts these values (one per form) rather than the
+                lower-cased forms
+
+        :Returns:
+            A :class:`~revscoring.datasources.meta.sparse.SparseTable`
+        """
+        if values is None:
+            values = self.normalized
+        counts = self.counts
+        if flags is not None:
+            keep = numpy.array(flags, dtype=bool) != inverse
+            values = list(compress(values, keep.tolist()))
+            counts = counts[keep]
+        elif inverse:
+            values, counts = [], counts[:0]
+
+        return SparseTable.from_counts(values, counts)
+
+
+def indexed(words_datasource, name=None):
+    """
+    Constructs a :class:`revscoring.Datasource` that generates a
+    :class:`~revscoring.features.wikitext.datasources.word_index.WordIndex`
+    of a list of words.
+    """
+    if name is None:
+        name = "{0}({1})".format("indexed", words_datasource)
+
+    return Datasource(name, WordIndex.from_words, depends_on=[words_datasource])
+
+
+class lookup(Datasource):
+    """
+    Generates a `list` of the results of a function applied once to each form
+    in a :class:`~revscoring.features.wikitext.datasources.word_index.WordIndex`
+
+    :Parameters:
+        func : `func`
+            A function to apply to each form
+        index_datasource : :class:`revscoring.Datasource`
+            A datasource that generates a
+            :class:`~revscoring.features.wikitext.datasources.word_index.WordIndex`
+        name : `str`
+            A name for the datasource.
+    """
+    def __init__(self, func, index_datasource, name=None):
+        self.func = func
+        name = self._format_name(name, [func, index_datasource])
+        super().__init__(name, self.process, depends_on=[index_datasource])
+
+    def process(self, index):
+        return index.lookup(self.func)
+
+
+class selected(Datasource):
+    """
+    Generates a `list` of the words whose forms were flagged by a
+    :class:`~revscoring.features.wikitext.datasources.word_index.lookup`
+
+    :Parameters:
+        index_datasource : :class:`revscoring.Datasource`
+            A datasource that generates a
+            :class:`~revscoring.features.wikitext.datasources.word_index.WordIndex`
+        flags_datasource : :class:`revscoring.Datasource`
+            A lookup datasource that generates a flag per form
+        inverse : `bool`
+            Select the words that were not flagged
+        name : `str`
+            A name for the datasource.
+    """
+    def __init__(self, index_datasource, flags_datasource, inverse=False,
+                 name=None):
+        self.inverse = bool(inverse)
+        name = self._format_name(name, [index_datasource, flags_datasource,
+                                        inverse])
+        super().__init__(name, self.process,
+                         depends_on=[index_datasource, flags_datasource])
+
+    def process(self, index, flags):
+        return index.select(flags, inverse=self.inverse)
+
+
+class mapped(Datasource):
+    """
+    Generates a `list` of the results of a
+    :class:`~revscoring.features.wikitext.datasources.word_index.lookup` for
+    every word
+
+    :Parameters:
+        index_datasource : :class:`revscoring.Datasource`
+            A datasource that generates a
+            :class:`~revscoring.features.wikitext.datasources.word_index.WordIndex`
+        values_datasource : :class:`revscoring.Datasource`
+            A lookup datasource that generates a value per form
+        name : `str`
+            A name for the datasource.
+    """
+    def __init__(self, index_datasource, values_datasource, name=None):
+        name = self._format_name(name, [index_datasource, values_datasource])
+        super().__init__(name, self.process,
+                         depends_on=[index_datasource, values_datasource])
+
+    def process(self, index, values):
+        return index.map(values)
+
+
+class frequency(Datasource):
+    """
+    Generates a frequency table from the counts in a
+    :class:`~revscoring.features.wikitext.datasources.word_index.WordIndex`.
+    By default, lower-cased words are counted.
+
+    :Parameters:
+        index_datasource : :class:`revscoring.Datasource`
+            A datasource that generates a
+            :class:`~revscoring.features.wikitext.datasources.word_index.WordIndex`
+        flags_datasource : :class:`revscoring.Datasource`
+            A lookup datasource that generates a flag per form.  Only flagged
+            (or, if `inverse`, unflagged) forms are counted.
+        values_datasource : :class:`revscoring.Datasource`
+            A lookup datasource that generates the value to count for each
+            form
+        inverse : `bool`
+            Count the forms that were not flagged
+        name : `str`
+            A name for the datasource.
+    """
+    def __init__(self, index_datasource, flags_datasource=None,
+                 values_datasource=None, inverse=False, name=None):
+        self.inverse = bool(inverse)
+        self.has_flags = flags_datasource is not None
+        self.has_values = values_datasource is not None
+        depends_on = [index_datasource] + \
+            [ds for ds in (flags_datasource, values_datasource)
+             if ds is not None]
+        name = self._format_name(name, depends_on + [inverse])
+        super().__init__(name, self.process, depends_on=depends_on)
+
+    def process(self, index, *lookups):
+        lookups = list(lookups)
+        flags = lookups.pop(0) if self.has_flags else None
+        values = lookups.pop(0) if self.has_values else None
+        return index.frequency(flags, inverse=self.inverse, values=values)
@@ -1,4 +1,5 @@
 from ....datasources.meta import mappers
+from ...feature import Feature
 from ...meta import aggregators
 
 
@@ -164,3 +165,12 @@ class Diff:
         `int` : The length of the longest sequence of UPPPERCASE characters
         added
         """
+
+        self.approximate_diff = Feature(
+            self._name + ".approximate_diff", bool, returns=bool,
+            depends_on=[self.datasources.approximate_diff]
+        )
+        """
+        `bool` : True if the edit was too large to diff and the token
+        features were computed from a bag-of-tokens delta instead
+        """
@@ -31,25 +31,25 @@ class Revision:
         """
 
         self.headings = aggregators.len(
-            self.datasources.headings,
+            self.datasources.heading_titles,
             name=self._name + ".headings"
         )
         "`int` : The number of headings"
 
         self.external_links = aggregators.len(
-            self.datasources.external_links,
+            self.datasources.external_link_urls,
             name=self._name + ".external_links"
         )
         "`int` : The number of external links"
 
         self.wikilinks = aggregators.len(
-            self.datasources.wikilinks,
+            self.datasources.wikilink_titles,
             name=self._name + ".wikilinks"
         )
         "`int` : The number of wikilinks (internal to other pages in the wiki)"
 
         self.tags = aggregators.len(
-            self.datasources.tags,
+            self.datasources.tag_names,
             name=self._name + ".tags"
         )
         "`int` : The number of HTML tags"
@@ -61,7 +61,7 @@ class Revision:
         "`int` : The number of <ref> tags"
 
         self.templates = aggregators.len(
-            self.datasources.templates,
+            self.datasources.template_names,
             name=self._name + ".templates"
         )
         "`int` : The number of templates"
@@ -91,7 +91,7 @@ class Revision:
             name = "{0}({1})".format(self._name + ".headings_by_level",
                                      level)
         return aggregators.len(
-            self.datasources.headings_by_level(level),
+            self.datasources.heading_titles_by_level(level),
             name=name
         )
 
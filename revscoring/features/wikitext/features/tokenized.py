@@ -1,4 +1,5 @@
-from ....datasources.meta import dicts, filters, mappers
+from ....datasources.meta import dicts, filters
+from ...feature import Feature
 from ...meta import aggregators
 
 
@@ -30,11 +31,13 @@ class Revision:
         "`int` : The number of punctuation tokens in the revision"
         self.breaks = aggregators.len(self.datasources.breaks)
         "`int` : The number of break tokens in the revision"
-        self.longest_token = aggregators.max(
-            mappers.map(len, self.datasources.tokens), returns=int)
+        self.longest_token = Feature(
+            self._name + ".longest_token", _process_longest_token,
+            returns=int, depends_on=[self.datasources.token_array])
         "`int` : The longest single token in the revision"
-        self.longest_word = aggregators.max(
-            mappers.map(len, self.datasources.words), returns=int)
+        self.longest_word = Feature(
+            self._name + ".longest_word", _process_longest_word,
+            returns=int, depends_on=[self.datasources.token_array])
         "`int` : The longest single word-token in the revision"
 
 
@@ -564,3 +567,11 @@ class Diff:
         `int` : The sum of proportional delta decreases in the break
         frequency table
         """
+
+
+def _process_longest_token(token_array):
+    return token_array.longest()
+
+
+def _process_longest_word(token_array):
+    return token_array.longest({'word'})
@@ -242,3 +242,27 @@ def test_longest_repeated_char():
         revision.parent.longest_repeated_char)
     eq_(pickle.loads(pickle.dumps(revision.diff.longest_repeated_char_added)),
         revision.diff.longest_repeated_char_added)
+
+
+def test_char_stats():
+    cache = {p_text: "This is 45 words.",
+             r_text: "This is 45 NEW words!!  Zzz [[foo]] https://foo.com"}
+
+    char_stats = solve(revision.datasources.char_stats, cache=cache)
+    eq_(char_stats,
+        {'numbers': 2, 'whitespaces': 8, 'markups': 4, 'cjks': 0,
+         'entities': 0, 'urls': 15, 'words': 20, 'punctuations': 2,
+         'breaks': 0, 'uppercase_words': 3, 'longest_repeated_char': 3})
+    eq_(solve(revision.parent.datasources.char_stats, cache=cache)['words'],
+        11)
+
+    char_stats_added = solve(revision.diff.datasources.char_stats_added,
+                             cache=cache)
+    eq_(char_stats_added['uppercase_words'], 3)
+    eq_(char_stats_added['chars'],
+        solve(revision.diff.chars_added, cache=cache))
+
+    eq_(pickle.loads(pickle.dumps(revision.datasources.char_stats)),
+        revision.datasources.char_stats)
+    eq_(pickle.loads(pickle.dumps(revision.diff.datasources.char_stats_added)),
+        revision.diff.datasources.char_stats_added)
@@ -2,9 +2,13 @@ import pickle
 
 from nose.tools import eq_
 
-from .. import revision
+from .. import get_diff_limits, revision, set_diff_limits
+from .... import content_cache
+from ....content_cache import ContentCache
 from ....datasources import revision_oriented
 from ....dependencies import solve
+from ....metrics import Registry
+from ....worker_pool import WorkerPool
 
 r_text = revision_oriented.revision.text
 p_text = revision_oriented.revision.parent.text
@@ -24,6 +28,84 @@ def test_tokens():
         revision.diff.tokens_removed)
 
 
+def test_operations():
+    paragraphs = ["Paragraph number {0} is here.".format(i) for i in range(5)]
+    parent_text = "\n\n".join(paragraphs)
+    paragraphs[2] = "Paragraph number 2 has changed."
+    text = "\n\n".join(paragraphs)
+    cache = {p_text: parent_text, r_text: text}
+
+    operations, a, b = solve(revision.diff.datasources.operations,
+                             cache=cache)
+    eq_(operations[0].name, "equal")
+    eq_("".join(a[:operations[0].a2]), "\n\n".join(paragraphs[:2]) + "\n\n")
+    eq_(operations[-1].name, "equal")
+    eq_(operations[-1].a2, len(a))
+    eq_(operations[-1].b2, len(b))
+    eq_(solve(revision.diff.datasources.tokens_added, cache=cache),
+        ['has', 'changed'])
+    eq_(solve(revision.diff.datasources.tokens_removed, cache=cache),
+        ['is', 'here'])
+
+    # Identical texts are not diffed at all
+    operations, a, b = solve(revision.diff.datasources.operations,
+                             cache={p_text: text, r_text: text})
+    eq_([(op.name, op.a1, op.a2, op.b1, op.b2) for op in operations],
+        [("equal", 0, len(a), 0, len(b))])
+
+
+def test_approximate_diff():
+    cache = {p_text: "Foo bar baz.  Some more words.",
+             r_text: "Bar baz foo!  Some words words more."}
+    eq_(solve(revision.diff.approximate_diff, cache=dict(cache)), False)
+
+    try:
+        set_diff_limits(max_tokens=5)
+        eq_(solve(revision.diff.approximate_diff, cache=dict(cache)), True)
+        eq_(sorted(solve(revision.diff.datasources.tokens_added,
+                         cache=dict(cache))),
+            [' ', '!', 'Bar', 'foo', 'words'])
+        eq_(sorted(solve(revision.diff.datasources.tokens_removed,
+                         cache=dict(cache))),
+            ['.', 'Foo', 'bar'])
+
+        # Edits within the limit are still diffed
+        cache = {p_text: "Foo bar.\n\nBaz.", r_text: "Foo bar.\n\nBaz!"}
+        eq_(solve(revision.diff.approximate_diff, cache=dict(cache)), False)
+    finally:
+        set_diff_limits()
+
+    eq_(pickle.loads(pickle.dumps(revision.diff.approximate_diff)),
+        revision.diff.approximate_diff)
+
+
+def test_approximate_diff_not_cached():
+    cache = {p_text: "Foo bar baz.  Some more words.",
+             r_text: "Bar baz foo!  Some words words more."}
+    registry = Registry()
+    requests = registry.counter("content_cache_requests_total")
+    try:
+        content_cache.set_cache(ContentCache(metrics=registry))
+        set_diff_limits(max_tokens=5)
+        eq_(solve(revision.diff.approximate_diff, cache=dict(cache)), True)
+        eq_(requests.get(namespace="operations", result="miss"), 0)
+
+        # The exact diff isn't shadowed by the approximation
+        set_diff_limits()
+        eq_(solve(revision.diff.approximate_diff, cache=dict(cache)), False)
+        eq_(requests.get(namespace="operations", result="miss"), 1)
+    finally:
+        content_cache.set_cache(None)
+        set_diff_limits()
+
+
+def test_diff_limits_state():
+    with WorkerPool(processes=1, state={'diff_limits': {'max_tokens': 5}}) \
+            as pool:
+        eq_(pool.submit(get_diff_limits).result(), {'max_tokens': 5})
+    eq_(get_diff_limits()['max_tokens'], 100000)
+
+
 def test_tokens_matching():
     cache = {p_text: "This is not 55 a sring.",
              r_text: "This is too 56 a tring."}
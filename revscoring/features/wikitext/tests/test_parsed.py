@@ -1,5 +1,6 @@
 import pickle
 
+import mwparserfromhell
 from nose.tools import eq_
 
 from .. import revision
@@ -142,3 +143,24 @@ def test_templates():
         revision.templates)
     eq_(pickle.loads(pickle.dumps(cite_templates)),
         cite_templates)
+
+
+def test_parse_summary():
+    text = "== Head {{foo}} ==\n" + \
+           "{{cite|url=[http://example.com ex]|[[inner]]}} the [[bar|baz]]" + \
+           "<ref>[http://wikimedia.org wm]</ref> &amp; <!-- [[no]] -->\n" + \
+           "=== Sub ==="
+    cache = {r_text: text}
+    summary = solve(revision.datasources.parse_summary, cache=cache)
+    eq_(summary['content'], mwparserfromhell.parse(text).strip_code())
+    eq_(summary['heading_titles'], ["Head {{foo}}", "Sub"])
+    eq_(summary['heading_levels'], [2, 3])
+    eq_(summary['template_names'], ["foo", "cite"])
+    eq_(summary['wikilink_titles'], ["inner", "bar"])
+    eq_(summary['external_link_urls'],
+        ["http://example.com", "http://wikimedia.org"])
+    eq_(summary['tag_names'], ["ref"])
+
+    eq_(pickle.loads(pickle.dumps(summary)), summary)
+    eq_(pickle.loads(pickle.dumps(revision.datasources.parse_summary)),
+        revision.datasources.parse_summary)
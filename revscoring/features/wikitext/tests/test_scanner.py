@@ -0,0 +1,117 @@
+import pickle
+
+import mwparserfromhell
+from nose.tools import eq_, raises
+
+from .. import revision
+from ..datasources import Revision as DatasourcesRevision
+from ..datasources.parsed import _summarize
+from ..datasources.scanner import scan
+from ..features import Revision
+from ....datasources import revision_oriented
+from ....dependencies import solve
+
+name = "wikitext.scanned_revision"
+scanned_revision = Revision(
+    name, DatasourcesRevision(name, revision_oriented.revision,
+                              parser="scanner"))
+
+r_text = revision_oriented.revision.text
+p_text = revision_oriented.revision.parent.text
+
+ARTICLE = """{{Short description|Species of bird}}
+{{Infobox bird
+| name = Common starling
+| image = Sturnus vulgaris 2.jpg
+| status = LC<ref name="IUCN">{{cite journal |author=BirdLife International \
+|year=2016 |title=''Sturnus vulgaris'' |url=http://www.iucnredlist.org/x}}\
+</ref>
+}}
+The '''common starling''' (''Sturnus vulgaris''), also known as the \
+'''European starling''', is a [[passerine]] bird in the [[starling]] family, \
+[[Sturnidae]].<ref>Feare, p. 15.</ref> It is about {{convert|20|cm|in|abbr=on}} \
+long &ndash; see http://example.org/starling_(bird). and [[#Taxonomy|below]].
+
+== Taxonomy and systematics ==
+The common starling was first described by [[Carl Linnaeus]] in his \
+''[[Systema Naturae]]'' in 1758.<!-- Needs a better source -->
+=== Subspecies ===
+* ''S. v. vulgaris'' &ndash; Europe
+* ''S. v. faroensis'' &ndash; [[Faroe Islands]]
+** nested item with <span style="color:red">markup</span>
+# first
+# second
+; Term : definition
+
+{| class="wikitable sortable"
+|+ Measurements
+|-
+! Subspecies !! Length !! Wing
+|-
+| ''vulgaris'' || 20&nbsp;cm || [[Wing|123 mm]]
+|-
+| style="text-align:right" | ''zetlandicus''
+| 21 cm
+|}
+
+----
+<gallery>
+File:Starling.jpg|Adult
+</gallery>
+[[File:Sturnus vulgaris 3.jpg|thumb|left|A [[juvenile]] in ''moult'']]
+Links: [http://www.rspb.org.uk RSPB] and [//commons.wikimedia.org Commons].
+<nowiki>[[not a link]]</nowiki> <math>x^2</math><br /><references />
+
+== References ==
+{{Reflist|30em}}
+{{{1|default [[value]]}}}
+
+[[Category:Starlings]]
+[[Category:Birds described in 1758]]"""
+
+CORPUS = [
+    "",
+    "Plain text without any markup.",
+    ARTICLE,
+    "= H1 =\n== H2 ==\n=== H3 ===\n====== H6 ======\n======= H7 =======",
+    "==Unbalanced===\n===Unbalanced==\n== Trailing == text",
+    "'''''bold italic''''' ''it '''bold in it''' it'' '''b ''it in b'''''",
+    "'''unclosed bold ''closed italics''",
+    "{{Outer|{{Inner|a=b}}|c=[[Link|text]]}} {{{{Nested}}|x}} {{",
+    "[[Foo|bar]] [[Baz]]s [[a|b|c]] [[broken [[Link]] ]]",
+    "[http://a.example/x] [http://b.example title ''styled''] [not a link]",
+    "mailto:someone@example.org, https://a.example/b?c=d&amp;e=f; done.",
+    "<ref name=x>a</ref> <ref name=x /> <div>unclosed <b>bold</b>",
+    "<!-- comment --> &amp; &nbsp; &#123; &#x41; &notanentity;",
+    "* a\n** b\n*# c\n: d\n;term:def\n----\nafter",
+    "{|\n|-\n| a || b\n|}\n{|\n! h1 !! h2\n|}",
+    "{{cite web|url=http://example.org|title=T}} <ref>{{cite book|title=B}}"
+    "</ref>\n\n\n\nCollapsed  newlines.",
+]
+
+
+def test_scan():
+    for text in CORPUS:
+        eq_(scan(text), _summarize(mwparserfromhell.parse(text)))
+
+
+def test_features():
+    features = ["content_chars", "headings", "external_links", "wikilinks",
+                "tags", "ref_tags", "templates"]
+    for text in CORPUS:
+        cache = {p_text: ARTICLE, r_text: text}
+        expected = solve([getattr(revision, feature) for feature in features],
+                         cache=dict(cache))
+        eq_(list(solve([getattr(scanned_revision, feature)
+                        for feature in features], cache=dict(cache))),
+            list(expected))
+        eq_(solve(scanned_revision.parent.wikilinks, cache=dict(cache)),
+            solve(revision.parent.wikilinks, cache=dict(cache)))
+
+    eq_(pickle.loads(pickle.dumps(scanned_revision.wikilinks)),
+        scanned_revision.wikilinks)
+
+
+@raises(ValueError)
+def test_unknown_parser():
+    DatasourcesRevision("foo", revision_oriented.revision, parser="foo")
@@ -0,0 +1,61 @@
+import pickle
+
+from deltas import wikitext_split
+from nose.tools import eq_
+
+from .. import revision
+from ....datasources import revision_oriented
+from ....dependencies import solve
+from ..datasources.token_array import TokenArray
+
+r_text = revision_oriented.revision.text
+
+text = """
+This is an m80.  It has 50 grams of TNT. Here's some japanese:
+修造のための勧進を担った組織の総称。[//google.com?foo=bar hats]
+I can use &middot; and &nbsp;.  But [[can]] I {{foo}} a {{bar}}?
+
+I guess we'll never know.
+"""
+
+
+def test_token_array():
+    tokens = wikitext_split.tokenize(text)
+    token_array = TokenArray.tokenize(text)
+
+    eq_(len(token_array), len(tokens))
+    eq_(token_array.tokens(), tokens)
+    eq_([t.type for t in token_array], [t.type for t in tokens])
+    eq_(token_array[5], tokens[5])
+    eq_(token_array[5].type, tokens[5].type)
+    eq_(token_array[-1], tokens[-1])
+    eq_(token_array[3:6], tokens[3:6])
+    eq_(TokenArray.from_tokens(tokens), token_array)
+
+    eq_(token_array.count({'number'}), 1)
+    eq_(token_array.char_count(), len(text))
+    eq_(token_array.char_count({'entity'}), len("&middot;&nbsp;"))
+    eq_(token_array.longest(), len("//google.com?foo=bar"))
+    eq_(token_array.longest({'word'}), len("japanese"))
+    eq_(token_array.strings({'entity'}), ["&middot;", "&nbsp;"])
+    eq_(token_array.tokens({'number'}), ["50"])
+    eq_(token_array.frequency({'word'})['I'], 3)
+
+    eq_(pickle.loads(pickle.dumps(token_array)), token_array)
+
+
+def test_empty():
+    token_array = TokenArray.tokenize(None)
+    eq_(len(token_array), 0)
+    eq_(token_array.tokens(), [])
+    eq_(token_array.longest(), 0)
+    eq_(token_array.frequency(), {})
+
+
+def test_datasources():
+    eq_(solve(revision.datasources.token_array, cache={r_text: text}),
+        TokenArray.tokenize(text))
+    eq_(solve(revision.datasources.tokens, cache={r_text: text}),
+        wikitext_split.tokenize(text))
+    eq_(pickle.loads(pickle.dumps(revision.datasources.token_array)),
+        revision.datasources.token_array)
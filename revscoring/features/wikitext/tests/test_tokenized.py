@@ -33,6 +33,30 @@ def test_tokens_in_types():
     eq_(pickle.loads(pickle.dumps(my_words)), my_words)
 
 
+def test_tokens_by_type():
+    tokens_by_type = solve(revision.datasources.tokens_by_type,
+                           cache={r_text: text})
+    eq_(tokens_by_type['numbers'], ['50'])
+    eq_(tokens_by_type['entities'], ['&middot;', '&nbsp;'])
+    eq_(tokens_by_type['markups'],
+        ['[', ']', '[[', ']]', '{{', '}}', '{{', '}}'])
+    eq_(set(tokens_by_type.keys()),
+        {'numbers', 'whitespaces', 'markups', 'cjks', 'entities', 'urls',
+         'words', 'punctuations', 'breaks'})
+    eq_(pickle.loads(pickle.dumps(revision.datasources.tokens_by_type)),
+        revision.datasources.tokens_by_type)
+
+    # Matching groups of types are views of the partition
+    my_markups = revision.datasources.tokens_in_types(
+        {'dbrack_open', 'dbrack_close', 'brack_open', 'brack_close',
+         'tab_open', 'tab_close', 'dcurly_open', 'dcurly_close',
+         'curly_open', 'curly_close', 'bold', 'italics', 'equals'})
+    eq_(my_markups.dependencies, [revision.datasources.tokens_by_type])
+    eq_(solve(my_markups, cache={r_text: text}),
+        tokens_by_type['markups'])
+    eq_(pickle.loads(pickle.dumps(my_markups)), my_markups)
+
+
 def test_tokens_matching():
     my_s_words = revision.datasources.tokens_matching(r"^s")
     eq_(solve(my_s_words, cache={r_text: text}),
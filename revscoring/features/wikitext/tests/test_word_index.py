@@ -0,0 +1,66 @@
+import pickle
+
+from nose.tools import eq_
+
+from ..datasources.word_index import (WordIndex, frequency, indexed, lookup,
+                                      mapped, selected)
+from ....datasources import Datasource
+from ....dependencies import solve
+
+words = Datasource("words")
+index = indexed(words)
+
+WORDS = ["Foo", "bar", "foo", "Foo", "baz", "bar"]
+
+
+def test_word_index():
+    word_index = WordIndex.from_words(WORDS)
+    eq_(word_index.forms, ["Foo", "bar", "foo", "baz"])
+    eq_(word_index.normalized, ["foo", "bar", "foo", "baz"])
+    eq_(word_index.counts.tolist(), [2, 2, 1, 1])
+    eq_(len(word_index), 6)
+    eq_(word_index.words(), WORDS)
+    eq_(word_index, WordIndex.from_words(list(WORDS)))
+    assert word_index != WordIndex.from_words(WORDS[1:])
+
+    flags = [True, False, False, True]
+    eq_(word_index.select(flags), ["Foo", "Foo", "baz"])
+    eq_(word_index.select(flags, inverse=True), ["bar", "foo", "bar"])
+    eq_(word_index.frequency(), {"foo": 3, "bar": 2, "baz": 1})
+    eq_(word_index.frequency(flags), {"foo": 2, "baz": 1})
+    eq_(word_index.frequency(flags, inverse=True), {"foo": 1, "bar": 2})
+    eq_(word_index.frequency(values=["f", "b", "f", "b"]), {"f": 3, "b": 3})
+
+    empty = WordIndex.from_words([])
+    eq_(empty.words(), [])
+    eq_(empty.select([]), [])
+    eq_(empty.frequency(), {})
+
+
+LOOKED_UP = []
+
+
+def is_lower(word):
+    LOOKED_UP.append(word)
+    return word.islower()
+
+
+def test_datasources():
+    checks = lookup(is_lower, index)
+    cache = {words: WORDS}
+    eq_(solve(selected(index, checks), cache=dict(cache)),
+        ["bar", "foo", "baz", "bar"])
+    # Each form is only looked up once
+    eq_(LOOKED_UP, ["Foo", "bar", "foo", "baz"])
+
+    eq_(solve(selected(index, checks, inverse=True), cache=dict(cache)),
+        ["Foo", "Foo"])
+    eq_(solve(mapped(index, checks), cache=dict(cache)),
+        [False, True, True, False, True, True])
+    eq_(solve(frequency(index, checks, inverse=True), cache=dict(cache)),
+        {"foo": 2})
+    eq_(solve(frequency(index, values_datasource=checks), cache=dict(cache)),
+        {False: 2, True: 4})
+
+    eq_(pickle.loads(pickle.dumps(frequency(index, checks))),
+        frequency(index, checks))
@@ -0,0 +1,119 @@
+"""
+Priority lanes for scheduling work.  A :class:`~revscoring.lanes.LaneQueue`
+holds a FIFO queue per lane and decides which lane the next item comes from
+either by strict priority or by smooth weighted round-robin.
+
+Example:
+    >>> from revscoring.lanes import LaneQueue
+    >>>
+    >>> queue = LaneQueue([("realtime", 3), ("backfill", 1)])
+    >>> for i in range(4):
+    ...     queue.put("backfill", "b{0}".format(i))
+    ...     queue.put("realtime", "r{0}".format(i))
+    ...
+    >>> [queue.get()[1] for i in range(8)]
+    ['r0', 'r1', 'b0', 'r2', 'r3', 'b1', 'b2', 'b3']
+
+.. autoclass:: revscoring.lanes.LaneQueue
+    :members:
+"""
+import threading
+import time
+from collections import OrderedDict, deque
+
+DEFAULT_LANES = [("default", 1)]
+
+
+class LaneQueue:
+    """
+    A thread-safe set of FIFO queues, one per lane.
+
+    :Parameters:
+        lanes : `list` ( (`str`, `int`) ) | `dict`
+            Lane names and their weights in priority order.  Higher priority
+            lanes should come first.
+        strict : `bool`
+            If True, items are always taken from the highest priority lane
+            that has any.  Otherwise, lanes are served in proportion to their
+            weight (smooth weighted round-robin) so that low priority lanes
+            are never starved.
+    """
+
+    def __init__(self, lanes=None, strict=False):
+        lanes = lanes if lanes is not None else DEFAULT_LANES
+        if hasattr(lanes, "items"):
+            lanes = lanes.items()
+        self.weights = OrderedDict((str(lane), int(weight))
+                                   for lane, weight in lanes)
+        if len(self.weights) == 0:
+            raise ValueError("At least one lane must be specified.")
+        for lane, weight in self.weights.items():
+            if weight <= 0:
+                raise ValueError("Lane {0} must have a positive weight, not {1}"
+                                 .format(repr(lane), weight))
+        self.strict = bool(strict)
+        self._queues = {lane: deque() for lane in self.weights}
+        self._current = {lane: 0 for lane in self.weights}
+        self._lock = threading.Lock()
+
+    @property
+    def lanes(self):
+        """
+        The names of the lanes in priority order.
+        """
+        return list(self.weights.keys())
+
+    def put(self, lane, item):
+        """
+        Adds an item to the end of a lane.
+        """
+        if lane not in self._queues:
+            raise ValueError("Unknown lane {0}.  Expected one of {1}"
+                             .format(repr(lane), self.lanes))
+        with self._lock:
+            self._queues[lane].append((time.perf_counter(), item))
+
+    def get(self):
+        """
+        Takes the next item according to the lane policy.
+
+        :Returns:
+            A (lane, item, seconds waited) `tuple`
+
+        :Raises:
+            `IndexError` if all lanes are empty
+        """
+        with self._lock:
+            lane = self._select()
+            enqueued, item = self._queues[lane].popleft()
+
+        return lane, item, time.perf_counter() - enqueued
+
+    def _select(self):
+        ready = [lane for lane in self.weights if len(self._queues[lane]) > 0]
+        if len(ready) == 0:
+            raise IndexError("get from an empty LaneQueue")
+        elif self.strict or len(ready) == 1:
+            return ready[0]
+        else:
+            total = 0
+            selected = None
+            for lane in ready:
+                self._current[lane] += self.weights[lane]
+                total += self.weights[lane]
+                if selected is None or \
+                   self._current[lane] > self._current[selected]:
+                    selected = lane
+            self._current[selected] -= total
+            return selected
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(queue) for queue in self._queues.values())
+
+    def depth(self, lane):
+        """
+        The number of items waiting in a lane.
+        """
+        with self._lock:
+            return len(self._queues[lane])
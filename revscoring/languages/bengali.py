@@ -1,15 +1,27 @@
 from .features import Dictionary, RegexMatches, Stopwords
+from .features.lazy import LazyResource
 
 name = "bengali"
 
-try:
+
+def _load_dictionary():
     import enchant
-    dictionary = enchant.Dict("bn")
-except enchant.errors.DictNotFoundError:
-    raise ImportError("No enchant-compatible dictionary found for 'bn'.  " +
-                      "Consider installing 'aspell-bn'.")
+    try:
+        return enchant.Dict("bn")
+    except enchant.errors.DictNotFoundError:
+        raise ImportError(
+            "No enchant-compatible dictionary found for 'bn'.  " +
+            "Consider installing 'aspell-bn'.")
+
+
+enchant_dict = LazyResource(_load_dictionary, name + ".enchant_dict")
+
+
+def dictionary_check(word):
+    return enchant_dict.check(word)
+
 
-dictionary = Dictionary(name + ".dictionary", dictionary.check)
+dictionary = Dictionary(name + ".dictionary", dictionary_check)
 """
 :class:`~revscoring.languages.features.Dictionary` features via
 :class:`enchant.Dict` "bn".  Provided by `aspell-bn`
@@ -1,21 +1,28 @@
 from .features import Dictionary, RegexMatches, Stemmed, Stopwords
 from .features.dictionary import utf16_cleanup
+from .features.lazy import LazyResource
 
 name = "english"
 
-try:
+
+def _load_dictionary():
     import enchant
-    enchant_dict = enchant.Dict("en")
-except enchant.errors.DictNotFoundError:
-    raise ImportError("No enchant-compatible dictionary found for 'en'.  " +
-                      "Consider installing 'myspell-en-au', " +
-                      "'myspell-en-gb', 'myspell-en-us' and/or " +
-                      "'myspell-en-za'.")
+    try:
+        return enchant.Dict("en")
+    except enchant.errors.DictNotFoundError:
+        raise ImportError(
+            "No enchant-compatible dictionary found for 'en'.  " +
+            "Consider installing 'myspell-en-au', 'myspell-en-gb', " +
+            "'myspell-en-us' and/or 'myspell-en-za'.")
+
+
+enchant_dict = LazyResource(_load_dictionary, name + ".enchant_dict")
 
 
 def safe_dictionary_check(word):
     return enchant_dict.check(utf16_cleanup(word))
 
+
 dictionary = Dictionary(name + ".dictionary", safe_dictionary_check)
 """
 :class:`~revscoring.languages.features.Dictionary` features via
@@ -23,27 +30,42 @@ dictionary = Dictionary(name + ".dictionary", safe_dictionary_check)
 `myspell-en-us`, and `myspell-en-za`.
 """
 
-try:
+
+def _load_stopwords():
     from nltk.corpus import stopwords as nltk_stopwords
-    stopwords = set(nltk_stopwords.words('english'))
-except LookupError:
-    raise ImportError("Could not load stopwords for {0}. ".format(__name__) +
-                      "You may need to install the nltk 'stopwords' " +
-                      "corpora.  See http://www.nltk.org/data.html")
+    try:
+        return set(nltk_stopwords.words('english'))
+    except LookupError:
+        raise ImportError(
+            "Could not load stopwords for {0}. ".format(__name__) +
+            "You may need to install the nltk 'stopwords' " +
+            "corpora.  See http://www.nltk.org/data.html")
+
 
-stopwords = Stopwords(name + ".stopwords", stopwords)
+stopword_set = LazyResource(_load_stopwords, name + ".stopword_set")
+stopwords = Stopwords(name + ".stopwords", stopword_set)
 """
 :class:`~revscoring.languages.features.Stopwords` features provided by
 :func:`nltk.corpus.stopwords` "english"
 """
 
-try:
+
+def _load_stemmer():
     from nltk.stem.snowball import SnowballStemmer
-    stemmer = SnowballStemmer("english")
-except ValueError:
-    raise ImportError("Could not load stemmer for {0}. ".format(__name__))
+    try:
+        return SnowballStemmer("english")
+    except ValueError:
+        raise ImportError("Could not load stemmer for {0}. ".format(__name__))
+
+
+stemmer = LazyResource(_load_stemmer, name + ".stemmer")
+
+
+def stem_word(word):
+    return stemmer.stem(word)
+
 
-stemmed = Stemmed(name + ".stemmed", stemmer.stem)
+stemmed = Stemmed(name + ".stemmed", stem_word)
 """
 :class:`~revscoring.languages.features.Stemmed` word features via
 :class:`nltk.stem.snowball.SnowballStemmer` "english"
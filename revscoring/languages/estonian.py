@@ -1,15 +1,27 @@
 from .features import Dictionary, RegexMatches, Stopwords
+from .features.lazy import LazyResource
 
 name = "estonian"
 
-try:
+
+def _load_dictionary():
     import enchant
-    dictionary = enchant.Dict("et")
-except enchant.errors.DictNotFoundError:
-    raise ImportError("No enchant-compatible dictionary found for 'et'.  " +
-                      "Consider installing 'myspell-et'.")
+    try:
+        return enchant.Dict("et")
+    except enchant.errors.DictNotFoundError:
+        raise ImportError(
+            "No enchant-compatible dictionary found for 'et'.  " +
+            "Consider installing 'myspell-et'.")
+
+
+enchant_dict = LazyResource(_load_dictionary, name + ".enchant_dict")
+
+
+def dictionary_check(word):
+    return enchant_dict.check(word)
+
 
-dictionary = Dictionary(name + ".dictionary", dictionary.check)
+dictionary = Dictionary(name + ".dictionary", dictionary_check)
 """
 :class:`~revscoring.languages.features.Dictionary` features via
 :class:`enchant.Dict` "et". Provided by `myspell-et`
@@ -15,6 +15,18 @@ Stemmed
 +++++++
 .. automodule :: revscoring.languages.features.stemmed
 
+Memoization
++++++++++++
+.. automodule :: revscoring.languages.features.memoized
+
+Word profiles
++++++++++++++
+.. automodule :: revscoring.languages.features.word_profile
+
+Lazy loading
+++++++++++++
+.. automodule :: revscoring.languages.features.lazy
+
 """
 from .dictionary import Dictionary
 from .regex_matches import RegexMatches
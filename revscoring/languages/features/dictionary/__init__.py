@@ -15,9 +15,20 @@ Supporting classes
 .. autoclass:: revscoring.languages.features.dictionary.Diff
     :members:
     :member-order: bysource
+
+Backends
+--------
+.. automodule:: revscoring.languages.features.dictionary.backends
+
+.. autoclass:: revscoring.languages.features.dictionary.MemoizedCheck
+    :members:
+
+.. autoclass:: revscoring.languages.features.dictionary.WordSet
+    :members:
 """
+from .backends import MemoizedCheck, WordSet
 from .dictionary import Dictionary
 from .features import Diff, Revision
 from .util import utf16_cleanup
 
-__all__ = [Dictionary, utf16_cleanup, Revision, Diff]
+__all__ = [Dictionary, utf16_cleanup, Revision, Diff, MemoizedCheck, WordSet]
@@ -0,0 +1,164 @@
+"""
+Dictionary checks can be slow (e.g. `enchant` makes a round trip through a C
+library for every word).  These backends make them cheap to repeat.
+
+A :class:`~revscoring.languages.features.dictionary.MemoizedCheck` remembers
+the results of a check function for the most recently checked words.
+:class:`~revscoring.languages.features.Dictionary` wraps its
+`dictionary_check` in one, so a word is only checked once per process no
+matter how many revisions (or parents and diffs) it appears in.
+
+A :class:`~revscoring.languages.features.dictionary.WordSet` replaces the
+check function entirely with a frozen set of words that is built offline
+(see :mod:`revscoring.utilities.build_word_set`) and memory-mapped, so
+that many processes can share one copy.
+
+Example:
+    >>> from revscoring.languages.features import Dictionary
+    >>> from revscoring.languages.features.dictionary import WordSet
+    >>>
+    >>> words = WordSet.load("/usr/share/revscoring/en.words.npy")
+    >>> dictionary = Dictionary("english.dictionary", words.check)
+"""
+import hashlib
+
+import numpy
+
+from ..memoized import Memoized
+
+
+class MemoizedCheck(Memoized):
+    """
+    Wraps a dictionary check function with a bounded memo.
+
+    :Parameters:
+        check : `func`
+            A function that returns `True` if a word is in the dictionary
+        max_size : `int`
+            The maximum number of words to remember results for.  The least
+            recently checked words are forgotten first.
+    """
+
+    def __init__(self, check, max_size=2 ** 16):
+        super().__init__(check, max_size=max_size)
+
+
+class WordSet:
+    """
+    A frozen set of words stored as a sorted array of 64-bit hashes.  Words
+    are looked up by binary search, so a loaded set doesn't need to be
+    unpacked into memory.
+
+    :Parameters:
+        hashes : :class:`numpy.ndarray` ( `int64` )
+            The sorted hashes of the words in the set
+        path : `str`
+            The file that `hashes` was loaded from (if any).  A pickled
+            WordSet only stores this path and re-maps the file when it is
+            unpickled.
+    """
+
+    def __init__(self, hashes, path=None):
+        self.hashes = hashes
+        self.path = path
+
+    @classmethod
+    def from_words(cls, words):
+        """
+        Builds a WordSet from an iterable of words.
+        """
+        hashes = numpy.unique(numpy.fromiter(
+            (word_hash(word) for word in words), dtype=numpy.int64))
+        return cls(hashes)
+
+    @classmethod
+    def from_file(cls, f):
+        """
+        Builds a WordSet from a file with one word per line.  Hunspell `.dic`
+        files (a word count on the first line and "/"-separated affix flags)
+        are also read, but affixes are not expanded.  Use the output of
+        `unmunch` or `aspell dump` to include inflected forms.
+        """
+        return cls.from_words(read_words(f))
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Loads a WordSet that was written with
+        :func:`~revscoring.languages.features.dictionary.WordSet.dump`.
+
+        :Parameters:
+            path : `str`
+                The path to load from
+            mmap : `bool`
+                Memory-map the file rather than reading it into memory
+        """
+        hashes = numpy.load(path, mmap_mode='r' if mmap else None)
+        return cls(hashes, path=path if mmap else None)
+
+    def dump(self, path):
+        """
+        Writes the WordSet to a `.npy` file at `path`.
+        """
+        numpy.save(path, numpy.asarray(self.hashes, dtype=numpy.int64))
+
+    def __contains__(self, word):
+        value = numpy.int64(word_hash(word))
+        i = self.hashes.searchsorted(value)
+        return i < len(self.hashes) and self.hashes[i] == value
+
+    def check(self, word):
+        """
+        Checks if a word is in the set.  Like hunspell, words in title-case
+        or all caps are also accepted if their lower-cased or capitalized
+        forms are in the set.
+        """
+        if word in self:
+            return True
+        elif word.isupper() or word.istitle():
+            return word.lower() in self or word.capitalize() in self
+        else:
+            return False
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def __getstate__(self):
+        if self.path is not None:
+            return {'path': self.path}
+        else:
+            return {'hashes': numpy.asarray(self.hashes)}
+
+    def __setstate__(self, state):
+        if 'path' in state:
+            self.__init__(numpy.load(state['path'], mmap_mode='r'),
+                          path=state['path'])
+        else:
+            self.__init__(state['hashes'])
+
+    def __repr__(self):
+        return "{0}({1} words{2})".format(
+            self.__class__.__name__, len(self),
+            ", path={0!r}".format(self.path) if self.path else "")
+
+
+def word_hash(word):
+    """
+    Hashes a word to a signed 64-bit `int` that is stable between processes.
+    """
+    return int.from_bytes(
+        hashlib.md5(word.encode('utf-8')).digest()[:8],
+        'little', signed=True)
+
+
+def read_words(f):
+    """
+    Reads words from a file with one word per line or a hunspell `.dic` file.
+    """
+    for i, line in enumerate(f):
+        fields = line.split()
+        if len(fields) == 0 or (i == 0 and fields[0].isdigit()):
+            continue  # Blank lines and the word count of a hunspell .dic
+        word = fields[0].split("/", 1)[0]
+        if word != "":
+            yield word
@@ -1,5 +1,6 @@
+from ..word_profile import FLAG, profiled, word_profile
 from ....datasources import Datasource
-from ....datasources.meta import filters, frequencies, mappers
+from ....datasources.meta import frequencies, indexable
 from ....dependencies import DependentSet
 
 
@@ -9,23 +10,30 @@ class Revision(DependentSet):
         super().__init__(name)
         self.dictionary_check = dictionary_check
 
-        self.dict_split = dict_splitter(
-            name + '.dict_split', dictionary_check, wikitext_revision.words
+        # Each distinct word form is only checked once
+        revision_profile = word_profile(
+            wikitext_revision.word_index, FLAG, dictionary_check,
+            name=name + ".dict_profile"
         )
-        self.dict_words = Datasource(
-            name + '.dict_words', _process_dict_words,
-            depends_on=[self.dict_split]
+        self.dict_checks = profiled(
+            revision_profile, 'checks', name=name + ".dict_checks"
         )
-        self.non_dict_words = Datasource(
-            name + '.non_dict_words', _process_non_dict_words,
-            depends_on=[self.dict_split]
+        self.dict_words = profiled(
+            revision_profile, 'flagged', name=name + '.dict_words'
         )
-        self.dict_word_frequency = frequencies.table(
-            mappers.lower_case(self.dict_words),
+        self.non_dict_words = profiled(
+            revision_profile, 'unflagged', name=name + '.non_dict_words'
+        )
+        self.dict_split = Datasource(
+            name + '.dict_split', _process_dict_split,
+            depends_on=[self.dict_words, self.non_dict_words]
+        )
+        self.dict_word_frequency = profiled(
+            revision_profile, 'flagged_frequency',
             name=name + ".dict_word_frequency",
         )
-        self.non_dict_word_frequency = frequencies.table(
-            mappers.lower_case(self.non_dict_words),
+        self.non_dict_word_frequency = profiled(
+            revision_profile, 'unflagged_frequency',
             name=name + ".non_dict_word_frequency"
         )
 
@@ -38,31 +46,8 @@ class Revision(DependentSet):
                              wikitext_revision.diff, self)
 
 
-def _process_dict_words(dict_split):
-    return dict_split[0]
-
-
-def _process_non_dict_words(dict_split):
-    return dict_split[1]
-
-
-class dict_splitter(Datasource):
-
-    def __init__(self, name, dictionary_check, words_datasource):
-        name = self._format_name(name, [dictionary_check, words_datasource])
-        self.dictionary_check = dictionary_check
-        super().__init__(name, self.process, depends_on=[words_datasource])
-
-    def process(self, words):
-        dict_words = []
-        non_dict_words = []
-        for word in words:
-            if self.dictionary_check(str(word)):
-                dict_words.append(word)
-            else:
-                non_dict_words.append(word)
-
-        return dict_words, non_dict_words
+def _process_dict_split(dict_words, non_dict_words):
+    return dict_words, non_dict_words
 
 
 class Diff(DependentSet):
@@ -71,41 +56,65 @@ class Diff(DependentSet):
         self.dictionary_check = dictionary_check
 
         # Based on edit.diff
-        self.dict_words_added = filters.filter(
-            dictionary_check, mappers.map(str, wikitext_diff.words_added),
+        added_profile = word_profile(
+            wikitext_diff.words_added_index, FLAG, dictionary_check,
+            name=name + ".dict_profile_added"
+        )
+        removed_profile = word_profile(
+            wikitext_diff.words_removed_index, FLAG, dictionary_check,
+            name=name + ".dict_profile_removed"
+        )
+
+        self.dict_checks_added = profiled(
+            added_profile, 'checks',
+            name=name + ".dict_checks_added"
+        )
+        self.dict_checks_removed = profiled(
+            removed_profile, 'checks',
+            name=name + ".dict_checks_removed"
+        )
+        self.dict_words_added = profiled(
+            added_profile, 'flagged',
             name=name + ".dict_words_added"
         )
-        self.dict_words_removed = filters.filter(
-            dictionary_check, mappers.map(str, wikitext_diff.words_removed),
+        self.dict_words_removed = profiled(
+            removed_profile, 'flagged',
             name=name + ".dict_words_removed"
         )
-        self.non_dict_words_added = filters.filter(
-            dictionary_check, mappers.map(str, wikitext_diff.words_added),
-            name=name + ".non_dict_words_added", inverse=True
+        self.non_dict_words_added = profiled(
+            added_profile, 'unflagged',
+            name=name + ".non_dict_words_added"
         )
-        self.non_dict_words_removed = filters.filter(
-            dictionary_check, mappers.map(str, wikitext_diff.words_removed),
-            name=name + ".non_dict_words_removed", inverse=True
+        self.non_dict_words_removed = profiled(
+            removed_profile, 'unflagged',
+            name=name + ".non_dict_words_removed"
         )
 
         # Frequencies
-        self.dict_word_delta = frequencies.delta(
+        self.dict_word_deltas = frequencies.delta_and_prop_delta(
             revision.parent.dict_word_frequency,
             revision.dict_word_frequency,
+            name=name + ".dict_word_deltas"
+        )
+        self.dict_word_delta = indexable.index(
+            0, self.dict_word_deltas,
             name=name + ".dict_word_delta"
         )
-        self.non_dict_word_delta = frequencies.delta(
+        self.dict_word_prop_delta = indexable.index(
+            1, self.dict_word_deltas,
+            name=name + ".dict_word_prop_delta"
+        )
+
+        self.non_dict_word_deltas = frequencies.delta_and_prop_delta(
             revision.parent.non_dict_word_frequency,
             revision.non_dict_word_frequency,
-            name=name + ".non_dict_word_delta"
+            name=name + ".non_dict_word_deltas"
         )
-
-        self.dict_word_prop_delta = frequencies.prop_delta(
-            revision.parent.dict_word_frequency, self.dict_word_delta,
-            name=name + ".dict_word_prop_delta"
+        self.non_dict_word_delta = indexable.index(
+            0, self.non_dict_word_deltas,
+            name=name + ".non_dict_word_delta"
         )
-        self.non_dict_word_prop_delta = frequencies.prop_delta(
-            revision.parent.non_dict_word_frequency,
-            self.non_dict_word_delta,
+        self.non_dict_word_prop_delta = indexable.index(
+            1, self.non_dict_word_deltas,
             name=name + ".non_dict_word_prop_delta"
         )
@@ -1,4 +1,6 @@
 from . import datasources, features
+from .backends import MemoizedCheck
+from ..memoized import Memoized
 from ....dependencies import DependentSet
 from ....features import wikitext
 
@@ -11,10 +13,24 @@ class Dictionary(DependentSet):
         dictionary_check : `func`
             A function that, given a word, performs a dictionary check and
             returns True if the word exists.
+        memo_size : `int`
+            The number of words to memoize `dictionary_check` results for
+            (see
+            :class:`~revscoring.languages.features.dictionary.MemoizedCheck`).
+            Set to `None` to check every word.
     """
 
-    def __init__(self, name, dictionary_check):
+    def __init__(self, name, dictionary_check, memo_size=2 ** 16):
         super().__init__(name)
+        if memo_size and not isinstance(dictionary_check, Memoized):
+            dictionary_check = MemoizedCheck(dictionary_check,
+                                             max_size=memo_size)
+        self.dictionary_check = dictionary_check
+        """
+        The (memoized) dictionary check function.  Memo stats are available
+        via `cache_info()`.
+        """
+
         self.revision = features.Revision(
             name + ".revision",
             datasources.Revision(name + ".revision", dictionary_check,
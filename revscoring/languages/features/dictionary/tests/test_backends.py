@@ -0,0 +1,64 @@
+import io
+import os
+import pickle
+import tempfile
+
+from nose.tools import eq_
+
+from ..backends import MemoizedCheck, WordSet, read_words
+
+CHECKED = []
+
+
+def dictionary_check(word):
+    CHECKED.append(word)
+    return word in {"foo", "bar"}
+
+
+def test_memoized_check():
+    check = MemoizedCheck(dictionary_check, max_size=2)
+    del CHECKED[:]
+    eq_([check(word) for word in ["foo", "baz", "foo", "foo"]],
+        [True, False, True, True])
+    eq_(CHECKED, ["foo", "baz"])
+
+    # "baz" was the least recently checked word, so it was forgotten
+    check("bar")
+    check("foo")
+    check("baz")
+    eq_(CHECKED, ["foo", "baz", "bar", "baz"])
+    eq_(check.cache_info().currsize, 2)
+
+    unpickled = pickle.loads(pickle.dumps(check))
+    eq_(unpickled.max_size, 2)
+    eq_(unpickled.cache_info().currsize, 0)
+    eq_(unpickled("foo"), True)
+
+
+def test_word_set():
+    words = WordSet.from_words(["foo", "Paris", "bar", "foo"])
+    eq_(len(words), 3)
+    assert "foo" in words
+    assert "Foo" not in words
+    eq_([words.check(word) for word in
+         ["foo", "Foo", "FOO", "Paris", "PARIS", "paris", "fOO", "baz"]],
+        [True, True, True, True, True, False, False, False])
+
+    path = os.path.join(tempfile.mkdtemp(), "words.npy")
+    words.dump(path)
+    loaded = WordSet.load(path)
+    eq_(loaded.path, path)
+    eq_(loaded.check("Paris"), True)
+    eq_(loaded.check("baz"), False)
+
+    # Loaded sets are re-mapped from their path
+    eq_(pickle.loads(pickle.dumps(loaded)).path, path)
+    eq_(pickle.loads(pickle.dumps(loaded)).check("bar"), True)
+    eq_(pickle.loads(pickle.dumps(words)).check("bar"), True)
+    eq_(WordSet.load(path, mmap=False).check("foo"), True)
+
+
+def test_read_words():
+    f = io.StringIO("3\nfoo/AB\nbar\tpo:noun\n\nbaz\n")
+    eq_(list(read_words(f)), ["foo", "bar", "baz"])
+    eq_(list(read_words(io.StringIO("foo\nbar"))), ["foo", "bar"])
@@ -0,0 +1,134 @@
+"""
+Language assets (enchant dictionaries, nltk stopword corpora, stemmers) can
+take a long time to load and many models never use them.  Language modules
+wrap their assets in a
+:class:`~revscoring.languages.features.lazy.LazyResource` so that they are
+only loaded the first time they are used rather than when the module is
+imported.
+
+Note that errors that would have been raised when loading an asset (e.g. an
+:class:`ImportError` for a missing dictionary) are raised on first use.
+Call `load()` to load an asset up front (e.g. before forking workers).
+:func:`~revscoring.languages.features.lazy.load_resources` loads all of the
+assets of a set of modules.  :class:`~revscoring.worker_pool.WorkerPool`
+uses it to load the assets of its preloaded modules in the fork server, so
+that workers share one copy.
+
+.. autoclass:: revscoring.languages.features.lazy.LazyResource
+    :members:
+
+.. autofunction:: revscoring.languages.features.lazy.load_resources
+"""
+import importlib
+import logging
+import sys
+import threading
+
+logger = logging.getLogger(__name__)
+
+UNLOADED = object()
+
+
+class LazyResource:
+    """
+    A proxy for a resource that is loaded on first use.  Attribute access,
+    `in`, `iter()` and `len()` are forwarded to the loaded resource.
+
+    :Parameters:
+        load : `func`
+            A function that takes no arguments and returns the resource.  It
+            is called at most once (unless it raises an error).
+        name : `str`
+            A name for the resource (used in `repr()`)
+    """
+
+    def __init__(self, load, name=None):
+        self._load = load
+        self._name = name
+        self._resource = UNLOADED
+        self._lock = threading.Lock()
+
+    def load(self):
+        """
+        Loads the resource (if it hasn't been loaded yet) and returns it.
+        """
+        resource = self._resource
+        if resource is UNLOADED:
+            with self._lock:
+                if self._resource is UNLOADED:
+                    self._resource = self._load()
+                resource = self._resource
+        return resource
+
+    @property
+    def loaded(self):
+        """
+        `True` if the resource has been loaded.
+        """
+        return self._resource is not UNLOADED
+
+    def __getattr__(self, attr):
+        # Only called for attributes that aren't set on the proxy.  Private
+        # attributes are never forwarded so that a partially initialized
+        # proxy (e.g. during unpickling) doesn't try to load.
+        if attr.startswith("_"):
+            raise AttributeError(attr)
+        return getattr(self.load(), attr)
+
+    def __contains__(self, item):
+        return item in self.load()
+
+    def __iter__(self):
+        return iter(self.load())
+
+    def __len__(self):
+        return len(self.load())
+
+    def __getstate__(self):
+        return (self._load, self._name)
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def __repr__(self):
+        return "{0}({1}{2})".format(
+            self.__class__.__name__, self._name or repr(self._load),
+            "" if self.loaded else ", unloaded")
+
+
+def load_resources(module_names=None):
+    """
+    Loads the :class:`~revscoring.languages.features.lazy.LazyResource`
+    assets held at the top level of modules.  Assets that fail to load are
+    skipped (and will raise their errors on first use).
+
+    :Parameters:
+        module_names : `iterable` ( `str` )
+            The modules to load the assets of.  They are imported if they
+            haven't been already.  Defaults to every imported module.
+
+    :Returns:
+        The number of assets loaded
+    """
+    if module_names is None:
+        modules = list(sys.modules.values())
+    else:
+        modules = []
+        for module_name in module_names:
+            try:
+                modules.append(importlib.import_module(module_name))
+            except ImportError as e:
+                logger.debug("Could not import {0}: {1}"
+                             .format(module_name, e))
+
+    loaded = 0
+    for module in modules:
+        for value in list(getattr(module, "__dict__", {}).values()):
+            if isinstance(value, LazyResource):
+                try:
+                    value.load()
+                    loaded += 1
+                except Exception as e:
+                    logger.debug("Could not load {0!r}: {1}".format(value, e))
+
+    return loaded
@@ -0,0 +1,55 @@
+"""
+Language feature sets call word-level functions (dictionary checks,
+stemmers) on the same words over and over.  Word frequencies are heavily
+skewed, so remembering the results for the most recently used words saves
+most of the calls.
+
+.. autoclass:: revscoring.languages.features.memoized.Memoized
+    :members:
+"""
+from functools import lru_cache
+
+
+class Memoized:
+    """
+    Wraps a function of a single word with a bounded memo.
+
+    :Parameters:
+        func : `func`
+            A function that takes a word (e.g. a stemmer)
+        max_size : `int`
+            The maximum number of words to remember results for.  The least
+            recently used words are forgotten first.
+    """
+
+    def __init__(self, func, max_size=2 ** 16):
+        self.func = func
+        self.max_size = int(max_size)
+        self._memoized = lru_cache(maxsize=self.max_size)(func)
+
+    def __call__(self, word):
+        return self._memoized(word)
+
+    def cache_info(self):
+        """
+        Returns the hits, misses, max size and current size of the memo.  See
+        :func:`functools.lru_cache`.
+        """
+        return self._memoized.cache_info()
+
+    def cache_clear(self):
+        """
+        Forgets all memoized results and resets the hit/miss stats.
+        """
+        self._memoized.cache_clear()
+
+    def __getstate__(self):
+        return (self.func, self.max_size)
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def __repr__(self):
+        return "{0}({1!r}, max_size={2})".format(
+            self.__class__.__name__, self.func, self.max_size)
+
@@ -0,0 +1,11 @@
+"""
+Importing this module loads the
+:class:`~revscoring.languages.features.lazy.LazyResource` assets of every
+module that has been imported so far.
+:class:`~revscoring.worker_pool.WorkerPool` adds it to the end of the fork
+server's preload list so that the assets of the preloaded modules are loaded
+once, before any worker is forked.
+"""
+from .lazy import load_resources
+
+load_resources()
@@ -1,6 +1,12 @@
-from ....datasources.meta import extractors, frequencies, mappers
+from ....datasources.meta import (extractors, frequencies, indexable,
+                                 mappers)
 from ....dependencies import DependentSet
 
+# Scanners are shared by all collections in a namespace (e.g.
+# "english.badwords" and "english.informals") so that each text is only
+# scanned once for all of them.
+_scanners = {}
+
 
 class Revision(DependentSet):
 
@@ -11,7 +17,8 @@ class Revision(DependentSet):
             regexes, wikitext_revision.text,
             name=name + ".matches",
             exclusions=exclusions,
-            wrapping=wrapping
+            wrapping=wrapping,
+            scanner=_scanner(name, wikitext_revision.text)
         )
         self.match_frequency = frequencies.table(
             mappers.lower_case(self.matches),
@@ -41,22 +48,42 @@ class Diff(DependentSet):
             regexes, wikitext_diff.segments_added,
             name=name + ".matches_added",
             exclusions=exclusions,
-            wrapping=wrapping
+            wrapping=wrapping,
+            scanner=_scanner(name, wikitext_diff.segments_added)
         )
         self.matches_removed = extractors.regex(
             regexes, wikitext_diff.segments_removed,
             name=name + ".matches_removed",
             exclusions=exclusions,
-            wrapping=wrapping
+            wrapping=wrapping,
+            scanner=_scanner(name, wikitext_diff.segments_removed)
         )
 
-        self.match_delta = frequencies.delta(
+        self.match_deltas = frequencies.delta_and_prop_delta(
             revision.parent.match_frequency,
             revision.match_frequency,
+            name=name + ".match_deltas"
+        )
+        self.match_delta = indexable.index(
+            0, self.match_deltas,
             name=name + ".match_delta"
         )
-        self.match_prop_delta = frequencies.prop_delta(
-            revision.parent.match_frequency,
-            self.match_delta,
+        self.match_prop_delta = indexable.index(
+            1, self.match_deltas,
             name=name + ".match_prop_delta"
         )
+
+
+def _scanner(name, text_datasource):
+    """
+    Gets the :class:`~revscoring.datasources.meta.extractors.multi_regex`
+    that scans `text_datasource` for the collections in `name`'s namespace.
+    """
+    namespace = name.split(".")[0]
+    key = (namespace, text_datasource)
+    if key not in _scanners:
+        _scanners[key] = extractors.multi_regex(
+            text_datasource,
+            name="{0}.regex_scan({1})".format(namespace, text_datasource.name)
+        )
+    return _scanners[key]
@@ -1,4 +1,5 @@
-from ....datasources.meta import frequencies, mappers
+from ..word_profile import MAP, profiled, word_profile
+from ....datasources.meta import frequencies, indexable
 from ....dependencies import DependentSet
 
 
@@ -6,14 +7,21 @@ class Revision(DependentSet):
     def __init__(self, name, stem_word, wikitext_revision):
         super().__init__(name)
 
-        self.stems = mappers.map(
-            stem_word, wikitext_revision.words,
-            name=name + ".stems"
+        # Each distinct word form is only stemmed once
+        revision_profile = word_profile(
+            wikitext_revision.word_index, MAP, stem_word,
+            name=name + ".stem_profile"
+        )
+        self.form_stems = profiled(
+            revision_profile, 'values', name=name + ".form_stems"
+        )
+
+        self.stems = profiled(
+            revision_profile, 'mapped', name=name + ".stems"
         )
 
-        self.stem_frequency = frequencies.table(
-            self.stems,
-            name=name + ".stem_frequency"
+        self.stem_frequency = profiled(
+            revision_profile, 'frequency', name=name + ".stem_frequency"
         )
 
         if hasattr(wikitext_revision, 'parent'):
@@ -29,21 +37,33 @@ class Diff(DependentSet):
     def __init__(self, name, stem_word, wikitext_diff, revision):
         super().__init__(name)
 
-        self.stems_added = mappers.map(
-            stem_word, wikitext_diff.words_added,
-            name=name + ".stems_added"
+        added_profile = word_profile(
+            wikitext_diff.words_added_index, MAP, stem_word,
+            name=name + ".stem_profile_added"
+        )
+        removed_profile = word_profile(
+            wikitext_diff.words_removed_index, MAP, stem_word,
+            name=name + ".stem_profile_removed"
         )
-        self.stems_removed = mappers.map(
-            stem_word, wikitext_diff.words_removed,
+
+        self.stems_added = profiled(
+            added_profile, 'mapped', name=name + ".stems_added"
+        )
+        self.stems_removed = profiled(
+            removed_profile, 'mapped',
             name=name + ".stems_removed"
         )
 
-        self.stem_delta = frequencies.delta(
+        self.stem_deltas = frequencies.delta_and_prop_delta(
             revision.parent.stem_frequency,
             revision.stem_frequency,
+            name=name + ".stem_deltas"
+        )
+        self.stem_delta = indexable.index(
+            0, self.stem_deltas,
             name=name + ".stem_delta"
         )
-        self.stem_prop_delta = frequencies.prop_delta(
-            revision.parent.stem_frequency, self.stem_delta,
+        self.stem_prop_delta = indexable.index(
+            1, self.stem_deltas,
             name=name + ".stem_prop_delta"
         )
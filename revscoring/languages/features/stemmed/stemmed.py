@@ -1,4 +1,5 @@
 from . import datasources, features
+from ..memoized import Memoized
 from ....dependencies import DependentSet
 from ....features import wikitext
 
@@ -11,10 +12,22 @@ class Stemmed(DependentSet):
         stem_word : `func`
             A function that, give a word, will return a stemmed version of that
             word
+        memo_size : `int`
+            The number of words to memoize stems for (see
+            :class:`~revscoring.languages.features.memoized.Memoized`).  Set
+            to `None` to stem every word.
     """
 
-    def __init__(self, name, stem_word):
+    def __init__(self, name, stem_word, memo_size=2 ** 16):
         super().__init__(name)
+        if memo_size and not isinstance(stem_word, Memoized):
+            stem_word = Memoized(stem_word, max_size=memo_size)
+        self.stem_word = stem_word
+        """
+        The (memoized) stemming function.  Memo stats are available via
+        `cache_info()`.
+        """
+
         self.revision = features.Revision(
             name + ".revision",
             datasources.Revision(name + ".revision", stem_word,
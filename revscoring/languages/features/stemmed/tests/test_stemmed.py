@@ -73,3 +73,20 @@ def test_pickling():
         diff.stem_prop_delta_increase)
     eq_(pickle.loads(pickle.dumps(diff.stem_prop_delta_decrease)),
         diff.stem_prop_delta_decrease)
+
+
+def test_memo():
+    memo_stemmed = Stemmed("english.memo_stemmed", stem_word, memo_size=100)
+    cache = {p_text: "This is good.  These are words.",
+             r_text: "This is bad.  These are words."}
+    datasources = memo_stemmed.revision.datasources
+    list(solve([datasources.stems, datasources.parent.stems,
+                datasources.diff.stem_delta], cache=cache))
+    # Every distinct word was only stemmed once
+    info = memo_stemmed.stem_word.cache_info()
+    eq_(info.misses, 7)
+    eq_(info.currsize, 7)
+    assert info.hits > 0
+
+    eq_(Stemmed("english.stemmed", stem_word, memo_size=None).stem_word,
+        stem_word)
@@ -1,4 +1,5 @@
-from ....datasources.meta import filters, frequencies, mappers
+from ..word_profile import FLAG, profiled, word_profile
+from ....datasources.meta import frequencies, indexable
 from ....dependencies import DependentSet
 
 
@@ -7,20 +8,25 @@ class Revision(DependentSet):
     def __init__(self, name, is_stopword, wikitext_revision):
         super().__init__(name)
 
-        self.stopwords = filters.filter(
-            is_stopword, wikitext_revision.words,
-            name=name + ".stopwords"
+        revision_profile = word_profile(
+            wikitext_revision.word_index, FLAG, is_stopword,
+            name=name + ".stopword_profile"
         )
-        self.non_stopwords = filters.filter(
-            is_stopword, wikitext_revision.words,
-            name=name + ".non_stopwords", inverse=True
+        self.stopword_checks = profiled(
+            revision_profile, 'checks', name=name + ".stopword_checks"
         )
-        self.stopword_frequency = frequencies.table(
-            mappers.lower_case(self.stopwords),
+        self.stopwords = profiled(
+            revision_profile, 'flagged', name=name + ".stopwords"
+        )
+        self.non_stopwords = profiled(
+            revision_profile, 'unflagged', name=name + ".non_stopwords"
+        )
+        self.stopword_frequency = profiled(
+            revision_profile, 'flagged_frequency',
             name=name + ".stopword_frequency",
         )
-        self.non_stopword_frequency = frequencies.table(
-            mappers.lower_case(self.non_stopwords),
+        self.non_stopword_frequency = profiled(
+            revision_profile, 'unflagged_frequency',
             name=name + ".non_stopword_frequency"
         )
 
@@ -38,42 +44,65 @@ class Diff(DependentSet):
         self.is_stopword = is_stopword
 
         # Based on edit.diff
-        self.stopwords_added = filters.filter(
-            is_stopword, wikitext_diff.words_added,
+        added_profile = word_profile(
+            wikitext_diff.words_added_index, FLAG, is_stopword,
+            name=name + ".diff.stopword_profile_added"
+        )
+        removed_profile = word_profile(
+            wikitext_diff.words_removed_index, FLAG, is_stopword,
+            name=name + ".diff.stopword_profile_removed"
+        )
+
+        self.stopword_checks_added = profiled(
+            added_profile, 'checks',
+            name=name + ".diff.stopword_checks_added"
+        )
+        self.stopword_checks_removed = profiled(
+            removed_profile, 'checks',
+            name=name + ".diff.stopword_checks_removed"
+        )
+        self.stopwords_added = profiled(
+            added_profile, 'flagged',
             name=name + ".diff.stopwords_added"
         )
-        self.stopwords_removed = filters.filter(
-            is_stopword, wikitext_diff.words_removed,
+        self.stopwords_removed = profiled(
+            removed_profile, 'flagged',
             name=name + ".diff.stopwords_removed"
         )
-        self.non_stopwords_added = filters.filter(
-            is_stopword, wikitext_diff.words_added,
-            name=name + ".diff.non_stopwords_added", inverse=True
+        self.non_stopwords_added = profiled(
+            added_profile, 'unflagged',
+            name=name + ".diff.non_stopwords_added"
         )
-        self.non_stopwords_removed = filters.filter(
-            is_stopword, wikitext_diff.words_removed,
-            name=name + ".diff.non_stopwords_removed", inverse=True
+        self.non_stopwords_removed = profiled(
+            removed_profile, 'unflagged',
+            name=name + ".diff.non_stopwords_removed"
         )
 
         # Frequencies
-        self.stopword_delta = frequencies.delta(
+        self.stopword_deltas = frequencies.delta_and_prop_delta(
             revision.parent.stopword_frequency,
             revision.stopword_frequency,
+            name=name + ".diff.stopword_deltas"
+        )
+        self.stopword_delta = indexable.index(
+            0, self.stopword_deltas,
             name=name + ".diff.stopword_delta"
         )
-        self.non_stopword_delta = frequencies.delta(
+        self.stopword_prop_delta = indexable.index(
+            1, self.stopword_deltas,
+            name=name + ".diff.stopword_prop_delta"
+        )
+
+        self.non_stopword_deltas = frequencies.delta_and_prop_delta(
             revision.parent.non_stopword_frequency,
             revision.non_stopword_frequency,
-            name=name + ".diff.non_stopword_delta"
+            name=name + ".diff.non_stopword_deltas"
         )
-
-        self.stopword_prop_delta = frequencies.prop_delta(
-            revision.parent.stopword_frequency,
-            self.stopword_delta,
-            name=name + ".diff.stopword_prop_delta"
+        self.non_stopword_delta = indexable.index(
+            0, self.non_stopword_deltas,
+            name=name + ".diff.non_stopword_delta"
         )
-        self.non_stopword_prop_delta = frequencies.prop_delta(
-            revision.parent.non_stopword_frequency,
-            self.non_stopword_delta,
+        self.non_stopword_prop_delta = indexable.index(
+            1, self.non_stopword_deltas,
             name=name + ".diff.non_stopword_prop_delta"
         )
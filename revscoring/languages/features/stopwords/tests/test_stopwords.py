@@ -4,6 +4,7 @@ from nose.tools import eq_
 
 from .....datasources import revision_oriented
 from .....dependencies import solve
+from ...lazy import LazyResource
 from ..stopwords import Stopwords
 
 stopwords_set = {'my', 'is', 'the', 'of', 'and'}
@@ -11,6 +12,14 @@ stopwords_set = {'my', 'is', 'the', 'of', 'and'}
 
 my_stops = Stopwords("my_language", stopwords_set)
 
+LOADS = []
+
+
+def load_stopwords():
+    LOADS.append(True)
+    return stopwords_set
+
+
 r_text = revision_oriented.revision.text
 p_text = revision_oriented.revision.parent.text
 
@@ -83,6 +92,24 @@ def test_stopwords():
         -2)
 
 
+def test_lazy():
+    lazy_set = LazyResource(load_stopwords, "my_language.stopword_set")
+    lazy_stops = Stopwords("my_lazy_language", lazy_set)
+    eq_(LOADS, [])
+    eq_(lazy_set.loaded, False)
+
+    cache = {r_text: "My waffle is the king of Normandy and the king of York."}
+    eq_(solve(lazy_stops.revision.stopwords, cache=dict(cache)), 7)
+    eq_(solve(lazy_stops.revision.non_stopwords, cache=dict(cache)), 5)
+    eq_(LOADS, [True])
+    eq_(len(lazy_set), 5)
+
+    unpickled_set = pickle.loads(pickle.dumps(lazy_set))
+    eq_(unpickled_set.loaded, False)
+    eq_("the" in unpickled_set, True)
+    eq_(LOADS, [True, True])
+
+
 def test_pickling():
     eq_(pickle.loads(pickle.dumps(my_stops.revision.stopwords)),
         my_stops.revision.stopwords)
@@ -0,0 +1,91 @@
+import pickle
+
+from nose.tools import eq_, raises
+
+from .. import Dictionary, Stemmed, Stopwords
+from ..word_profile import FLAG, MAP, profiled, word_profile
+from ....datasources import revision_oriented
+from ....dependencies import solve
+from ....features.wikitext import revision
+
+CALLS = []
+
+
+def is_short(word):
+    CALLS.append(word)
+    return len(word) <= 3
+
+
+def first_letters(word):
+    CALLS.append(word)
+    return word[:2].lower()
+
+
+r_text = revision_oriented.revision.text
+p_text = revision_oriented.revision.parent.text
+
+# memo_size=None so that every call reaches the functions above
+dictionary = Dictionary("profiled.dictionary", is_short, memo_size=None)
+stopwords = Stopwords("profiled.stopwords", {"the", "of", "and"})
+stemmed = Stemmed("profiled.stemmed", first_letters, memo_size=None)
+
+
+def test_profiles():
+    cache = {r_text: "The king of Normandy and the King of York."}
+    del CALLS[:]
+    values = list(solve(
+        [dictionary.revision.datasources.dict_words,
+         dictionary.revision.datasources.non_dict_word_frequency,
+         stopwords.revision.datasources.stopwords,
+         stopwords.revision.datasources.non_stopword_frequency,
+         stemmed.revision.datasources.stems,
+         stemmed.revision.datasources.stem_frequency], cache=cache))
+
+    eq_(values[0], ['The', 'of', 'and', 'the', 'of'])
+    eq_(values[1], {'king': 2, 'normandy': 1, 'york': 1})
+    eq_(values[2], ['The', 'of', 'and', 'the', 'of'])
+    eq_(values[3], {'king': 2, 'normandy': 1, 'york': 1})
+    eq_(values[4], ['th', 'ki', 'of', 'no', 'an', 'th', 'ki', 'of', 'yo'])
+    eq_(values[5], {'th': 2, 'ki': 2, 'of': 2, 'no': 1, 'an': 1, 'yo': 1})
+
+    # 8 distinct forms, each classified once by each of the two functions
+    eq_(len(CALLS), 16)
+
+
+def test_only_reads_classifier():
+    cache = {r_text: "The king of Normandy"}
+    del CALLS[:]
+    eq_(solve(stopwords.revision.datasources.stopwords, cache=cache),
+        ['The', 'of'])
+    eq_(CALLS, [])
+
+    eq_(solve(stemmed.revision.datasources.stems, cache=cache),
+        ['th', 'ki', 'of', 'no'])
+    eq_(CALLS, ['The', 'king', 'of', 'Normandy'])
+
+
+def test_same_name():
+    stemmed_lower = Stemmed("same.stemmed", str.lower, memo_size=None)
+    Stemmed("same.stemmed", lambda word: "X", memo_size=None)
+
+    eq_(solve(stemmed_lower.revision.datasources.stems,
+              cache={r_text: "Hello World"}),
+        ['hello', 'world'])
+
+
+def test_word_profile():
+    index = revision.datasources.word_index
+    short_profile = word_profile(index, FLAG, is_short)
+    stems_profile = word_profile(index, MAP, first_letters)
+    flagged = profiled(short_profile, 'flagged')
+    mapped = profiled(stems_profile, 'mapped')
+
+    cache = {r_text: "Foo bar bazzz"}
+    eq_(solve(flagged, cache=cache), ['Foo', 'bar'])
+    eq_(solve(mapped, cache=cache), ['fo', 'ba', 'ba'])
+    eq_(pickle.loads(pickle.dumps(flagged)), flagged)
+
+
+@raises(ValueError)
+def test_unknown_kind():
+    word_profile(revision.datasources.word_index, "foo", is_short)
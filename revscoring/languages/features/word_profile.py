@@ -0,0 +1,136 @@
+"""
+Dictionary, stopword and stemmed feature sets classify the words of a
+:class:`~revscoring.features.wikitext.datasources.word_index.WordIndex`.
+Rather than walking the words once for each of their word lists and
+frequency tables, each feature set builds a
+:class:`~revscoring.languages.features.word_profile.word_profile` of each
+index.  The profile calls the set's classifier once per distinct word form
+and builds all of the set's word lists and frequency tables from those
+results in one datasource.  Datasources like `dict_words` and
+`stopword_frequency` are views
+(:class:`~revscoring.languages.features.word_profile.profiled`) onto the
+profile, so solving one of them only runs the classifier that it reads.
+
+.. autoclass:: revscoring.languages.features.word_profile.word_profile
+
+.. autoclass:: revscoring.languages.features.word_profile.profiled
+
+.. autofunction:: revscoring.languages.features.word_profile.profile_words
+"""
+from itertools import compress
+from operator import not_
+
+import numpy
+
+from ...datasources import Datasource
+from ...datasources.meta.sparse import SparseTable
+
+FLAG = "flag"
+"""
+A classifier that flags words (e.g. a dictionary check).  Produces `checks`,
+`flagged`, `unflagged`, `flagged_frequency` and `unflagged_frequency`.
+"""
+MAP = "map"
+"""
+A classifier that maps words to a value (e.g. a stemmer).  Produces
+`values`, `mapped` and `frequency`.
+"""
+
+
+def profile_words(index, kind, func):
+    """
+    Applies a classifier to the words in an index.
+
+    :Parameters:
+        index : `WordIndex`
+            The words to profile (see
+            :class:`~revscoring.features.wikitext.datasources.word_index.WordIndex`)
+        kind : `str`
+            :data:`~revscoring.languages.features.word_profile.FLAG` or
+            :data:`~revscoring.languages.features.word_profile.MAP`
+        func : `func`
+            The classifier
+
+    :Returns:
+        A `dict` of outputs
+    """
+    forms, normalized, counts = index.forms, index.normalized, index.counts
+    # Each distinct form is classified once
+    values = [func(form) for form in forms]
+
+    if kind == FLAG:
+        flags = numpy.array(values, dtype=bool)
+        keep = flags[index.positions].tolist()
+        words = [forms[i] for i in index.positions.tolist()]
+        return {
+            'checks': values,
+            'flagged': list(compress(words, keep)),
+            'unflagged': list(compress(words, map(not_, keep))),
+            'flagged_frequency': SparseTable.from_counts(
+                list(compress(normalized, flags.tolist())), counts[flags]),
+            'unflagged_frequency': SparseTable.from_counts(
+                list(compress(normalized, (~flags).tolist())),
+                counts[~flags])
+        }
+    elif kind == MAP:
+        return {
+            'values': values,
+            'mapped': list(map(values.__getitem__,
+                               index.positions.tolist())),
+            'frequency': SparseTable.from_counts(values, counts)
+        }
+    else:
+        raise ValueError("Unknown classifier kind {0!r}".format(kind))
+
+
+class word_profile(Datasource):
+    """
+    Generates the outputs of a classifier applied to each distinct word form
+    in a :class:`~revscoring.features.wikitext.datasources.word_index.WordIndex`
+    (see :func:`~revscoring.languages.features.word_profile.profile_words`).
+
+    :Parameters:
+        index_datasource : :class:`revscoring.Datasource`
+            A datasource that generates a
+            :class:`~revscoring.features.wikitext.datasources.word_index.WordIndex`
+        kind : `str`
+            :data:`~revscoring.languages.features.word_profile.FLAG` or
+            :data:`~revscoring.languages.features.word_profile.MAP`
+        func : `func`
+            The classifier
+        name : `str`
+            A name for the datasource.
+    """
+    def __init__(self, index_datasource, kind, func, name=None):
+        if kind not in (FLAG, MAP):
+            raise ValueError("Unknown classifier kind {0!r}".format(kind))
+        self.kind = kind
+        self.func = func
+        name = self._format_name(name, [index_datasource, kind, func])
+        super().__init__(name, self.process, depends_on=[index_datasource])
+
+    def process(self, index):
+        return profile_words(index, self.kind, self.func)
+
+
+class profiled(Datasource):
+    """
+    Generates one of the outputs of a
+    :class:`~revscoring.languages.features.word_profile.word_profile`.
+
+    :Parameters:
+        profile_datasource : :class:`revscoring.Datasource`
+            A :class:`~revscoring.languages.features.word_profile.word_profile`
+        output : `str`
+            The name of the output (e.g. "flagged_frequency")
+        name : `str`
+            A name for the datasource.
+    """
+    def __init__(self, profile_datasource, output, name=None):
+        self.output = output
+        name = self._format_name(name, [profile_datasource, output])
+        super().__init__(name, self.process,
+                         depends_on=[profile_datasource])
+
+    def process(self, outputs):
+        return outputs[self.output]
@@ -1,43 +1,70 @@
 from .features import Dictionary, RegexMatches, Stemmed, Stopwords
+from .features.lazy import LazyResource
 
 name = "german"
 
-try:
+
+def _load_dictionary():
     import enchant
-    dictionary = enchant.Dict("de")
-except enchant.errors.DictNotFoundError:
-    raise ImportError("No enchant-compatible dictionary found for 'de'.  " +
-                      "Consider installing 'myspell-de-de', " +
-                      "'myspell-de-at', and/or 'myspell-de-ch'.")
+    try:
+        return enchant.Dict("de")
+    except enchant.errors.DictNotFoundError:
+        raise ImportError(
+            "No enchant-compatible dictionary found for 'de'.  " +
+            "Consider installing 'myspell-de-de', " +
+            "'myspell-de-at', and/or 'myspell-de-ch'.")
+
+
+enchant_dict = LazyResource(_load_dictionary, name + ".enchant_dict")
+
 
-dictionary = Dictionary(name + ".dictionary", dictionary.check)
+def dictionary_check(word):
+    return enchant_dict.check(word)
+
+
+dictionary = Dictionary(name + ".dictionary", dictionary_check)
 """
 :class:`~revscoring.languages.features.Dictionary` features via
 :class:`enchant.Dict` "de". Provided by `myspell-de-de`, `myspell-de-at`,
 and `myspell-de-ch`.
 """
 
-try:
+
+def _load_stopwords():
     from nltk.corpus import stopwords as nltk_stopwords
-    stopwords = set(nltk_stopwords.words('german'))
-except LookupError:
-    raise ImportError("Could not load stopwords for {0}. ".format(__name__) +
-                      "You may need to install the nltk 'stopwords' " +
-                      "corpora.  See http://www.nltk.org/data.html")
+    try:
+        return set(nltk_stopwords.words('german'))
+    except LookupError:
+        raise ImportError(
+            "Could not load stopwords for {0}. ".format(__name__) +
+            "You may need to install the nltk 'stopwords' " +
+            "corpora.  See http://www.nltk.org/data.html")
 
-stopwords = Stopwords(name + ".stopwords", stopwords)
+
+stopword_set = LazyResource(_load_stopwords, name + ".stopword_set")
+stopwords = Stopwords(name + ".stopwords", stopword_set)
 """
 :class:`~revscoring.languages.features.Stopwords` features provided by
 :func:`nltk.corpus.stopwords` "german"
 """
 
-try:
+
+def _load_stemmer():
     from nltk.stem.snowball import SnowballStemmer
-    stemmer = SnowballStemmer("german")
-except ValueError:
-    raise ImportError("Could not load stemmer for {0}. ".format(__name__))
+    try:
+        return SnowballStemmer("german")
+    except ValueError:
+        raise ImportError("Could not load stemmer for {0}. ".format(__name__))
+
+
+stemmer = LazyResource(_load_stemmer, name + ".stemmer")
+
+
+def stem_word(word):
+    return stemmer.stem(word)
+
 
-stemmed = Stemmed(name + ".stemmed", stemmer.stem)
+stemmed = Stemmed(name + ".stemmed", stem_word)
 """
 :class:`~revscoring.languages.features.Stemmed` word features via
 :class:`nltk.stem.snowball.SnowballStemmer` "german"
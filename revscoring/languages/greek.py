@@ -1,15 +1,27 @@
 from .features import Dictionary, RegexMatches, Stopwords
+from .features.lazy import LazyResource
 
 name = "greek"
 
-try:
+
+def _load_dictionary():
     import enchant
-    dictionary = enchant.Dict("el")
-except enchant.errors.DictNotFoundError:
-    raise ImportError("No enchant-compatible dictionary found for 'el'.  " +
-                      "Consider installing 'aspell-el'.")
+    try:
+        return enchant.Dict("el")
+    except enchant.errors.DictNotFoundError:
+        raise ImportError(
+            "No enchant-compatible dictionary found for 'el'.  " +
+            "Consider installing 'aspell-el'.")
+
+
+enchant_dict = LazyResource(_load_dictionary, name + ".enchant_dict")
+
+
+def dictionary_check(word):
+    return enchant_dict.check(word)
+
 
-dictionary = Dictionary(name + ".dictionary", dictionary.check)
+dictionary = Dictionary(name + ".dictionary", dictionary_check)
 """
 :class:`~revscoring.languages.features.Dictionary` features via
 :class:`enchant.Dict` "el". Provided by `aspell-el`.
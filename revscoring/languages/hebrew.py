@@ -1,15 +1,27 @@
 from .features import Dictionary, RegexMatches
+from .features.lazy import LazyResource
 
 name = "hebrew"
 
-try:
+
+def _load_dictionary():
     import enchant
-    dictionary = enchant.Dict("he")
-except enchant.errors.DictNotFoundError:
-    raise ImportError("No enchant-compatible dictionary found for 'he'.  " +
-                      "Consider installing 'myspell-he'.")
+    try:
+        return enchant.Dict("he")
+    except enchant.errors.DictNotFoundError:
+        raise ImportError(
+            "No enchant-compatible dictionary found for 'he'.  " +
+            "Consider installing 'myspell-he'.")
+
+
+enchant_dict = LazyResource(_load_dictionary, name + ".enchant_dict")
+
+
+def dictionary_check(word):
+    return enchant_dict.check(word)
+
 
-dictionary = Dictionary(name + ".dictionary", dictionary.check)
+dictionary = Dictionary(name + ".dictionary", dictionary_check)
 """
 :class:`~revscoring.languages.features.Dictionary` features via
 :class:`enchant.Dict` "he".  Provided by `myspell-he`
@@ -1,41 +1,68 @@
 from .features import Dictionary, RegexMatches, Stemmed, Stopwords
+from .features.lazy import LazyResource
 
 name = "italian"
 
-try:
+
+def _load_dictionary():
     import enchant
-    dictionary = enchant.Dict("it")
-except enchant.errors.DictNotFoundError:
-    raise ImportError("No enchant-compatible dictionary found for 'it'.  " +
-                      "Consider installing 'myspell-it'.")
+    try:
+        return enchant.Dict("it")
+    except enchant.errors.DictNotFoundError:
+        raise ImportError(
+            "No enchant-compatible dictionary found for 'it'.  " +
+            "Consider installing 'myspell-it'.")
+
+
+enchant_dict = LazyResource(_load_dictionary, name + ".enchant_dict")
+
 
-dictionary = Dictionary(name + ".dictionary", dictionary.check)
+def dictionary_check(word):
+    return enchant_dict.check(word)
+
+
+dictionary = Dictionary(name + ".dictionary", dictionary_check)
 """
 :class:`~revscoring.languages.features.Dictionary` features via
 :class:`enchant.Dict` "it". Provided by `myspell-it`
 """
 
-try:
+
+def _load_stopwords():
     from nltk.corpus import stopwords as nltk_stopwords
-    stopwords = set(nltk_stopwords.words('italian'))
-except LookupError:
-    raise ImportError("Could not load stopwords for {0}. ".format(__name__) +
-                      "You may need to install the nltk 'stopwords' " +
-                      "corpora.  See http://www.nltk.org/data.html")
+    try:
+        return set(nltk_stopwords.words('italian'))
+    except LookupError:
+        raise ImportError(
+            "Could not load stopwords for {0}. ".format(__name__) +
+            "You may need to install the nltk 'stopwords' " +
+            "corpora.  See http://www.nltk.org/data.html")
 
-stopwords = Stopwords(name + ".stopwords", stopwords)
+
+stopword_set = LazyResource(_load_stopwords, name + ".stopword_set")
+stopwords = Stopwords(name + ".stopwords", stopword_set)
 """
 :class:`~revscoring.languages.features.Stopwords` features provided by
 :func:`nltk.corpus.stopwords` "italian"
 """
 
-try:
+
+def _load_stemmer():
     from nltk.stem.snowball import SnowballStemmer
-    stemmer = SnowballStemmer("italian")
-except ValueError:
-    raise ImportError("Could not load stemmer for {0}. ".format(__name__))
+    try:
+        return SnowballStemmer("italian")
+    except ValueError:
+        raise ImportError("Could not load stemmer for {0}. ".format(__name__))
+
+
+stemmer = LazyResource(_load_stemmer, name + ".stemmer")
+
+
+def stem_word(word):
+    return stemmer.stem(word)
+
 
-stemmed = Stemmed(name + ".stemmed", stemmer.stem)
+stemmed = Stemmed(name + ".stemmed", stem_word)
 """
 :class:`~revscoring.languages.features.Stemmed` word features via
 :class:`nltk.stem.snowball.SnowballStemmer` "italian"
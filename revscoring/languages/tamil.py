@@ -1,15 +1,27 @@
 from .features import Dictionary, RegexMatches
+from .features.lazy import LazyResource
 
 name = "tamil"
 
-try:
+
+def _load_dictionary():
     import enchant
-    dictionary = enchant.Dict("ta")
-except enchant.errors.DictNotFoundError:
-    raise ImportError("No enchant-compatible dictionary found for 'ta'.  " +
-                      "Consider installing 'aspell-ta'.")
+    try:
+        return enchant.Dict("ta")
+    except enchant.errors.DictNotFoundError:
+        raise ImportError(
+            "No enchant-compatible dictionary found for 'ta'.  " +
+            "Consider installing 'aspell-ta'.")
+
+
+enchant_dict = LazyResource(_load_dictionary, name + ".enchant_dict")
+
+
+def dictionary_check(word):
+    return enchant_dict.check(word)
+
 
-dictionary = Dictionary(name + ".dictionary", dictionary.check)
+dictionary = Dictionary(name + ".dictionary", dictionary_check)
 """
 :class:`~revscoring.languages.features.Dictionary` features via
 :class:`enchant.Dict` "ta". Provided by `aspell-ta`.
@@ -0,0 +1,374 @@
+"""
+Lightweight instrumentation for the scoring pipeline.  Metrics are collected
+in a :class:`~revscoring.metrics.Registry` and can be read programmatically
+via :meth:`~revscoring.metrics.Registry.snapshot` or exposed to a
+pull-style collector (e.g. Prometheus) via
+:meth:`~revscoring.metrics.Registry.format_text` and
+:meth:`~revscoring.metrics.Registry.serve`.
+
+Example:
+    >>> from revscoring import metrics
+    >>>
+    >>> registry = metrics.Registry()
+    >>> requests = registry.counter("api_requests_total", "API requests made")
+    >>> requests.inc(kind="revisions")
+    >>> print(registry.format_text())
+    # HELP api_requests_total API requests made
+    # TYPE api_requests_total counter
+    api_requests_total{kind="revisions"} 1.0
+
+.. autoclass:: revscoring.metrics.Registry
+    :members:
+
+.. autoclass:: revscoring.metrics.Counter
+    :members:
+
+.. autoclass:: revscoring.metrics.Gauge
+    :members:
+
+.. autoclass:: revscoring.metrics.Histogram
+    :members:
+
+.. autodata:: revscoring.metrics.default_registry
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                   10.0, 25.0, 60.0)
+"""
+Histogram bucket upper bounds (in seconds) used when none are specified.
+"""
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Metric:
+    """
+    Base class for a named metric.  Values are tracked per set of labels.
+    Labels are provided as keyword arguments to the update methods.
+
+    :Parameters:
+        name : `str`
+            The name of the metric
+        documentation : `str`
+            A human readable description of what the metric measures
+    """
+    TYPE = None
+
+    def __init__(self, name, documentation=""):
+        self.name = str(name)
+        self.documentation = str(documentation)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def values(self):
+        """
+        Returns a `dict` of label tuples to the current value.
+        """
+        with self._lock:
+            return {key: self._copy_value(value)
+                    for key, value in self._values.items()}
+
+    def _copy_value(self, value):
+        return value
+
+    def _samples(self):
+        for key, value in sorted(self.values().items()):
+            yield self.name, key, value
+
+    def format_text(self):
+        lines = []
+        if self.documentation:
+            lines.append("# HELP {0} {1}".format(
+                self.name, _escape_help(self.documentation)))
+        lines.append("# TYPE {0} {1}".format(self.name, self.TYPE))
+        for name, labels, value in self._samples():
+            lines.append("{0}{1} {2}".format(name, _format_labels(labels),
+                                             _format_value(value)))
+        return "\n".join(lines)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "{0}({1})".format(self.__class__.__name__, repr(self.name))
+
+
+class Counter(Metric):
+    """
+    A monotonically increasing count (e.g. requests made).
+    """
+    TYPE = "counter"
+
+    def inc(self, amount=1, **labels):
+        """
+        Increments the counter by `amount` for the provided labels.
+        """
+        if amount < 0:
+            raise ValueError("Counters can only be incremented by " +
+                             "non-negative amounts.")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+
+class Gauge(Metric):
+    """
+    A value that can go up and down (e.g. queue depth).
+    """
+    TYPE = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+    def get(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+
+class Histogram(Metric):
+    """
+    Tracks the distribution of observed values (e.g. latencies in seconds)
+    in cumulative buckets along with a count and a sum.
+
+    :Parameters:
+        name : `str`
+            The name of the metric
+        documentation : `str`
+            A human readable description of what the metric measures
+        buckets : `iterable` ( `float` )
+            Upper bounds of the buckets.  An implicit `+Inf` bucket is always
+            included.
+    """
+    TYPE = "histogram"
+
+    def __init__(self, name, documentation="", buckets=None):
+        super().__init__(name, documentation)
+        self.buckets = tuple(sorted(buckets or DEFAULT_BUCKETS))
+
+    def observe(self, value, **labels):
+        """
+        Records an observed value for the provided labels.
+        """
+        key = self._key(labels)
+        with self._lock:
+            if key not in self._values:
+                self._values[key] = \
+                    {'counts': [0] * (len(self.buckets) + 1),
+                     'sum': 0.0, 'count': 0}
+            hist = self._values[key]
+            hist['sum'] += value
+            hist['count'] += 1
+            for i, upper in enumerate(self.buckets):
+                if value <= upper:
+                    hist['counts'][i] += 1
+                    break
+            else:
+                hist['counts'][-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """
+        Returns a context manager that observes the duration (in seconds) of
+        the wrapped block.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _copy_value(self, hist):
+        cumulative = []
+        total = 0
+        for upper, count in zip(self.buckets + (float('inf'),),
+                                hist['counts']):
+            total += count
+            cumulative.append((upper, total))
+        return {'buckets': cumulative, 'sum': hist['sum'],
+                'count': hist['count']}
+
+    def _samples(self):
+        for key, hist in sorted(self.values().items()):
+            for upper, count in hist['buckets']:
+                yield (self.name + "_bucket",
+                       key + (('le', _format_value(upper)),), count)
+            yield self.name + "_sum", key, hist['sum']
+            yield self.name + "_count", key, hist['count']
+
+
+class Registry:
+    """
+    A collection of named metrics.  Metrics are created on first use, so
+    requesting the same name twice returns the same metric.
+
+    :Parameters:
+        prefix : `str`
+            A string to prepend to the names of all metrics in the registry
+    """
+
+    def __init__(self, prefix=""):
+        self.prefix = str(prefix)
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name, documentation=""):
+        """
+        Gets or creates a :class:`~revscoring.metrics.Counter`.
+        """
+        return self._get_or_create(Counter, name, documentation)
+
+    def gauge(self, name, documentation=""):
+        """
+        Gets or creates a :class:`~revscoring.metrics.Gauge`.
+        """
+        return self._get_or_create(Gauge, name, documentation)
+
+    def histogram(self, name, documentation="", buckets=None):
+        """
+        Gets or creates a :class:`~revscoring.metrics.Histogram`.
+        """
+        return self._get_or_create(Histogram, name, documentation,
+                                   buckets=buckets)
+
+    def _get_or_create(self, metric_class, name, documentation, **kwargs):
+        name = self.prefix + name
+        with self._lock:
+            if name in self._metrics:
+                metric = self._metrics[name]
+                if not isinstance(metric, metric_class):
+                    raise ValueError("{0} is already registered as a {1}"
+                                     .format(name, metric.TYPE))
+            else:
+                metric = metric_class(name, documentation, **kwargs)
+                self._metrics[name] = metric
+
+            return metric
+
+    def __iter__(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return iter(sorted(metrics, key=lambda m: m.name))
+
+    def snapshot(self):
+        """
+        Returns a point-in-time copy of all metric values.
+
+        :Returns:
+            A `dict` mapping metric names to a `dict` with the keys `type`,
+            `documentation` and `values`.  `values` maps a `tuple` of
+            (label, value) pairs to the metric's value.  Histogram values are
+            a `dict` of `buckets` (cumulative (upper, count) pairs), `sum` and
+            `count`.
+        """
+        return {metric.name: {'type': metric.TYPE,
+                              'documentation': metric.documentation,
+                              'values': metric.values()}
+                for metric in self}
+
+    def format_text(self):
+        """
+        Formats all metrics using the Prometheus text exposition format.
+        """
+        return "".join(metric.format_text() + "\n" for metric in self)
+
+    def serve(self, port, host=""):
+        """
+        Starts a daemon thread that serves
+        :meth:`~revscoring.metrics.Registry.format_text` over HTTP so that
+        metrics can be scraped.
+
+        :Returns:
+            The running :class:`http.server.HTTPServer`.  Call `shutdown()`
+            to stop it.
+        """
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                body = registry.format_text().encode('utf-8')
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        server = HTTPServer((host, int(port)), MetricsHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        logger.info("Serving metrics on port {0}"
+                    .format(server.server_address[1]))
+        return server
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+default_registry = Registry(prefix="revscoring_")
+"""
+The :class:`~revscoring.metrics.Registry` that is used by
+:class:`~revscoring.ScoreProcessor` and
+:class:`revscoring.extractors.api.Extractor` unless another is provided.
+"""
+
+
+def _format_labels(labels):
+    if len(labels) == 0:
+        return ""
+    else:
+        return "{" + ",".join('{0}="{1}"'.format(k, _escape_label(v))
+                              for k, v in labels) + "}"
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return "+Inf"
+    else:
+        return repr(float(value))
+
+
+def _escape_help(s):
+    return s.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape_label(s):
+    return _escape_help(s).replace('"', '\\"')
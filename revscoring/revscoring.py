@@ -11,6 +11,10 @@ Utilities:
 * cv_train          Cross-validates, and then trains a MLScorerModel with extracted features
 * model_info        Reads a model-file and reports metadata and testing
                     statistics
+* build_word_set    Builds a memory-mappable dictionary word set from word
+                    lists
+* benchmark_imports Times the import of each language module in a fresh
+                    process
 * tune              Tunes a set of models against a training set to identify
                     the best model/configuration
 
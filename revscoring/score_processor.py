@@ -1,23 +1,65 @@
 import logging
-from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
 from multiprocessing import cpu_count
 
 from more_itertools import chunked
 
 from . import dependencies
 from .datasources import Datasource
+from .features.wikitext import get_diff_limits
+from .lanes import LaneQueue
+from .metrics import default_registry
+from .worker_pool import WorkerPool, dependent_modules, get_state
 
 logger = logging.getLogger(__name__)
 
 
 class ScoreProcessor:
+    """
+    Scores batches of revisions by extracting root datasources in a pool of
+    IO threads and solving features and scoring in a pool of CPU processes.
+
+    :Parameters:
+        scorer_model : :class:`~revscoring.ScorerModel`
+            The model to score with
+        extractor : :class:`~revscoring.Extractor`
+            An extractor to gather root datasources with
+        cpu_workers : `int`
+            The number of processes to use for solving and scoring
+        io_workers : `int`
+            The number of threads to use for extraction
+        batch_size : `int`
+            The number of revisions to extract at a time
+        metrics : :class:`~revscoring.metrics.Registry`
+            A registry to record per-stage latencies, throughput and queue
+            depths in.  Defaults to
+            :data:`~revscoring.metrics.default_registry`.
+        lanes : `list` ( (`str`, `int`) )
+            Priority lanes and their weights (highest priority first).  Work
+            submitted to :meth:`~revscoring.ScoreProcessor.score` waits in
+            its lane both for extraction and, per revision, for the CPU pool.
+            Defaults to a single "default" lane.
+        strict_priority : `bool`
+            If True, higher priority lanes are always served first.
+            Otherwise lanes are served in proportion to their weights.
+
+    :Example:
+        >>> processor = ScoreProcessor(model, extractor,
+        ...                            lanes=[("realtime", 10),
+        ...                                   ("backfill", 1)])
+        >>> list(processor.score(123456, lane="realtime"))
+    """
 
     IO_WORKER_MULTIPLIER = 0.25
     MIN_IO_WORKERS = 2
     MAX_IO_WORKERS = 10
 
     def __init__(self, scorer_model, extractor, cpu_workers=None,
-                 io_workers=None, batch_size=50):
+                 io_workers=None, batch_size=50, metrics=None, lanes=None,
+                 strict_priority=False):
         self.scorer_model = scorer_model
         self.extractor = extractor
         self.cpu_workers = \
@@ -35,83 +77,230 @@ class ScoreProcessor:
         logger.info("Starting up IO thread pool with {0} workers"
                     .format(self.io_workers))
         self.scores_ex = ThreadPoolExecutor(max_workers=self.io_workers)
-        logger.info("Starting up CPU thread pool with {0} workers"
+        logger.info("Starting up CPU process pool with {0} workers"
                     .format(self.cpu_workers))
-        self.process_ex = ProcessPoolExecutor(max_workers=self.cpu_workers)
+        preload = dependent_modules(self.scorer_model.features) | \
+            {self.scorer_model.__class__.__module__,
+             self.extractor.__class__.__module__}
+        self.process_ex = WorkerPool(
+            processes=self.cpu_workers, preload=preload,
+            state={'scorer_model': self.scorer_model,
+                   'extractor': self.extractor,
+                   'diff_limits': get_diff_limits()})
 
         roots = dependencies.dig(self.scorer_model.features)
         self.root_datasources = [d for d in roots if isinstance(d, Datasource)]
 
+        self.io_queue = LaneQueue(lanes, strict=strict_priority)
+        self.cpu_queue = LaneQueue(lanes, strict=strict_priority)
+        self.lanes = self.io_queue.lanes
+        self.default_lane = self.lanes[0]
+        self._cpu_lock = threading.RLock()
+        self._cpu_in_flight = 0
+
+        self.metrics = metrics if metrics is not None else default_registry
+        self.batch_duration = self.metrics.histogram(
+            "score_processor_batch_seconds",
+            "Time spent on a batch of revisions in a stage (extract)")
+        self.revision_duration = self.metrics.histogram(
+            "score_processor_revision_seconds",
+            "Time spent on a single revision in a stage (solve, score, ipc)")
+        self.revisions_total = self.metrics.counter(
+            "score_processor_revisions_total",
+            "Revisions processed by status (scored, error)")
+        self.batches_total = self.metrics.counter(
+            "score_processor_batches_total",
+            "Batches of revisions extracted")
+        self.queue_depth = self.metrics.gauge(
+            "score_processor_queue_depth",
+            "Tasks submitted to a worker pool (io, cpu) and not yet finished")
+        self.queue_duration = self.metrics.histogram(
+            "score_processor_queue_seconds",
+            "Time spent waiting in a lane for a worker pool (io, cpu)")
+
     def __enter__(self):
         return self
 
-    def __exit__(self):
-        self.scores_executor.shutdown()
-        self.process_executor.shutdown()
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.scores_ex.shutdown()
+        self.process_ex.shutdown()
 
-    def score(self, rev_ids, caches=None, cache=None):
+    def score(self, rev_ids, caches=None, cache=None, lane=None):
+        """
+        Scores a set of revisions.
+
+        :Parameters:
+            rev_ids : `int` | `iterable` ( `int` )
+                Revisions to score
+            caches : `dict`
+                A rev_id-->cache pairs of call-specific pre-computed values
+            cache : `dict`
+                Pre-computed values to inject for every rev_id
+            lane : `str`
+                The priority lane to schedule the work in.  Defaults to the
+                first (highest priority) lane.
+
+        :Returns:
+            A generator of (rev_id, score) pairs in the order requested
+        """
         if isinstance(rev_ids, int):
             rev_ids = [rev_ids]
+        lane = lane if lane is not None else self.default_lane
+        if lane not in self.lanes:
+            raise ValueError("Unknown lane {0}.  Expected one of {1}"
+                             .format(repr(lane), self.lanes))
 
         batches = batch_rev_caches(chunked(rev_ids, self.batch_size), caches,
                                    cache)
 
-        for batch_scores in self.scores_ex.map(self._score_batch, batches):
-            for score in batch_scores:
+        futures = []
+        for batch_rev_cache in batches:
+            future = Future()
+            self.queue_depth.inc(pool="io")
+            self.io_queue.put(lane, (batch_rev_cache, future))
+            self.scores_ex.submit(self._score_next_batch)
+            futures.append(future)
+
+        for future in futures:
+            for score in future.result():
                 yield score
 
-    def _score_batch(self, batch_rev_cache):
+    def _score_next_batch(self):
+        # Every submitted call takes exactly one batch, but not necessarily
+        # the one it was submitted for.  The IO queue decides.
+        lane, (batch_rev_cache, future), waited = self.io_queue.get()
+        self.queue_duration.observe(waited, lane=lane, pool="io")
+        try:
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(
+                        self._score_batch(lane, batch_rev_cache))
+                except BaseException as e:
+                    future.set_exception(e)
+        finally:
+            self.queue_depth.dec(pool="io")
+
+    def _score_batch(self, lane, batch_rev_cache):
         id_batch, caches, cache = batch_rev_cache
         logger.debug("running _score_batch() on {0} rev_ids"
                      .format(len(id_batch)))
-        error_values = self.extractor.extract(
-                id_batch, self.root_datasources, caches=caches, cache=cache)
+        with self.batch_duration.time(stage="extract"):
+            error_values = list(self.extractor.extract(
+                id_batch, self.root_datasources, caches=caches, cache=cache))
+        self.batches_total.inc()
         e_r_caches = self._group_error_root_caches(
                 id_batch, error_values, caches, cache)
 
-        rev_scores = self.process_ex.map(self._process_score, e_r_caches)
-        return list(rev_scores)
+        # Revisions are queued for the CPU pool individually so that a
+        # higher priority revision never waits behind a whole batch.
+        futures = []
+        for e_r_cache in e_r_caches:
+            future = Future()
+            self.queue_depth.inc(pool="cpu")
+            self.cpu_queue.put(lane, (e_r_cache, future))
+            futures.append(future)
+        self._dispatch_cpu()
+
+        return [future.result() for future in futures]
+
+    def _dispatch_cpu(self):
+        with self._cpu_lock:
+            while self._cpu_in_flight < self.cpu_workers and \
+                  len(self.cpu_queue) > 0:
+                lane, (e_r_cache, future), waited = self.cpu_queue.get()
+                self.queue_duration.observe(waited, lane=lane, pool="cpu")
+                self._cpu_in_flight += 1
+                submitted = time.time()
+                process_future = self.process_ex.submit(
+                    self._process_score, e_r_cache)
+                process_future.add_done_callback(
+                    partial(self._cpu_done, submitted, future))
+
+    def _cpu_done(self, submitted, future, process_future):
+        with self._cpu_lock:
+            self._cpu_in_flight -= 1
+        self.queue_depth.dec(pool="cpu")
+        try:
+            rev_id, score, errored, timings = process_future.result()
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            self._record(submitted, timings, errored)
+            future.set_result((rev_id, score))
+        self._dispatch_cpu()
+
+    def _record(self, submitted, timings, errored):
+        """
+        Records the stage timings reported by a CPU worker.  Whatever part of
+        the round trip was not spent solving or scoring was spent pickling,
+        transferring and waiting in the CPU pool's queue, so it is reported
+        as "ipc".
+        """
+        worked = 0
+        for stage, duration in timings.items():
+            self.revision_duration.observe(duration, stage=stage)
+            worked += duration
+        self.revision_duration.observe(
+            max(0, time.time() - submitted - worked), stage="ipc")
+        self.revisions_total.inc(status="error" if errored else "scored")
 
     def _group_error_root_caches(self, id_batch, error_values, caches, cache):
         for rev_id, (error, vals) in zip(id_batch, error_values):
-            if error:
-                score_cache = {}
-                scorer_model = None
-                extractor = None
-            else:
-                score_cache = {}
+            score_cache = {}
+            if not error:
                 score_cache.update(cache or {})
                 score_cache.update((caches or {}).get(rev_id, {}))
                 score_cache.update({rd: rv for rd, rv in
                                     zip(self.root_datasources, vals)})
-                scorer_model = self.scorer_model
-                extractor = self.extractor
 
-            yield (rev_id, scorer_model, extractor, score_cache, error)
+            yield (rev_id, score_cache, error)
+
+    @classmethod
+    def _process_scores(cls, e_r_caches):
+        # Returns an (outcome, exception) pair per revision so that one
+        # revision's error doesn't fail the others in its batch.
+        results = []
+        for e_r_cache in e_r_caches:
+            try:
+                results.append((cls._process_score(e_r_cache), None))
+            except Exception as e:
+                results.append((None, e))
+        return results
 
     @classmethod
     def _process_score(cls, e_r_caches):
-        rev_id, scorer_model, extractor, cache, error = e_r_caches
+        # The model and extractor are installed once per worker by the
+        # WorkerPool rather than pickled with every revision.
+        rev_id, cache, error = e_r_caches
         logger.debug("running _process_score() on {0}".format(rev_id))
+        scorer_model = get_state('scorer_model')
+        extractor = get_state('extractor')
+        timings = {}
 
         if error is None:
 
+            start = time.time()
             try:
                 feature_values = list(extractor.solve(
                     scorer_model.features, cache=cache))
             except Exception as error:
                 logger.debug("An error occured during feature extraction")
                 raise error
-                return rev_id, error_score(error)
+                return rev_id, error_score(error), True, timings
+            finally:
+                timings['solve'] = time.time() - start
 
+            start = time.time()
             try:
                 score = scorer_model.score(feature_values)
-                return rev_id, score
+                return rev_id, score, False, timings
             except Exception as error:
                 logger.debug("An error occured during scoring")
-                return rev_id, error_score(error)
+                return rev_id, error_score(error), True, timings
+            finally:
+                timings['score'] = time.time() - start
         else:
-            return rev_id, error_score(error)
+            return rev_id, error_score(error), True, timings
 
 
 def error_score(error):
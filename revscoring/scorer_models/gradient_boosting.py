@@ -19,3 +19,4 @@ class GradientBoosting(ScikitLearnClassifier):
     Implements a Gradient Boosting model.
     """
     Estimator = GradientBoostingClassifier
+    Supports_Sparse = False
@@ -31,6 +31,7 @@ class GaussianNB(NB):
     Implements a Gaussian Naive Bayes model
     """
     Estimator = naive_bayes.GaussianNB
+    Supports_Sparse = False
 
 
 class MultinomialNB(NB):
@@ -3,13 +3,15 @@ import logging
 import time
 from collections import defaultdict
 from datetime import datetime
-from multiprocessing import Pool, cpu_count
+from multiprocessing import cpu_count
 
+from scipy import sparse
 from sklearn.cross_validation import KFold
 from sklearn.preprocessing import RobustScaler
 
 from . import util
-from ..features import vectorize_values
+from ..features import vectorize_matrix
+from ..worker_pool import WorkerPool, dependent_modules
 from .scorer_model import MLScorerModel
 from .test_statistics import (accuracy, precision, precision_recall, recall,
                               roc, table)
@@ -20,6 +22,11 @@ logger = logging.getLogger(__name__)
 class ScikitLearnClassifier(MLScorerModel):
     Estimator = NotImplemented
     Base_Params = {}
+    Supports_Sparse = True
+    """
+    Can the estimator fit and predict on :class:`scipy.sparse.csr_matrix`
+    input?  If not, sparse feature values are densified.
+    """
 
     def __init__(self, features, version=None,
                  balanced_sample=False, balanced_sample_weight=False,
@@ -78,18 +85,16 @@ class ScikitLearnClassifier(MLScorerModel):
         """
         start = time.time()
         values, labels = zip(*values_labels)
-        # Flaten feature vector
-        values = [vectorize_values(feature_values)
-                  for feature_values in values]
+        # Flaten feature vectors into a matrix
+        values = self._vectorize(values)
 
         if self.scaler is not None:
             values = self.scaler.fit_transform(values)
-            values_labels = zip(values, labels)
 
         if self.balanced_sample:
-            values_labels = zip(values, labels)
-            values_labels = util.balance_sample(values_labels)
-            values, labels = zip(*values_labels)
+            rows_labels = util.balance_sample(enumerate(labels))
+            rows, labels = zip(*rows_labels)
+            values = values[list(rows)]
 
         if self.balanced_sample_weight:
             sample_weight = util.balance_sample_weights(labels)
@@ -124,20 +129,36 @@ class ScikitLearnClassifier(MLScorerModel):
                              trained on.  Generating this probability is
                              slower than a simple prediction.
         """
-        feature_values = vectorize_values(feature_values)
+        values = self._vectorize([feature_values])
         if self.scaler is not None:
-            feature_values = self.scaler.transform([feature_values])[0]
+            values = self.scaler.transform(values)
 
-        prediction = self.estimator.predict([feature_values])[0]
+        return self._score_matrix(values)[0]
+
+    def _vectorize(self, observations_values):
+        values = vectorize_matrix(observations_values)
+        if sparse.issparse(values) and \
+           (not self.Supports_Sparse or
+                (self.scaler is not None and self.scaler.with_centering)):
+            values = values.toarray()
+
+        return values
+
+    def _score_matrix(self, values):
+        predictions = self.estimator.predict(values)
         labels = self.estimator.classes_
-        probas = self.estimator.predict_proba([feature_values])[0]
-        probability = {label: proba for label, proba in zip(labels, probas)}
+        probas = self.estimator.predict_proba(values)
 
-        doc = {
-            'prediction': prediction,
-            'probability': probability
-        }
-        return util.normalize_json(doc)
+        docs = []
+        for prediction, row_probas in zip(predictions, probas):
+            probability = {label: proba
+                           for label, proba in zip(labels, row_probas)}
+            docs.append(util.normalize_json({
+                'prediction': prediction,
+                'probability': probability
+            }))
+
+        return docs
 
     def test(self, values_labels, test_statistics=None, store_stats=True):
         """
@@ -155,7 +176,11 @@ class ScikitLearnClassifier(MLScorerModel):
                           [table(), accuracy(), precision(), recall(),
                            roc(), precision_recall()]
 
-        scores = [self.score(feature_values) for feature_values in values]
+        # Scores all of the observations in one batch
+        values = self._vectorize(values)
+        if self.scaler is not None:
+            values = self.scaler.transform(values)
+        scores = self._score_matrix(values)
 
         test_stats = {}
         for statistic in test_statistics:
@@ -175,15 +200,19 @@ class ScikitLearnClassifier(MLScorerModel):
                           [table(), accuracy(), precision(), recall(),
                            roc(), precision_recall()]
 
-        pool = Pool(processes=processes or cpu_count())
+        preload = dependent_modules(self.features) | \
+            {self.__class__.__module__}
 
         folds_i = KFold(len(values_labels), n_folds=folds, shuffle=True,
                         random_state=0)
-        results = pool.map(self._generate_test_stats,
-                           ((i, [values_labels[i] for i in train_i],
-                                [values_labels[i] for i in test_i],
-                             test_statistics)
-                            for i, (train_i, test_i) in enumerate(folds_i)))
+        with WorkerPool(processes=processes or cpu_count(),
+                        preload=preload) as pool:
+            results = list(pool.map(
+                self._generate_test_stats,
+                ((i, [values_labels[i] for i in train_i],
+                     [values_labels[i] for i in test_i],
+                  test_statistics)
+                 for i, (train_i, test_i) in enumerate(folds_i))))
         cross_validations = defaultdict(list)
         for test_stats in results:
             for test_statistic in test_statistics:
@@ -1,6 +1,7 @@
 from nose.tools import eq_, raises
+from scipy import sparse
 
-from ...features import Feature
+from ...features import Feature, FeatureVector
 from ..sklearn_classifier import ScikitLearnClassifier
 from ..test_statistics import table
 
@@ -18,10 +19,17 @@ class FakeIdentityEstimator:
         return None
 
     def predict(self, vals):
-        return [vals[0][0]]
+        return [bool(val) for val in _first_column(vals)]
 
     def predict_proba(self, vals):
-        return [[vals[0][0] * True, vals[0][0] * False]]
+        return [[val * True, val * False] for val in _first_column(vals)]
+
+
+def _first_column(vals):
+    if sparse.issparse(vals):
+        return vals[:, 0].toarray().ravel()
+    else:
+        return [row[0] for row in vals]
 
 
 class FakeIdentityClassifier(ScikitLearnClassifier):
@@ -67,3 +75,20 @@ def test_sklearn_format_error():
     skc = FakeIdentityClassifier(
         [Feature("foo")], version="0.0.1")
     skc.format_info(format="foo")
+
+
+def test_sklearn_sparse():
+    skc = FakeIdentityClassifier(
+        [FeatureVector("foo", returns=int), Feature("bar")])
+
+    def row(value):
+        return sparse.csr_matrix([[value, 0, 1]])
+
+    values_labels = [([row(True), 1.0], True), ([row(False), 2.0], False)]
+    skc.train(values_labels)
+    eq_(skc.score([row(True), 3.0])['prediction'], True)
+
+    test_stats = skc.test(values_labels * 3, test_statistics=[table()])
+    eq_(list(test_stats.values())[0],
+        {True: {True: 3},
+         False: {False: 3}})
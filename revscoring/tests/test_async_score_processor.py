@@ -0,0 +1,77 @@
+import asyncio
+
+from nose.tools import eq_
+
+from ..async_score_processor import AsyncScoreProcessor
+from ..metrics import Registry
+from .test_score_processor import LengthModel, TextExtractor
+
+
+class CountingExtractor(TextExtractor):
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def extract(self, rev_ids, dependents, caches=None, cache=None, **kwargs):
+        self.batches.append(list(rev_ids))
+        for rev_id in rev_ids:
+            cache = (caches or {}).get(rev_id, {})
+            yield None, [cache.get("text", "a" * rev_id)]
+
+
+def test_score():
+    extractor = CountingExtractor()
+    registry = Registry()
+    score_processor = AsyncScoreProcessor(
+        LengthModel(), extractor, cpu_workers=2, io_workers=2, batch_size=4,
+        batch_delay=60, metrics=registry)
+
+    async def score_all():
+        scores = asyncio.gather(
+            score_processor.score(1), score_processor.score(2),
+            score_processor.score(1), score_processor.score(0),
+            score_processor.score(3, cache={"text": "aaaaa"}),
+            score_processor.score(3), score_processor.score(4))
+        # Let every request queue up, then send off the partial batch
+        await asyncio.sleep(0)
+        score_processor.flush()
+        return await scores
+
+    with score_processor:
+        loop = asyncio.get_event_loop()
+        scores = loop.run_until_complete(score_all())
+
+    eq_(scores,
+        [{'prediction': 1}, {'prediction': 2}, {'prediction': 1},
+         {'type': "ValueError", 'message': "Empty"}, {'prediction': 5},
+         {'prediction': 3}, {'prediction': 4}])
+    # Duplicate requests are merged and batches fill up before extraction
+    eq_(len(extractor.batches), 2)
+    eq_(sorted(sum(extractor.batches, [])), [0, 1, 2, 3, 3, 4])
+    for batch in extractor.batches:
+        eq_(len(set(batch)), len(batch))
+
+    revisions = registry.snapshot()['score_processor_revisions_total']
+    eq_(revisions['values'][(('status', "scored"),)], 5)
+    eq_(revisions['values'][(('status', "error"),)], 1)
+
+
+def test_score_error():
+    score_processor = AsyncScoreProcessor(
+        LengthModel(), CountingExtractor(), cpu_workers=1, io_workers=1,
+        batch_size=3, micro_batch_size=3)
+
+    async def score_all():
+        # len(None) fails while solving rev_id 2
+        return await asyncio.gather(
+            score_processor.score(1),
+            score_processor.score(2, cache={"text": None}),
+            score_processor.score(3), return_exceptions=True)
+
+    with score_processor:
+        loop = asyncio.get_event_loop()
+        scores = loop.run_until_complete(score_all())
+
+    eq_(scores[0], {'prediction': 1})
+    assert isinstance(scores[1], TypeError)
+    eq_(scores[2], {'prediction': 3})
@@ -0,0 +1,92 @@
+import pickle
+import tempfile
+
+from nose.tools import eq_
+
+from .. import content_cache
+from ..content_cache import ContentCache, content_key
+from ..datasources import revision_oriented
+from ..dependencies import solve
+from ..features import wikitext
+from ..metrics import Registry
+
+r_text = revision_oriented.revision.text
+p_text = revision_oriented.revision.parent.text
+
+
+def test_content_key():
+    eq_(content_key("foo"), content_key("foo"))
+    assert content_key("foo") != content_key("bar")
+    assert content_key("foo", "bar") != content_key("foobar", "")
+    eq_(content_key(None), content_key(""))
+
+
+def test_memory():
+    registry = Registry()
+    cache = ContentCache(max_size=2, metrics=registry)
+    calls = []
+
+    def compute(value):
+        calls.append(value)
+        return value
+
+    eq_(cache.memoize("foo", "a", lambda: compute(1)), 1)
+    eq_(cache.memoize("foo", "a", lambda: compute(2)), 1)
+    eq_(cache.memoize("foo", "b", lambda: compute(3)), 3)
+    eq_(cache.memoize("foo", "c", lambda: compute(4)), 4)
+    eq_(len(cache), 2)
+    # "a" was the least recently used value, so it was dropped
+    eq_(cache.memoize("foo", "a", lambda: compute(5)), 5)
+    eq_(calls, [1, 3, 4, 5])
+
+    requests = registry.counter("content_cache_requests_total")
+    eq_(requests.get(namespace="foo", result="memory"), 1)
+    eq_(requests.get(namespace="foo", result="miss"), 4)
+
+
+def test_disk():
+    path = tempfile.mkdtemp()
+    cache = ContentCache(path=path)
+    eq_(cache.memoize("foo", "abc", lambda: [1, 2], dump=tuple, load=list),
+        [1, 2])
+
+    other_cache = pickle.loads(pickle.dumps(cache))
+    eq_(len(other_cache), 0)
+    eq_(other_cache.memoize("foo", "abc", lambda: None, dump=tuple,
+                            load=list),
+        [1, 2])
+
+
+def test_wikitext():
+    cache = {p_text: "Foo bar.\n\nThis is the second paragraph.  Some more.",
+             r_text: "Foo bar.\n\nThis is the 2nd paragraph.  Some more.\n\n" +
+                     "Another paragraph here."}
+    revision = wikitext.revision
+    dependents = [revision.diff.words_added,
+                  revision.diff.words_removed,
+                  revision.diff.datasources.sentences_added,
+                  revision.datasources.tokens,
+                  revision.datasources.paragraphs_sentences_and_whitespace]
+
+    def solve_reprs():
+        # Segments can't be compared with ==
+        return [repr(value)
+                for value in solve(dependents, cache=dict(cache))]
+
+    expected = solve_reprs()
+
+    path = tempfile.mkdtemp()
+    try:
+        content_cache.set_cache(ContentCache(path=path))
+        for _ in range(2):
+            eq_(solve_reprs(), expected)
+
+        # A new process only has the disk tier
+        registry = Registry()
+        content_cache.set_cache(ContentCache(path=path, metrics=registry))
+        eq_(solve_reprs(), expected)
+        requests = registry.counter("content_cache_requests_total")
+        eq_(requests.get(namespace="operations", result="disk"), 1)
+        eq_(requests.get(namespace="operations", result="miss"), 0)
+    finally:
+        content_cache.set_cache(None)
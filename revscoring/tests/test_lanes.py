@@ -0,0 +1,50 @@
+from nose.tools import eq_, raises
+
+from ..lanes import LaneQueue
+
+
+def test_weighted():
+    queue = LaneQueue([("realtime", 3), ("backfill", 1)])
+    for i in range(4):
+        queue.put("backfill", "b{0}".format(i))
+        queue.put("realtime", "r{0}".format(i))
+    eq_(len(queue), 8)
+    eq_(queue.depth("realtime"), 4)
+
+    eq_([queue.get()[1] for i in range(8)],
+        ['r0', 'r1', 'b0', 'r2', 'r3', 'b1', 'b2', 'b3'])
+    eq_(len(queue), 0)
+
+
+def test_strict():
+    queue = LaneQueue([("realtime", 1), ("backfill", 100)], strict=True)
+    queue.put("backfill", 1)
+    queue.put("backfill", 2)
+    queue.put("realtime", 3)
+
+    lane, item, waited = queue.get()
+    eq_((lane, item), ("realtime", 3))
+    assert waited >= 0
+    eq_([queue.get()[1] for i in range(2)], [1, 2])
+
+
+def test_default():
+    queue = LaneQueue()
+    eq_(queue.lanes, ["default"])
+    queue.put("default", 1)
+    eq_(queue.get()[:2], ("default", 1))
+
+
+@raises(IndexError)
+def test_empty():
+    LaneQueue().get()
+
+
+@raises(ValueError)
+def test_unknown_lane():
+    LaneQueue().put("foo", 1)
+
+
+@raises(ValueError)
+def test_bad_weight():
+    LaneQueue([("foo", 0)])
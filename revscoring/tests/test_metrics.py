@@ -0,0 +1,95 @@
+import pickle
+from urllib.request import urlopen
+
+from nose.tools import eq_, raises
+
+from ..metrics import Registry
+
+
+def test_counter():
+    registry = Registry()
+    requests = registry.counter("requests_total", "Requests made")
+    requests.inc(kind="revisions")
+    requests.inc(2, kind="revisions")
+    requests.inc(kind="users")
+
+    eq_(requests.get(kind="revisions"), 3)
+    eq_(requests.get(kind="users"), 1)
+    eq_(requests.get(kind="foo"), 0)
+    assert registry.counter("requests_total") is requests
+
+    eq_(pickle.loads(pickle.dumps(requests)).get(kind="revisions"), 3)
+
+
+@raises(ValueError)
+def test_counter_negative():
+    Registry().counter("foo").inc(-1)
+
+
+@raises(ValueError)
+def test_conflicting_types():
+    registry = Registry()
+    registry.counter("foo")
+    registry.gauge("foo")
+
+
+def test_gauge():
+    registry = Registry()
+    depth = registry.gauge("queue_depth")
+    depth.inc(pool="io")
+    depth.inc(pool="io")
+    depth.dec(pool="io")
+    depth.set(5, pool="cpu")
+
+    eq_(depth.get(pool="io"), 1)
+    eq_(depth.get(pool="cpu"), 5)
+
+
+def test_histogram():
+    registry = Registry(prefix="test_")
+    duration = registry.histogram("duration_seconds", buckets=[0.1, 1])
+    duration.observe(0.05, stage="solve")
+    duration.observe(0.5, stage="solve")
+    duration.observe(5, stage="solve")
+    with duration.time(stage="score"):
+        pass
+
+    snapshot = registry.snapshot()
+    solve = snapshot['test_duration_seconds']['values'][(('stage', "solve"),)]
+    eq_(solve['count'], 3)
+    eq_(solve['sum'], 5.55)
+    eq_(solve['buckets'], [(0.1, 1), (1, 2), (float('inf'), 3)])
+    eq_(snapshot['test_duration_seconds']['type'], "histogram")
+    eq_(snapshot['test_duration_seconds']['values']
+                [(('stage', "score"),)]['count'], 1)
+
+    eq_(pickle.loads(pickle.dumps(registry)).snapshot(), snapshot)
+
+
+def test_format_text():
+    registry = Registry()
+    registry.counter("requests_total", "Requests\nmade").inc(kind='a"b')
+    registry.histogram("duration_seconds", buckets=[1]).observe(0.5)
+
+    eq_(registry.format_text(),
+        '# TYPE duration_seconds histogram\n' +
+        'duration_seconds_bucket{le="1.0"} 1.0\n' +
+        'duration_seconds_bucket{le="+Inf"} 1.0\n' +
+        'duration_seconds_sum 0.5\n' +
+        'duration_seconds_count 1.0\n' +
+        '# HELP requests_total Requests\\nmade\n' +
+        '# TYPE requests_total counter\n' +
+        'requests_total{kind="a\\"b"} 1.0\n')
+
+
+def test_serve():
+    registry = Registry()
+    registry.counter("requests_total").inc()
+    server = registry.serve(0, host="127.0.0.1")
+    try:
+        host, port = server.server_address
+        response = urlopen("http://{0}:{1}/metrics".format(host, port))
+        eq_(response.read().decode('utf-8'), registry.format_text())
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,55 @@
+from nose.tools import eq_, raises
+
+from ..datasources import revision_oriented
+from ..extractors import OfflineExtractor
+from ..features import Feature
+from ..metrics import Registry
+from ..score_processor import ScoreProcessor
+
+text_len = Feature("text_len", len, returns=int,
+                   depends_on=[revision_oriented.revision.text])
+
+
+class LengthModel:
+    features = [text_len]
+
+    def score(self, feature_values):
+        if feature_values[0] == 0:
+            raise ValueError("Empty")
+        return {'prediction': feature_values[0]}
+
+
+class TextExtractor(OfflineExtractor):
+    def extract(self, rev_ids, dependents, caches=None, cache=None, **kwargs):
+        for rev_id in rev_ids:
+            yield None, ["a" * rev_id]
+
+
+def test_score():
+    registry = Registry()
+    with ScoreProcessor(LengthModel(), TextExtractor(), cpu_workers=2,
+                        io_workers=2, batch_size=2, metrics=registry,
+                        lanes=[("realtime", 3), ("backfill", 1)]) \
+            as score_processor:
+        eq_(list(score_processor.score([0, 1, 2, 3, 4], lane="backfill")),
+            [(0, {'type': "ValueError", 'message': "Empty"}),
+             (1, {'prediction': 1}), (2, {'prediction': 2}),
+             (3, {'prediction': 3}), (4, {'prediction': 4})])
+        eq_(list(score_processor.score(5)), [(5, {'prediction': 5})])
+
+    snapshot = registry.snapshot()
+    revisions = snapshot['score_processor_revisions_total']['values']
+    eq_(revisions[(('status', "scored"),)], 5)
+    eq_(revisions[(('status', "error"),)], 1)
+    queue_seconds = snapshot['score_processor_queue_seconds']['values']
+    eq_(queue_seconds[(('lane', "backfill"), ('pool', "cpu"))]['count'], 5)
+    eq_(queue_seconds[(('lane', "realtime"), ('pool', "io"))]['count'], 1)
+    stage_seconds = snapshot['score_processor_revision_seconds']['values']
+    eq_(stage_seconds[(('stage', "solve"),)]['count'], 6)
+
+
+@raises(ValueError)
+def test_unknown_lane():
+    with ScoreProcessor(LengthModel(), TextExtractor(), cpu_workers=1) \
+            as score_processor:
+        list(score_processor.score([1], lane="foo"))
@@ -0,0 +1,57 @@
+from nose.tools import eq_, raises
+
+from ..datasources import revision_oriented
+from ..features import Feature
+from ..languages.features.lazy import LazyResource, load_resources
+from ..worker_pool import WorkerPool, dependent_modules, get_state
+
+
+def add_offset(value):
+    return value + get_state('offset')
+
+
+def load_words():
+    return {"foo", "bar"}
+
+
+words = LazyResource(load_words, name="test_worker_pool.words")
+
+
+def words_loaded():
+    return words.loaded
+
+
+def fail(message):
+    raise RuntimeError(message)
+
+
+def test_worker_pool():
+    with WorkerPool(processes=2, state={'offset': 10}) as pool:
+        eq_(pool.submit(add_offset, 1).result(), 11)
+        eq_(list(pool.map(add_offset, [1, 2, 3])), [11, 12, 13])
+        eq_(list(pool.imap(add_offset, [4, 5])), [14, 15])
+        eq_(sorted(pool.imap_unordered(add_offset, [6, 7])), [16, 17])
+
+
+@raises(RuntimeError)
+def test_worker_pool_error():
+    with WorkerPool(processes=1) as pool:
+        pool.submit(fail, "Foo").result()
+
+
+def test_load_resources():
+    with WorkerPool(processes=1, preload=[__name__]) as pool:
+        eq_(pool.submit(words_loaded).result(), True)
+
+    lazy_words = LazyResource(load_words)
+    eq_(load_resources([__name__]), 1)
+    assert not lazy_words.loaded
+
+
+def test_dependent_modules():
+    text_len = Feature("text_len", len, returns=int,
+                       depends_on=[revision_oriented.revision.text])
+    modules = dependent_modules([text_len])
+    assert "revscoring.features.feature" in modules
+    assert "revscoring.datasources.datasource" in modules
+    assert "builtins" not in modules
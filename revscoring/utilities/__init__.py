@@ -5,6 +5,14 @@ command-line.  When the revscoring python package is installed, a `revscoring`
 utility should be available from the commandline.  Run `revscoring -h` for more
 information:
 
+benchmark_imports
++++++++++++++++++
+.. automodule:: revscoring.utilities.benchmark_imports
+
+build_word_set
+++++++++++++++
+.. automodule:: revscoring.utilities.build_word_set
+
 cv_train
 ++++++++
 .. automodule:: revscoring.utilities.cv_train
@@ -0,0 +1,141 @@
+"""
+Measures how long it takes to import modules (by default, every language in
+:mod:`revscoring.languages`) in a fresh python process.  Each module is
+imported in its own subprocess so that nothing is shared between
+measurements.  With `--load`, the
+:class:`~revscoring.languages.features.lazy.LazyResource` assets of each
+module (dictionaries, stopwords, stemmers) are also loaded and timed.
+
+Writes a TSV to <stdout> with a row per module:
+module, import seconds, load seconds, new modules, status
+
+Usage:
+    benchmark_imports [<module>...] [--runs=<num>] [--load]
+                      [--verbose] [--debug]
+
+Options:
+    -h --help       Print this documentation
+    <module>        The module(s) to import [default: <every language>]
+    --runs=<num>    The number of times to import each module.  The
+                    fastest run is reported. [default: 3]
+    --load          Load each module's lazy language assets after import
+    --verbose       Print progress information to stderr
+    --debug         Print debug logging
+"""
+import json
+import logging
+import pkgutil
+import subprocess
+import sys
+
+import docopt
+
+logger = logging.getLogger(__name__)
+
+TIME_IMPORT = """
+import importlib, json, sys, time
+
+module_name, load = sys.argv[1], sys.argv[2] == "1"
+import_time = load_time = n_modules = None
+status = "ok"
+
+try:
+    n_modules = len(sys.modules)
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    import_time = time.perf_counter() - start
+    n_modules = len(sys.modules) - n_modules
+
+    if load:
+        from revscoring.languages.features.lazy import LazyResource
+        start = time.perf_counter()
+        for value in list(vars(module).values()):
+            if isinstance(value, LazyResource):
+                value.load()
+        load_time = time.perf_counter() - start
+except Exception as e:
+    n_modules = None if import_time is None else n_modules
+    status = "{0}: {1}".format(e.__class__.__name__, e)
+
+print(json.dumps([import_time, load_time, n_modules, status]))
+"""
+
+
+def main(argv=None):
+    args = docopt.docopt(__doc__, argv=argv)
+
+    logging.basicConfig(
+        level=logging.INFO if not args['--debug'] else logging.DEBUG,
+        format='%(asctime)s %(levelname)s:%(name)s -- %(message)s'
+    )
+
+    if len(args['<module>']) > 0:
+        module_names = args['<module>']
+    else:
+        module_names = language_modules()
+
+    runs = int(args['--runs'])
+    load = args['--load']
+    verbose = args['--verbose']
+
+    run(module_names, runs, load, sys.stdout, verbose)
+
+
+def run(module_names, runs, load, output, verbose):
+    output.write("module\timport_seconds\tload_seconds\tmodules\tstatus\n")
+    for module_name in module_names:
+        import_time, load_time, n_modules, status = \
+            time_import(module_name, runs, load)
+        output.write("{0}\t{1}\t{2}\t{3}\t{4}\n".format(
+            module_name, format_seconds(import_time),
+            format_seconds(load_time), "" if n_modules is None else n_modules,
+            status))
+        if verbose:
+            sys.stderr.write(".")
+            sys.stderr.flush()
+
+    if verbose:
+        sys.stderr.write("\n")
+
+
+def time_import(module_name, runs, load):
+    """
+    Imports a module in `runs` fresh processes.
+
+    :Returns:
+        A tuple of the fastest import time, the fastest load time, the number
+        of modules the import added to `sys.modules` and the status of the
+        last run
+    """
+    results = []
+    for _ in range(runs):
+        process = subprocess.run(
+            [sys.executable, "-c", TIME_IMPORT, module_name,
+             "1" if load else "0"],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        if process.returncode != 0:
+            logger.debug(process.stderr.decode('utf-8', 'replace'))
+            return None, None, None, "failed: exit code {0}".format(
+                process.returncode)
+        results.append(json.loads(process.stdout.decode('utf-8')))
+
+    import_time, load_time, n_modules, status = results[-1]
+    if import_time is not None:
+        import_time = min(result[0] for result in results)
+    if load_time is not None:
+        load_time = min(result[1] for result in results)
+    return import_time, load_time, n_modules, status
+
+
+def language_modules():
+    """
+    Lists the names of the language modules in :mod:`revscoring.languages`.
+    """
+    from .. import languages
+    return ["revscoring.languages." + name
+            for _, name, is_package in pkgutil.iter_modules(languages.__path__)
+            if not is_package]
+
+
+def format_seconds(seconds):
+    return "" if seconds is None else "{0:.4f}".format(seconds)
@@ -0,0 +1,61 @@
+"""
+Builds a :class:`~revscoring.languages.features.dictionary.WordSet` from one
+or more word lists (one word per line or hunspell `.dic` files) and writes it
+to a file that can be memory-mapped with
+:func:`~revscoring.languages.features.dictionary.WordSet.load`.
+
+To include the inflected forms that a hunspell dictionary's affix rules
+produce, expand the dictionary first, e.g. `unmunch en_US.dic en_US.aff` or
+`aspell -d en dump master | aspell -l en expand`.
+
+Usage:
+    build_word_set <word-list>... --output=<path>
+                   [--verbose] [--debug]
+
+Options:
+    -h --help         Print this documentation
+    <word-list>       Path to a file containing words
+    --output=<path>   Path to write the word set to (a `.npy` file)
+    --verbose         Print progress information to stderr
+    --debug           Print debug logging
+"""
+import logging
+import sys
+from itertools import chain
+
+import docopt
+
+from ..languages.features.dictionary import WordSet
+from ..languages.features.dictionary.backends import read_words
+
+logger = logging.getLogger(__name__)
+
+
+def main(argv=None):
+    args = docopt.docopt(__doc__, argv=argv)
+
+    logging.basicConfig(
+        level=logging.INFO if not args['--debug'] else logging.DEBUG,
+        format='%(asctime)s %(levelname)s:%(name)s -- %(message)s'
+    )
+
+    paths = args['<word-list>']
+    output_path = args['--output']
+    verbose = args['--verbose']
+
+    run(paths, output_path, verbose)
+
+
+def run(paths, output_path, verbose):
+    files = [open(path, encoding='utf-8', errors='replace') for path in paths]
+    try:
+        word_set = WordSet.from_words(
+            chain.from_iterable(read_words(f) for f in files))
+    finally:
+        for f in files:
+            f.close()
+
+    word_set.dump(output_path)
+    if verbose:
+        sys.stderr.write("Wrote {0} words to {1}\n"
+                         .format(len(word_set), output_path))
@@ -16,6 +16,7 @@
                                             [--batch-size=<num>]
                                             [--login]
                                             [--profile=<path>]
+                                            [--content-cache=<path>]
                                             [--verbose] [--debug]
 
     Options:
@@ -35,6 +36,9 @@
         --login                 If set, prompt for username and password
         --profile=<path>        Path to a file to write extraction profiling
                                 output
+        --content-cache=<path>  Path to a directory to cache tokenization,
+                                segmentation and diff results in.  Repeated
+                                extractions of the same text reuse them.
         --verbose               Print dots and stuff
         --debug                 Print debug logging
 """
@@ -42,7 +46,7 @@ import logging
 import sys
 import time
 from itertools import islice
-from multiprocessing import Pool, cpu_count
+from multiprocessing import cpu_count
 from statistics import mean, median
 
 import docopt
@@ -50,9 +54,12 @@ import mwapi
 import yamlconf
 from tabulate import tabulate
 
+from ..content_cache import ContentCache, set_cache
 from ..dependencies import Dependent
 from ..errors import CommentDeleted, RevisionNotFound, TextDeleted, UserDeleted
 from ..extractors import api
+from ..features.wikitext import get_diff_limits
+from ..worker_pool import WorkerPool, dependent_modules, get_state
 from .util import dump_observation, get_user_pass, read_observations
 
 logger = logging.getLogger(__name__)
@@ -103,15 +110,20 @@ def main(argv=None):
     else:
         profile_f = None
 
+    if args['--content-cache'] is not None:
+        content_cache = ContentCache(path=args['--content-cache'])
+    else:
+        content_cache = None
+
     verbose = args['--verbose']
     debug = args['--debug']
 
     run(observations, output, dependents, extractor, extractors, batch_size,
-        profile_f, verbose, debug)
+        profile_f, verbose, debug, content_cache=content_cache)
 
 
 def run(observations, output, dependents, extractor, extractors, batch_size,
-        profile_f, verbose, debug):
+        profile_f, verbose, debug, content_cache=None):
     logging.basicConfig(
         level=logging.WARNING if not debug else logging.DEBUG,
         format='%(asctime)s %(levelname)s:%(name)s -- %(message)s'
@@ -120,7 +132,8 @@ def run(observations, output, dependents, extractor, extractors, batch_size,
     profile = {}
     results = extract(dependents, observations, extractor,
                       extractors=extractors,
-                      batch_size=batch_size, profile=profile)
+                      batch_size=batch_size, profile=profile,
+                      content_cache=content_cache)
 
     for e, observation in results:
         if isinstance(e, RevisionNotFound):
@@ -151,27 +164,40 @@ def run(observations, output, dependents, extractor, extractors, batch_size,
 
 
 def extract(dependents, observations, extractor, extractors="<cpu count>",
-            batch_size=50, profile=None):
+            batch_size=50, profile=None, content_cache=None):
 
     extractor_context = ConfiguredExtractor(extractor, dependents)
-    extractor_pool = Pool(processes=extractors)
+    preload = dependent_modules(dependents) | \
+        {extractor.__class__.__module__}
+    extractor_pool = WorkerPool(processes=extractors, preload=preload,
+                                state={'extractor_context': extractor_context,
+                                       'diff_limits': get_diff_limits()},
+                                initializer=set_cache,
+                                initargs=(content_cache,))
 
     observation_batches = batch(observations, batch_size)
 
     result_batches = extractor_pool.imap(
-        extractor_context.extract, observation_batches)
+        _extract_batch, observation_batches)
 
     combined_profile = profile if profile is not None else {}
     combined_profile['per_batch_duration'] = []
 
-    for results, batch_profile, batch_duration in result_batches:
-        if len(results) == batch_size:
-            combined_profile['per_batch_duration'].append(batch_duration)
-        else:
-            combined_profile['per_batch_duration'].append(
-                batch_duration / (len(results) / batch_size))
-        combine_profiles(combined_profile, batch_profile)
-        yield from results
+    try:
+        for results, batch_profile, batch_duration in result_batches:
+            if len(results) == batch_size:
+                combined_profile['per_batch_duration'].append(batch_duration)
+            else:
+                combined_profile['per_batch_duration'].append(
+                    batch_duration / (len(results) / batch_size))
+            combine_profiles(combined_profile, batch_profile)
+            yield from results
+    finally:
+        extractor_pool.shutdown(wait=False)
+
+
+def _extract_batch(observations):
+    return get_state('extractor_context').extract(observations)
 
 
 def batch(iterable, size):
@@ -11,6 +11,7 @@
         fit <dependent> <label>
             [--input=<path>]
             [--datasource-file=<path>]
+            [--processes=<num>]
             [--debug]
 
     Options:
@@ -22,6 +23,8 @@
                                   [default: <stdin>]
         --datasource-file=<math>  Path to a file for writing out the trained
                                   datasource [default: <stdout>]
+        --processes=<num>         The number of parallel processes to fit
+                                  with [default: 1]
         --debug                   Print debug logging.
 """
 import logging
@@ -65,14 +68,20 @@ def main(argv=None):
     else:
         datasource_f = open(args['--datasource-file'], 'w')
 
+    processes = int(args['--processes'])
     debug = args['--debug']
 
-    run(dependent, label_name, value_labels, datasource_f, debug)
+    run(dependent, label_name, value_labels, datasource_f, debug,
+        processes=processes)
 
 
-def run(dependent, label_name, value_labels, datasource_f, debug):
+def run(dependent, label_name, value_labels, datasource_f, debug,
+        processes=1):
     logger.info("Fitting {0} ({1})".format(dependent, type(dependent)))
-    dependent.fit(value_labels)
+    if processes == 1:
+        dependent.fit(value_labels)
+    else:
+        dependent.fit(value_labels, processes=processes)
 
     logger.info("Writing fitted selector to {0}".format(datasource_f))
     dependent.dump(datasource_f)
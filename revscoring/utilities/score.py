@@ -9,7 +9,7 @@
         score <model-file> --host=<uri> [<rev_id>...]
               [--rev-ids=<path>] [--cache=<json>] [--caches=<json>]
               [--batch-size=<num>] [--io-workers=<num>] [--cpu-workers=<num>]
-              [--debug] [--verbose]
+              [--metrics-port=<num>] [--debug] [--verbose]
 
     Options:
         -h --help           Print this documentation
@@ -31,6 +31,9 @@
                             requesting data from the API [default: <auto>]
         --cpu-workers=<num>  The number of worker processes to use for
                              extraction and scoring [default: <cpu-count>]
+        --metrics-port=<num>  If set, serve per-stage latency, throughput
+                              and queue depth metrics in the Prometheus text
+                              format on this port
         --debug             Print debug logging
         --verbose           Print feature extraction debug logging
 """
@@ -43,6 +46,7 @@ import docopt
 import mwapi
 import mysqltsv
 
+from .. import metrics
 from ..extractors import api
 from ..score_processor import ScoreProcessor
 from ..scorer_models import MLScorerModel
@@ -97,6 +101,9 @@ def main(argv=None):
     else:
         io_workers = int(args['--io-workers'])
 
+    if args['--metrics-port'] is not None:
+        metrics.default_registry.serve(int(args['--metrics-port']))
+
     verbose = args['--verbose']
 
     debug = args['--debug']
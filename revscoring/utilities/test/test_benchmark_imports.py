@@ -0,0 +1,27 @@
+import io
+
+from nose.tools import eq_
+
+from ..benchmark_imports import language_modules, run
+
+
+def test_language_modules():
+    modules = language_modules()
+    assert "revscoring.languages.english" in modules
+    assert "revscoring.languages.features" not in modules
+
+
+def test_benchmark_imports():
+    output = io.StringIO()
+    run(["revscoring.languages.japanese", "revscoring.languages.foo"], 1,
+        True, output, False)
+
+    header, japanese, foo = \
+        [line.split("\t") for line in output.getvalue().splitlines()]
+    eq_(header, ["module", "import_seconds", "load_seconds", "modules",
+                 "status"])
+    eq_(japanese[0], "revscoring.languages.japanese")
+    assert float(japanese[1]) > 0
+    eq_(japanese[4], "ok")
+    eq_(foo[1:4], ["", "", ""])
+    assert foo[4].endswith("No module named 'revscoring.languages.foo'")
@@ -0,0 +1,22 @@
+import os
+import tempfile
+
+from nose.tools import eq_
+
+from ...languages.features.dictionary import WordSet
+from ..build_word_set import run
+
+
+def test_build_word_set():
+    directory = tempfile.mkdtemp()
+    word_list = os.path.join(directory, "words.dic")
+    with open(word_list, "w") as f:
+        f.write("2\nfoo/AB\nbar\n")
+    output_path = os.path.join(directory, "words.npy")
+
+    run([word_list], output_path, False)
+
+    words = WordSet.load(output_path)
+    eq_(len(words), 2)
+    eq_(words.check("Foo"), True)
+    eq_(words.check("baz"), False)
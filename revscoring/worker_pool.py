@@ -0,0 +1,177 @@
+"""
+A pool of warm worker processes.
+
+Language modules (e.g. :mod:`revscoring.languages.english`) hold their
+dictionaries, stopword lists and stemmers as
+:class:`~revscoring.languages.features.lazy.LazyResource` s that load on
+first use.  A fresh worker process pays that cost again and gets its own
+private copy of the resources.  :class:`~revscoring.worker_pool.WorkerPool`
+starts workers from a fork server instead.  The fork server imports the
+modules and loads their lazy resources once, and every worker is forked from
+it, so workers start warm and share the read-mostly pages copy-on-write.  Objects that all tasks need (e.g. a scorer model) are
+installed once per worker via `state` rather than pickled with every task.
+
+Example:
+    >>> from revscoring.languages import english
+    >>> from revscoring.worker_pool import WorkerPool, dependent_modules
+    >>>
+    >>> features = [english.dictionary.revision.datasources.dict_words]
+    >>> with WorkerPool(processes=4,
+    ...                 preload=dependent_modules(features)) as pool:
+    ...     future = pool.submit(len, [1, 2, 3])
+    ...     print(future.result())
+    ...
+    3
+
+.. autoclass:: revscoring.worker_pool.WorkerPool
+    :members:
+
+.. autofunction:: revscoring.worker_pool.dependent_modules
+
+.. autofunction:: revscoring.worker_pool.get_state
+"""
+import logging
+import multiprocessing
+import sys
+from concurrent.futures import Executor, Future
+
+from .dependencies import expand
+
+logger = logging.getLogger(__name__)
+
+_state = {}
+
+RESOURCE_PRELOAD = "revscoring.languages.features.preload"
+"""
+A module that loads the lazy resources of the modules imported before it
+"""
+
+
+def get_state(key, default=None):
+    """
+    Gets an object that was installed in this worker process via the `state`
+    parameter of :class:`~revscoring.worker_pool.WorkerPool`.
+    """
+    return _state.get(key, default)
+
+
+def _initialize(state, initializer, initargs, load_modules=None):
+    _state.clear()
+    _state.update(state)
+    if load_modules is not None:
+        # A no-op for resources that the fork server already loaded
+        from .languages.features.lazy import load_resources
+        load_resources(load_modules)
+    if initializer is not None:
+        initializer(*initargs)
+
+
+class WorkerPool(Executor):
+    """
+    A :class:`concurrent.futures.Executor` backed by a
+    :class:`multiprocessing.pool.Pool` whose workers are forked from a fork
+    server with `preload` modules already imported.
+
+    :Parameters:
+        processes : `int`
+            The number of worker processes.  Defaults to the number of CPUs.
+        preload : `iterable` ( `str` )
+            Names of modules to import in the fork server before any worker
+            is forked.  See :func:`~revscoring.worker_pool.dependent_modules`.
+        state : `dict`
+            Objects to install once in each worker.  Tasks can read them with
+            :func:`~revscoring.worker_pool.get_state`.
+        initializer : `callable`
+            A function to call in each worker after `state` is installed
+        initargs : `tuple`
+            Arguments to pass to `initializer`
+        start_method : `str`
+            The :mod:`multiprocessing` start method.  Falls back to the
+            platform default if "forkserver" is not available.
+        load_resources : `bool`
+            Load the lazy resources of the `preload` modules (see
+            :func:`~revscoring.languages.features.lazy.load_resources`) in
+            the fork server, or in each worker for other start methods.
+
+    Note that a process has a single fork server.  Modules are only preloaded
+    by the first pool that starts it.  Later pools still work, but their
+    workers import anything else they need themselves.  As with the "spawn"
+    start method, preloading "__main__" imports the main script, so it must
+    be guarded with ``if __name__ == "__main__":``.
+    """
+
+    def __init__(self, processes=None, preload=None, state=None,
+                 initializer=None, initargs=(), start_method="forkserver",
+                 load_resources=True):
+        if start_method not in multiprocessing.get_all_start_methods():
+            start_method = None
+        self.context = multiprocessing.get_context(start_method)
+        self.processes = processes or multiprocessing.cpu_count()
+        self.preload = sorted(set(preload or []) | {__name__})
+
+        if self.context.get_start_method() == "forkserver":
+            logger.info("Preloading {0} modules in the fork server"
+                        .format(len(self.preload)))
+            # Modules are imported in order, so the resources module loads
+            # the resources of all of the modules before it.
+            self.context.set_forkserver_preload(
+                self.preload + ([RESOURCE_PRELOAD] if load_resources else []))
+
+        self._pool = self.context.Pool(
+            processes=self.processes, initializer=_initialize,
+            initargs=(state or {}, initializer, initargs,
+                      self.preload if load_resources else None))
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        future.set_running_or_notify_cancel()
+        self._pool.apply_async(fn, args, kwargs, callback=future.set_result,
+                               error_callback=future.set_exception)
+        return future
+
+    def imap(self, fn, iterable, chunksize=1):
+        """
+        Lazily applies `fn` to each item of `iterable` in the workers and
+        yields results in order.
+        """
+        return self._pool.imap(fn, iterable, chunksize)
+
+    def imap_unordered(self, fn, iterable, chunksize=1):
+        """
+        Like :meth:`~revscoring.worker_pool.WorkerPool.imap`, but yields
+        results as soon as they are ready.
+        """
+        return self._pool.imap_unordered(fn, iterable, chunksize)
+
+    def shutdown(self, wait=True):
+        self._pool.close()
+        if wait:
+            self._pool.join()
+
+
+def dependent_modules(dependents):
+    """
+    Finds the modules that must be imported in order to solve a set of
+    dependents.  This includes the modules that define the dependents' classes
+    and the functions they hold on to (e.g. a language's dictionary check).
+
+    :Parameters:
+        dependents : `iterable` ( :class:`~revscoring.Dependent` )
+            Dependents (e.g. a model's features) to scan
+
+    :Returns:
+        A `set` of module names
+    """
+    modules = set()
+    for dependent in expand(dependents):
+        modules.add(type(dependent).__module__)
+        for value in vars(dependent).values():
+            if callable(value):
+                owner = getattr(value, "__self__", None)
+                if owner is not None and not isinstance(owner, type):
+                    modules.add(type(owner).__module__)
+                modules.add(getattr(value, "__module__", None))
+
+    return {module for module in modules
+            if module is not None and module in sys.modules and
+            module != "builtins"}